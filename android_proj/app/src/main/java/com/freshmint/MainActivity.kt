@@ -55,6 +55,11 @@ class MainActivity : ComponentActivity() {
             for (accessDate in accessDateList) {
                 Log.d(TAG,"AccessDate: $accessDate")
             }
+
+            val dailyAccessCounts = FirebaseHelper.getDailyAccessCounts("server1")
+            for ((day, count) in dailyAccessCounts) {
+                Log.d(TAG,"DailyAccess: $day = $count")
+            }
         }
     }
 
@@ -8,6 +8,10 @@ import kotlin.coroutines.resume
 import kotlin.coroutines.resumeWithException
 
 object FirebaseHelper {
+    // 최근 접근 기록은 이 개수만 읽음 (전체 기록은 서버에서 일 단위 집계로 압축됨)
+    private const val RECENT_ACCESS_LIMIT = 100
+    private const val DAILY_SUMMARY_DAYS = 30
+
     private lateinit var database: FirebaseDatabase
     private lateinit var reference: DatabaseReference
     private var isInitialized = false
@@ -54,11 +58,12 @@ object FirebaseHelper {
 
     suspend fun getAccessDate(serverName: String): List<String> = suspendCancellableCoroutine { continuation ->
         val serverRef = reference.child(serverName)
-        serverRef.child("access_date")
+        // push 키 순서 = 시간 순서이므로 마지막 N개만 읽으면 최근 기록
+        serverRef.child("access_log").orderByKey().limitToLast(RECENT_ACCESS_LIMIT)
             .addListenerForSingleValueEvent(object : ValueEventListener {
                 override fun onDataChange(snapshot: DataSnapshot) {
-                    val list = snapshot.getValue<List<String>>()
-                    continuation.resume(list ?: emptyList())
+                    val list = snapshot.children.mapNotNull { it.getValue<String>() }
+                    continuation.resume(list)
                 }
 
                 override fun onCancelled(error: DatabaseError) {
@@ -67,4 +72,24 @@ object FirebaseHelper {
                 }
             })
     }
-}
\ No newline at end of file
+
+    /**
+     * 최근 [days]일의 일별 접근 횟수 (날짜 "yyyy-MM-dd" → 횟수). 기록 전체 대신 고정 크기 집계만 읽음
+     */
+    suspend fun getDailyAccessCounts(serverName: String, days: Int = DAILY_SUMMARY_DAYS): Map<String, Long> =
+        suspendCancellableCoroutine { continuation ->
+            reference.child(serverName).child("rollups").child("daily")
+                .orderByKey().limitToLast(days)
+                .addListenerForSingleValueEvent(object : ValueEventListener {
+                    override fun onDataChange(snapshot: DataSnapshot) {
+                        val counts = snapshot.children.associate { (it.key ?: "") to (it.getValue<Long>() ?: 0L) }
+                        continuation.resume(counts)
+                    }
+
+                    override fun onCancelled(error: DatabaseError) {
+                        Log.e("FirebaseHelper", "DB access cancelled/failed: ${error.message}")
+                        continuation.resumeWithException(error.toException())
+                    }
+                })
+        }
+}
@@ -18,7 +18,14 @@ gcloud artifacts repositories create cloud-run-source-deploy \
     --location=$REGION \
     --quiet || echo "저장소가 이미 존재합니다."
 
-# 3. Cloud Run 서비스 배포
+# 3. 폴백 이미지 스냅샷 생성 (로컬에 Supabase 환경변수가 있을 때만)
+if [ -n "$SUPABASE_URL" ] && [ -n "$SUPABASE_ANON_KEY" ]; then
+    echo "🛟 폴백 이미지 스냅샷 생성..."
+    python -c "import main; main.fallback_pool.refresh_from_db(main.get_supabase_client())" \
+        || echo "스냅샷 생성 실패: 기존 스냅샷 또는 기본 이미지를 사용합니다."
+fi
+
+# 4. Cloud Run 서비스 배포
 echo "🏗️ Cloud Run 서비스 배포 중..."
 gcloud run deploy $SERVICE_NAME \
     --source . \
@@ -32,7 +39,7 @@ gcloud run deploy $SERVICE_NAME \
     --max-instances=10 \
     --min-instances=0
 
-# 4. 서비스 URL 가져오기
+# 5. 서비스 URL 가져오기
 SERVICE_URL=$(gcloud run services describe $SERVICE_NAME --region=$REGION --format='value(status.url)')
 
 echo "✅ 배포 완료!"
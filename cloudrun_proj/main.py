@@ -1,13 +1,21 @@
-from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi import FastAPI, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Optional
+import asyncio
+import json
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import httpx
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 import logging
 import firebase_admin
 from firebase_admin import credentials, messaging
+import metrics
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 지연 시간과 요청당 DB 쿼리 수 기록 (/metrics에서 확인)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Supabase 클라이언트 초기화
 supabase_client: Optional[Client] = None
 
@@ -55,6 +66,145 @@ def get_supabase_client() -> Optional[Client]:
     return supabase_client
 
 
+def reset_supabase_client():
+    """연결 오류 후 다음 요청에서 클라이언트를 새로 만들도록 버립니다."""
+    global supabase_client
+    if supabase_client is not None:
+        logger.warning("Supabase 연결 오류로 클라이언트를 다시 생성합니다.")
+    supabase_client = None
+
+
+# Supabase 장애 대응 설정
+DB_QUERY_TIMEOUT = float(os.environ.get("DB_QUERY_TIMEOUT", 2.0))  # 쿼리 하나의 최대 대기 시간(초)
+DB_REQUEST_BUDGET = float(os.environ.get("DB_REQUEST_BUDGET", 3.0))  # 요청 하나가 DB에 쓸 수 있는 전체 시간(초)
+DB_FAILURE_THRESHOLD = int(os.environ.get("DB_FAILURE_THRESHOLD", 5))  # 연속 실패 시 차단
+DB_OPEN_SECONDS = float(os.environ.get("DB_OPEN_SECONDS", 30))  # 차단 후 다시 시험하기까지 대기 시간(초)
+DB_MAX_PARALLEL_QUERIES = int(os.environ.get("DB_MAX_PARALLEL_QUERIES", 4))  # 요청 하나가 동시에 실행하는 쿼리 수
+
+# 느린 쿼리가 기본 실행기를 점유하지 않도록 DB 전용 스레드 풀 사용
+db_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase")
+
+
+class DBQueryTimeout(Exception):
+    """쿼리가 실행을 시작한 뒤 DB_QUERY_TIMEOUT초 안에 끝나지 않음"""
+
+
+# 클라이언트를 다시 만들어야 하는 전송 계층 오류
+TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError)
+# DB 장애로 보고 서킷 브레이커에 실패로 기록하는 오류 (PostgREST 4xx 같은 요청 오류는 제외)
+DB_UNAVAILABLE_ERRORS = (DBQueryTimeout,) + TRANSPORT_ERRORS
+
+
+class CircuitBreaker:
+    """
+    Supabase 호출용 서킷 브레이커.
+    - closed: 정상. 요청 단위로 연속 failure_threshold번 실패하면 open
+    - open: DB를 호출하지 않고 바로 폴백. open_seconds가 지나면 half_open
+    - half_open: 요청 하나만 시험(probe)으로 보내고, 성공하면 closed, 실패하면 다시 open
+    이벤트 루프에서만 사용하므로 잠금은 사용하지 않습니다.
+    """
+
+    def __init__(self, failure_threshold: int, open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+
+    def allow(self) -> bool:
+        """이번 요청이 DB를 호출해도 되는지 반환합니다."""
+        now = time.monotonic()
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if now - self.opened_at < self.open_seconds:
+                return False
+            self.state = "half_open"
+            self.probe_started_at = now
+            logger.info("Supabase 서킷 half-open: 시험 요청을 보냅니다.")
+            return True
+        # half_open: 시험 요청이 끝나지 않고 예산을 넘겼다면 새 시험 요청 허용
+        if now - self.probe_started_at > DB_REQUEST_BUDGET:
+            self.probe_started_at = now
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != "closed":
+            logger.info("Supabase 서킷 closed: DB 호출을 재개합니다.")
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Supabase 서킷 open: {self.open_seconds}초 동안 폴백으로 응답합니다.")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+db_breaker = CircuitBreaker(DB_FAILURE_THRESHOLD, DB_OPEN_SECONDS)
+
+
+async def run_db_query(query, timeout: float = DB_QUERY_TIMEOUT):
+    """
+    동기 Supabase 쿼리(query.execute)를 DB 전용 스레드에서 실행합니다.
+    timeout은 스레드 풀 대기열에서 기다린 시간을 빼고 쿼리가 실제로 시작된 시점부터 세며, 넘기면 DBQueryTimeout을 발생시킵니다.
+    대기열에서 기다리는 시간은 요청 전체 예산(DB_REQUEST_BUDGET)으로만 제한되고, 요청이 먼저 끝나면 쿼리를 실행하지 않습니다.
+    전송 계층 오류가 나면 클라이언트를 버려 다음 요청에서 새로 연결합니다.
+    """
+    loop = asyncio.get_running_loop()
+    started_event = asyncio.Event()
+    abandoned = threading.Event()
+
+    def execute():
+        if abandoned.is_set():
+            return None
+        loop.call_soon_threadsafe(started_event.set)
+        return query.execute()
+
+    future = loop.run_in_executor(db_executor, execute)
+    try:
+        await started_event.wait()
+    except asyncio.CancelledError:
+        abandoned.set()
+        raise
+
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(future, timeout)
+        metrics.record_db_query(time.perf_counter() - started, "ok")
+        return response
+    except asyncio.TimeoutError:
+        metrics.record_db_query(time.perf_counter() - started, "timeout")
+        raise DBQueryTimeout(f"Supabase 쿼리가 {timeout}초 안에 끝나지 않았습니다") from None
+    except TRANSPORT_ERRORS:
+        metrics.record_db_query(time.perf_counter() - started, "connection_error")
+        reset_supabase_client()
+        raise
+    except Exception:
+        metrics.record_db_query(time.perf_counter() - started, "error")
+        raise
+
+
+async def gather_or_cancel(coros):
+    """
+    코루틴을 동시에 실행해 결과를 모읍니다.
+    하나라도 실패하거나 바깥에서 취소(요청 예산 초과)되면 나머지를 모두 취소하고, 대기열에 남은 쿼리가 실행되지 않도록 취소가 끝날 때까지 기다립니다.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 # Firebase Admin 초기화
 def initialize_firebase_app() -> bool:
     """Firebase Admin SDK 초기화. 이미 초기화되어 있으면 True 반환"""
@@ -83,6 +233,133 @@ def initialize_firebase_app() -> bool:
 R2_IMAGE_URL = "https://pub-faf21c880e254e7483b84cb14bb8854e.r2.dev/Firefly_ff-00198%20Steady%20portrait%20of%20a%20be%20168550%20uqj.jpg"
 DEFAULT_NOTIFICATION_IMAGE_URL = "https://genimage.zowoo.uk/webp/250722/Firefly_ff-00152%20Wild%20portrait%20of%20a%20rebe%20531327%20Raj.webp"
 
+# 폴백 이미지 풀 설정
+# DB에 접근할 수 있을 때 카탈로그 일부를 스냅샷 파일로 저장해 두고, 장애 중에는 메모리의 직렬화된 풀에서 응답
+FALLBACK_SNAPSHOT_PATH = os.environ.get(
+    "FALLBACK_SNAPSHOT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fallback_snapshot.json")
+)
+FALLBACK_POOL_SIZE = int(os.environ.get("FALLBACK_POOL_SIZE", 200))
+FALLBACK_REFRESH_SECONDS = int(os.environ.get("FALLBACK_REFRESH_SECONDS", 3600))
+IMAGE_COLUMNS = "id, url, title, tags, tag_prefix, metadata, created_at"
+
+
+class FallbackPool:
+    """
+    폴백 응답용 이미지 풀.
+    이미지마다 JSON을 미리 직렬화해 두고, 요청 시에는 무작위로 고른 조각을 이어 붙여 바로 응답합니다.
+    스냅샷 파일이 없으면 R2_IMAGE_URL로 만든 기본 이미지를 한 번만 생성해 사용합니다.
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        self.items: List[bytes] = []
+        self.source = "builtin"
+        self.refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """스냅샷 파일을 읽어 풀을 다시 만듭니다. 읽을 수 없으면 기본 이미지 풀을 사용합니다."""
+        images = []
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                images = json.load(f).get('images', [])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"폴백 스냅샷을 읽을 수 없습니다: {str(e)}")
+
+        if images:
+            self.source = "snapshot"
+            self.refreshed_at = os.path.getmtime(self.snapshot_path)
+        else:
+            images = build_builtin_fallback_images(FALLBACK_POOL_SIZE)
+            self.source = "builtin"
+
+        self.items = [json.dumps(img, ensure_ascii=False).encode('utf-8') for img in images]
+        logger.info(f"폴백 이미지 풀 준비: {len(self.items)}개 ({self.source})")
+
+    def is_stale(self) -> bool:
+        return time.time() - self.refreshed_at > FALLBACK_REFRESH_SECONDS
+
+    def save_snapshot(self, images: List[Dict]):
+        """DB에서 가져온 이미지로 스냅샷 파일을 교체하고 풀을 다시 읽습니다."""
+        data = {"generated_at": datetime.utcnow().isoformat(), "images": images}
+        temp_path = self.snapshot_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.snapshot_path)
+        self.load()
+
+    def refresh_from_db(self, client: "Client") -> bool:
+        """
+        최근 이미지를 FALLBACK_POOL_SIZE개까지 가져와 스냅샷을 갱신합니다.
+        동시에 여러 요청이 갱신하지 않도록 이미 진행 중이면 바로 돌아갑니다.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            response = client.table('images') \
+                .select(IMAGE_COLUMNS) \
+                .order('created_at', desc=True) \
+                .limit(FALLBACK_POOL_SIZE) \
+                .execute()
+            if not response.data:
+                return False
+            self.save_snapshot([format_image_row(img) for img in response.data])
+            logger.info(f"폴백 스냅샷 갱신: {len(response.data)}개")
+            return True
+        except Exception as e:
+            logger.error(f"폴백 스냅샷 갱신 실패: {str(e)}")
+            # 실패해도 매 요청마다 다시 시도하지 않도록 갱신 시각은 기록
+            self.refreshed_at = time.time()
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def response_body(self, count: int) -> bytes:
+        """미리 직렬화된 이미지 count개로 /random-images 응답 본문을 만듭니다."""
+        items = self.items
+        if count <= len(items):
+            picked = random.sample(items, count)
+        else:
+            picked = random.choices(items, k=count)
+        header = b'{"count":%d,"images":[' % count
+        footer = b'],"timestamp":"%s","source":"fallback"}' % datetime.utcnow().isoformat().encode('ascii')
+        return header + b','.join(picked) + footer
+
+
+def build_builtin_fallback_images(size: int) -> List[Dict]:
+    """스냅샷이 없을 때 쓰는 기본 폴백 이미지 (서버 시작 시 한 번만 생성)"""
+    created_at = datetime.utcnow().isoformat()
+    images = []
+    for img_id in random.sample(range(10000, 100000), size):
+        images.append({
+            "id": f"img_{img_id}",
+            "url": R2_IMAGE_URL,
+            "title": f"Fallback Image {img_id}",
+            "description": f"This is a fallback image with ID {img_id}",
+            "metadata": {
+                "width": 300,
+                "height": 300,
+                "format": "jpg",
+                "size_kb": random.randint(50, 150)
+            },
+            "tags": random.sample(["portrait", "artistic", "firefly", "steady", "beautiful"], k=3),
+            "tag_prefix": "FALLBACK",
+            "created_at": created_at
+        })
+    return images
+
+
+fallback_pool = FallbackPool(FALLBACK_SNAPSHOT_PATH)
+
+
+def schedule_fallback_refresh(client: "Client"):
+    """스냅샷이 오래되었으면 요청을 막지 않도록 별도 스레드에서 갱신합니다."""
+    if fallback_pool.is_stale():
+        asyncio.get_running_loop().run_in_executor(None, fallback_pool.refresh_from_db, client)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -93,6 +370,7 @@ async def startup_event():
             # 연결 테스트
             response = client.table('images').select("id").limit(1).execute()
             logger.info("Supabase 연결 테스트 성공")
+            schedule_fallback_refresh(client)
         except Exception as e:
             logger.error(f"Supabase 연결 테스트 실패: {str(e)}")
     
@@ -112,7 +390,8 @@ async def ping():
         "service": "cloud-run-fastapi",
         "region": os.environ.get("REGION", "unknown"),
         "revision": os.environ.get("K_REVISION", "unknown"),
-        "supabase_status": supabase_status
+        "supabase_status": supabase_status,
+        "supabase_circuit": db_breaker.state
     }
 
 # --- 새로 추가된 pong 함수 ---
@@ -173,7 +452,13 @@ async def handle_pubsub_and_notify_fcm(request: Request):
             ),
             topic=topic_name,
         )
-        message_id = messaging.send(message)
+        started = time.perf_counter()
+        try:
+            message_id = messaging.send(message)
+        except Exception:
+            metrics.FCM_SEND_DURATION.observe(time.perf_counter() - started, outcome="error")
+            raise
+        metrics.FCM_SEND_DURATION.observe(time.perf_counter() - started, outcome="ok")
         logger.info(f"FCM 전송 성공. message_id={message_id}")
         return {"status": "success", "message_id": message_id}
     except HTTPException:
@@ -189,31 +474,69 @@ async def get_random_images(
 ) -> Dict:
     """랜덤하게 이미지 URL을 반환하는 엔드포인트"""
 
-    # DB 사용 시도
+    # DB 사용 시도 (서킷이 열려 있으면 바로 폴백)
+    fallback_reason = "disabled"
     if use_db:
         client = get_supabase_client()
-        if client:
+        if not client:
+            fallback_reason = "no_client"
+        elif not db_breaker.allow():
+            fallback_reason = "circuit_open"
+        else:
             try:
-                db_images = await get_random_images_from_db(client, count)
+                db_images = await asyncio.wait_for(get_random_images_from_db(client, count), DB_REQUEST_BUDGET)
+                db_breaker.record_success()
                 if db_images:
+                    schedule_fallback_refresh(client)
+                    metrics.RANDOM_IMAGES_RESPONSES.inc(source="supabase", reason="")
                     return {
                         "count": len(db_images),
                         "images": db_images,
                         "timestamp": datetime.utcnow().isoformat(),
                         "source": "supabase"
                     }
+                fallback_reason = "empty"
+            except DB_UNAVAILABLE_ERRORS as e:
+                # DB 장애(쿼리 시간 초과, 연결 오류)만 서킷 브레이커에 실패로 기록
+                db_breaker.record_failure()
+                fallback_reason = "timeout" if isinstance(e, DBQueryTimeout) else "connection_error"
+                logger.error(f"DB에서 이미지 가져오기 실패: {type(e).__name__} {str(e)}")
+            except asyncio.TimeoutError:
+                # 쿼리가 대기열에서 기다리다 요청 예산을 넘긴 경우 (DB 장애가 아닌 인스턴스 과부하)
+                fallback_reason = "budget"
+                logger.warning(f"DB 요청 예산({DB_REQUEST_BUDGET}초)을 넘겨 폴백으로 응답합니다.")
             except Exception as e:
-                logger.error(f"DB에서 이미지 가져오기 실패: {str(e)}")
+                fallback_reason = "error"
+                logger.error(f"DB에서 이미지 가져오기 실패: {type(e).__name__} {str(e)}")
 
     # DB를 사용할 수 없거나 실패한 경우 폴백
+    metrics.RANDOM_IMAGES_RESPONSES.inc(source="fallback", reason=fallback_reason)
     return await get_fallback_images(count)
 
 
+def format_image_row(img: Dict) -> Dict:
+    """images 테이블의 행을 API 응답 형식으로 변환"""
+    return {
+        "id": img.get('id', f"img_{random.randint(10000, 99999)}"),
+        "url": img.get('url', R2_IMAGE_URL),
+        "title": img.get('title', 'Untitled Image'),
+        "description": f"Image from database with tags: {', '.join(img.get('tags', [])[:3])}",
+        "metadata": img.get('metadata', {
+            "width": 300,
+            "height": 300,
+            "format": "jpg"
+        }),
+        "tags": img.get('tags', []),
+        "tag_prefix": img.get('tag_prefix', 'IMG'),
+        "created_at": img.get('created_at', datetime.utcnow().isoformat())
+    }
+
+
 async def get_random_images_from_db(client: Client, count: int) -> List[Dict]:
-    """Supabase DB에서 랜덤 이미지 가져오기"""
+    """Supabase DB에서 랜덤 이미지 가져오기 (오프셋 조회는 동시에 실행)"""
     try:
-        # 전체 이미지 개수 확인
-        count_response = client.table('images').select("*", count='exact').execute()
+        # 전체 이미지 개수 확인 (행은 받지 않고 개수만)
+        count_response = await run_db_query(client.table('images').select("id", count='exact').limit(1))
         total_count = count_response.count if hasattr(count_response, 'count') else 0
 
         if total_count == 0:
@@ -225,100 +548,69 @@ async def get_random_images_from_db(client: Client, count: int) -> List[Dict]:
         # 요청 개수 조정
         actual_count = min(count, total_count)
 
-        # 랜덤 오프셋 사용 (큰 DB)
+        # 겹치지 않는 랜덤 오프셋을 골라 동시에 조회
+        # 요청 하나가 DB 스레드 풀을 모두 차지하지 않도록 동시에 실행하는 쿼리 수를 제한
+        offsets = random.sample(range(total_count), actual_count)
+        semaphore = asyncio.Semaphore(DB_MAX_PARALLEL_QUERIES)
+        failed = False
+
+        async def fetch_offset(offset: int):
+            nonlocal failed
+            async with semaphore:
+                # 앞선 조회가 실패했으면 결과를 쓰지 않으므로 새 쿼리를 보내지 않음 (곧 gather_or_cancel이 취소함)
+                if failed:
+                    return None
+                try:
+                    return await run_db_query(
+                        client.table('images')
+                        .select(IMAGE_COLUMNS)
+                        .limit(1)
+                        .offset(offset)
+                    )
+                except Exception:
+                    failed = True
+                    raise
+
+        responses = await gather_or_cancel(fetch_offset(offset) for offset in offsets)
+
         selected_images = []
-        used_offsets = set()
-
-        for _ in range(actual_count):
-            attempts = 0
-            while attempts < 10:
-                offset = random.randint(0, total_count - 1)
-                if offset not in used_offsets:
-                    used_offsets.add(offset)
-                    response = client.table('images') \
-                        .select("id, url, title, tags, tag_prefix, metadata, created_at") \
-                        .limit(1) \
-                        .offset(offset) \
-                        .execute()
-
-                    if response.data:
-                        selected_images.extend(response.data)
-                        break
-                attempts += 1
+        for response in responses:
+            if response.data:
+                selected_images.extend(response.data)
 
         # 응답 형식 맞추기
-        formatted_images = []
-        for img in selected_images:
-            formatted_images.append({
-                "id": img.get('id', f"img_{random.randint(10000, 99999)}"),
-                "url": img.get('url', R2_IMAGE_URL),
-                "title": img.get('title', 'Untitled Image'),
-                "description": f"Image from database with tags: {', '.join(img.get('tags', [])[:3])}",
-                "metadata": img.get('metadata', {
-                    "width": 300,
-                    "height": 300,
-                    "format": "jpg"
-                }),
-                "tags": img.get('tags', []),
-                "tag_prefix": img.get('tag_prefix', 'IMG'),
-                "created_at": img.get('created_at', datetime.utcnow().isoformat())
-            })
+        formatted_images = [format_image_row(img) for img in selected_images]
 
         logger.info(f"DB에서 {len(formatted_images)}개 이미지 조회 성공")
         return formatted_images
 
     except Exception as e:
-        logger.error(f"DB 조회 중 오류: {str(e)}")
+        logger.error(f"DB 조회 중 오류: {type(e).__name__} {str(e)}")
         raise
 
 
-async def get_fallback_images(count: int) -> Dict:
-    """DB를 사용할 수 없을 때 폴백 이미지 반환"""
-    images = []
-
-    for i in range(count):
-        img_id = random.randint(10000, 99999)
-
-        images.append({
-            "id": f"img_{img_id}",
-            "url": R2_IMAGE_URL,
-            "title": f"Fallback Image {img_id}",
-            "description": f"This is a fallback image with ID {img_id}",
-            "metadata": {
-                "width": 300,
-                "height": 300,
-                "format": "jpg",
-                "size_kb": random.randint(50, 150)
-            },
-            "tags": random.sample(["portrait", "artistic", "firefly", "steady", "beautiful"], k=3),
-            "tag_prefix": "FALLBACK",
-            "created_at": datetime.utcnow().isoformat()
-        })
-
-    return {
-        "count": count,
-        "images": images,
-        "timestamp": datetime.utcnow().isoformat(),
-        "source": "fallback"
-    }
+async def get_fallback_images(count: int) -> Response:
+    """DB를 사용할 수 없을 때 폴백 이미지 반환 (미리 직렬화된 풀에서 바로 응답)"""
+    return Response(content=fallback_pool.response_body(count), media_type="application/json")
 
 
 @app.get("/images/stats")
 async def get_image_stats():
     """DB 이미지 통계 반환"""
     client = get_supabase_client()
-    if not client:
+    if not client or not db_breaker.allow():
         raise HTTPException(status_code=503, detail="Database not available")
 
     try:
-        # 전체 개수
-        count_response = client.table('images').select("*", count='exact').execute()
+        # 전체 개수와 태그별 통계(샘플)를 동시에 조회
+        count_response, sample_response = await asyncio.wait_for(asyncio.gather(
+            run_db_query(client.table('images').select("id", count='exact').limit(1)),
+            run_db_query(client.table('images').select("tags").limit(100))
+        ), DB_REQUEST_BUDGET)
+        db_breaker.record_success()
         total_count = count_response.count if hasattr(count_response, 'count') else 0
 
-        # 태그별 통계 (샘플)
-        sample_response = client.table('images').select("tags").limit(100).execute()
         tag_counts = {}
-
         if sample_response.data:
             for img in sample_response.data:
                 for tag in img.get('tags', []):
@@ -333,11 +625,61 @@ async def get_image_stats():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+    except DB_UNAVAILABLE_ERRORS as e:
+        db_breaker.record_failure()
+        logger.error(f"통계 조회 실패: {type(e).__name__} {str(e)}")
+        raise HTTPException(status_code=503, detail="Database not available")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Database request budget exceeded")
     except Exception as e:
-        logger.error(f"통계 조회 실패: {str(e)}")
+        logger.error(f"통계 조회 실패: {type(e).__name__} {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/images/{image_id}")
+async def get_image_detail(image_id: str) -> Dict:
+    """이미지 하나의 상세 정보 반환 (갤러리에서 상세 보기를 열 때만 조회)"""
+    client = get_supabase_client()
+    if not client or not db_breaker.allow():
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    try:
+        response = await run_db_query(
+            client.table('images')
+            .select(IMAGE_COLUMNS)
+            .eq('id', image_id)
+            .limit(1)
+        )
+        db_breaker.record_success()
+    except DB_UNAVAILABLE_ERRORS as e:
+        db_breaker.record_failure()
+        logger.error(f"이미지 상세 조회 실패: {type(e).__name__} {str(e)}")
+        raise HTTPException(status_code=503, detail="Database not available")
+    except APIError as e:
+        # 형식이 잘못된 image_id 등 요청 오류는 DB 장애가 아니므로 서킷 상태를 바꾸지 않음
+        logger.info(f"잘못된 이미지 상세 요청 ({image_id}): {e.message}")
+        raise HTTPException(status_code=400, detail="Invalid image id")
+    except Exception as e:
+        logger.error(f"이미지 상세 조회 실패: {type(e).__name__} {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not response.data:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return format_image_row(response.data[0])
+
+
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식의 메트릭 반환"""
+    metrics.CIRCUIT_STATE.set(CIRCUIT_STATE_VALUES[db_breaker.state])
+    metrics.FALLBACK_POOL_SIZE.set(len(fallback_pool.items))
+    return Response(content=metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/")
 async def root():
     """API 정보를 반환하는 루트 엔드포인트"""
@@ -350,6 +692,8 @@ async def root():
             "ping": "/ping - 헬스체크",
             "random_images": "/random-images?count=10&use_db=true - 랜덤 이미지 반환",
             "image_stats": "/images/stats - DB 이미지 통계",
+            "image_detail": "/images/{image_id} - 이미지 상세 정보",
+            "metrics": "/metrics - Prometheus 형식 메트릭",
             "docs": "/docs - API 문서 (Swagger UI)",
             "redoc": "/redoc - API 문서 (ReDoc)"
         },
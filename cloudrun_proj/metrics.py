@@ -0,0 +1,213 @@
+import contextvars
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# 지연 시간 히스토그램 기본 구간(초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 요청마다 Supabase 쿼리 수를 세기 위한 컨텍스트 (asyncio.gather로 만든 태스크에도 전달됨)
+_request_db_calls: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_db_calls", default=None)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """레이블 값 조합별로 값을 보관하는 공통 부분"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블은 {self.labelnames} 이어야 합니다. (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return "\n".join(lines)
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """누적 구간(le)별 개수와 합계/개수를 기록하는 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][index] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def _render_value(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, state["buckets"]):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class Registry:
+    """메트릭을 모아 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "요청 처리 시간", ("method", "route", "status")
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "supabase_queries_per_request", "요청 하나에서 실행한 Supabase 쿼리 수", ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50)
+)
+DB_QUERY_DURATION = registry.histogram(
+    "supabase_query_duration_seconds", "Supabase 쿼리 하나의 소요 시간", ("outcome",)
+)
+DB_QUERIES = registry.counter("supabase_queries_total", "Supabase 쿼리 수", ("outcome",))
+RANDOM_IMAGES_RESPONSES = registry.counter(
+    "random_images_responses_total", "/random-images 응답 수 (source: supabase/fallback, reason: 폴백 이유)",
+    ("source", "reason")
+)
+CIRCUIT_STATE = registry.gauge("supabase_circuit_state", "Supabase 서킷 상태 (0: closed, 1: half_open, 2: open)")
+FALLBACK_POOL_SIZE = registry.gauge("fallback_pool_images", "폴백 이미지 풀 크기")
+FCM_SEND_DURATION = registry.histogram("fcm_send_duration_seconds", "FCM 메시지 전송 시간", ("outcome",))
+
+
+def record_db_query(seconds: float, outcome: str):
+    """Supabase 쿼리 하나의 결과를 기록하고, 현재 요청의 쿼리 수를 늘립니다."""
+    DB_QUERIES.inc(outcome=outcome)
+    DB_QUERY_DURATION.observe(seconds, outcome=outcome)
+    calls = _request_db_calls.get()
+    if calls is not None:
+        calls[0] += 1
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 처리 시간과 요청당 Supabase 쿼리 수를 기록하는 ASGI 미들웨어.
+    route 레이블은 실제 경로가 아닌 라우트 템플릿(/images/{image_id})을 사용해 레이블 수가 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+        calls = [0]
+        token = _request_db_calls.set(calls)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_calls.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                elapsed, method=scope["method"], route=route_path, status=str(status["code"])
+            )
+            DB_QUERIES_PER_REQUEST.observe(calls[0], route=route_path)
@@ -0,0 +1,139 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main을 import하기 전에 설정 (쿼리 시간 제한은 함수 기본값으로 고정되므로 짧게)
+os.environ.setdefault("FALLBACK_SNAPSHOT_PATH", os.path.join(tempfile.mkdtemp(), "fallback_snapshot.json"))
+os.environ.setdefault("DB_QUERY_TIMEOUT", "0.2")
+os.environ.setdefault("DB_REQUEST_BUDGET", "0.5")
+os.environ.setdefault("DB_FAILURE_THRESHOLD", "3")
+os.environ.setdefault("DB_OPEN_SECONDS", "30")
+
+
+def _install_stub_modules():
+    """supabase/firebase_admin 없이(GCP 연결 없이) main을 import할 수 있도록 최소한의 모듈을 등록합니다."""
+    try:
+        import supabase  # noqa: F401
+        import postgrest.exceptions  # noqa: F401
+    except ImportError:
+        supabase = types.ModuleType("supabase")
+        supabase.Client = object
+        supabase.create_client = lambda url, key: None
+        postgrest = types.ModuleType("postgrest")
+        exceptions = types.ModuleType("postgrest.exceptions")
+
+        class APIError(Exception):
+            def __init__(self, error):
+                super().__init__(error)
+                self.message = error.get("message")
+                self.code = error.get("code")
+
+        exceptions.APIError = APIError
+        postgrest.exceptions = exceptions
+        sys.modules.update({"supabase": supabase, "postgrest": postgrest, "postgrest.exceptions": exceptions})
+
+    try:
+        import firebase_admin  # noqa: F401
+    except ImportError:
+        firebase_admin = types.ModuleType("firebase_admin")
+        firebase_admin._apps = {}
+        firebase_admin.initialize_app = lambda *args, **kwargs: None
+        firebase_admin.credentials = types.ModuleType("firebase_admin.credentials")
+        firebase_admin.messaging = types.ModuleType("firebase_admin.messaging")
+        sys.modules.update({
+            "firebase_admin": firebase_admin,
+            "firebase_admin.credentials": firebase_admin.credentials,
+            "firebase_admin.messaging": firebase_admin.messaging,
+        })
+
+
+_install_stub_modules()
+
+import main  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from postgrest.exceptions import APIError  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """supabase 쿼리 빌더를 흉내 내며 호출된 필터를 기록합니다."""
+
+    def __init__(self, client):
+        self.client = client
+        self.filters = {}
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.filters[name] = args
+            return self
+        return record
+
+    def execute(self):
+        self.client.executed += 1
+        delay = self.client.delay + (self.client.offset_delay if "offset" in self.filters else 0)
+        if delay:
+            time.sleep(delay)
+        if "eq" in self.filters:
+            image_id = self.filters["eq"][1]
+            if not image_id.startswith("img"):
+                raise APIError({"message": "invalid input syntax for type uuid", "code": "22P02"})
+            return FakeResponse([row for row in self.client.rows if row["id"] == image_id])
+        if "offset" in self.filters:
+            offset = self.filters["offset"][0]
+            return FakeResponse(self.client.rows[offset:offset + 1])
+        return FakeResponse(self.client.rows[:1], count=len(self.client.rows))
+
+
+class FakeSupabaseClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.delay = 0
+        # 오프셋(이미지 한 장) 조회에만 더해지는 지연
+        self.offset_delay = 0
+        self.executed = 0
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    rows = [
+        {"id": f"img{index}", "url": f"https://cdn.example.com/{index}.webp", "title": f"Image {index}",
+         "tags": ["portrait"], "tag_prefix": "IMG", "metadata": {}, "created_at": "2025-01-01T00:00:00"}
+        for index in range(20)
+    ]
+    client = FakeSupabaseClient(rows)
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "test-key")
+    monkeypatch.setattr(main, "create_client", lambda url, key: client)
+    monkeypatch.setattr(main, "supabase_client", None)
+    monkeypatch.setattr(main, "db_breaker", main.CircuitBreaker(main.DB_FAILURE_THRESHOLD, main.DB_OPEN_SECONDS))
+    # 스냅샷 갱신은 테스트 대상이 아니므로 실행하지 않음
+    monkeypatch.setattr(main, "schedule_fallback_refresh", lambda client: None)
+    return client
+
+
+@pytest.fixture
+def api():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def live_api():
+    """요청 사이에도 이벤트 루프가 유지되는 클라이언트 (uvicorn처럼 응답 뒤에도 남은 태스크가 계속 실행됨)"""
+    with TestClient(main.app) as client:
+        yield client
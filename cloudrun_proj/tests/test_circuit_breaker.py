@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+
+
+def test_invalid_image_id_returns_400_without_opening_circuit(fake_db, api):
+    for _ in range(main.DB_FAILURE_THRESHOLD * 2):
+        assert api.get("/images/garbage").status_code == 400
+
+    assert main.db_breaker.state == "closed"
+    assert api.get("/images/img3").json()["id"] == "img3"
+    assert api.get("/random-images?count=5").json()["source"] == "supabase"
+
+
+def test_slow_database_opens_circuit_and_skips_queries(fake_db, api):
+    fake_db.delay = main.DB_QUERY_TIMEOUT + 0.2
+
+    for _ in range(main.DB_FAILURE_THRESHOLD):
+        assert api.get("/random-images?count=3").json()["source"] == "fallback"
+    assert main.db_breaker.state == "open"
+
+    executed = fake_db.executed
+    assert api.get("/random-images?count=3").json()["source"] == "fallback"
+    assert fake_db.executed == executed
+    assert api.get("/images/img1").status_code == 503
+
+
+def test_waiting_in_executor_queue_is_not_a_database_failure(fake_db, api, monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(main, "db_executor", executor)
+    release = threading.Event()
+    executor.submit(release.wait)
+    try:
+        client_before = main.get_supabase_client()
+        for _ in range(main.DB_FAILURE_THRESHOLD + 1):
+            assert api.get("/random-images?count=3").json()["source"] == "fallback"
+
+        assert main.db_breaker.state == "closed"
+        assert main.db_breaker.failures == 0
+        assert main.supabase_client is client_before
+        # 요청 예산이 끝난 뒤 대기열에 남은 쿼리는 실행되지 않음
+        release.set()
+        executor.shutdown(wait=True)
+        assert fake_db.executed == 0
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+
+def test_fan_out_is_limited_per_request(fake_db, api, monkeypatch):
+    running = []
+    peak = []
+    lock = threading.Lock()
+    original_execute = main.run_db_query
+
+    async def tracking_run_db_query(query, timeout=main.DB_QUERY_TIMEOUT):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        try:
+            return await original_execute(query, timeout)
+        finally:
+            with lock:
+                running.pop()
+
+    monkeypatch.setattr(main, "run_db_query", tracking_run_db_query)
+    fake_db.delay = 0.01
+
+    assert api.get("/random-images?count=12").json()["count"] == 12
+    assert max(peak) <= main.DB_MAX_PARALLEL_QUERIES
+
+
+def _queries_after_fallback(fake_db, api, count):
+    """폴백 응답까지 보낸 쿼리 수를 반환하고, 응답 뒤에는 쿼리가 더 실행되지 않는지 확인합니다."""
+    executed = fake_db.executed
+    assert api.get(f"/random-images?count={count}").json()["source"] == "fallback"
+    sent = fake_db.executed - executed
+    time.sleep(1.0)
+    assert fake_db.executed - executed == sent
+    return sent
+
+
+def test_failed_offset_query_cancels_remaining_queries(fake_db, live_api):
+    # 첫 오프셋 조회가 시간 초과되면 나머지 조회는 보내지 않음
+    fake_db.offset_delay = main.DB_QUERY_TIMEOUT + 0.2
+    # 전체 개수 조회 1번 + 처음 동시에 보낸 오프셋 조회만
+    assert _queries_after_fallback(fake_db, live_api, 12) <= 1 + main.DB_MAX_PARALLEL_QUERIES
+
+
+def test_request_budget_cancels_remaining_queries(fake_db, live_api):
+    # 쿼리 하나는 시간 안에 끝나지만 전체가 요청 예산을 넘는 경우
+    fake_db.offset_delay = main.DB_QUERY_TIMEOUT * 0.75
+    assert _queries_after_fallback(fake_db, live_api, 50) < 1 + 50
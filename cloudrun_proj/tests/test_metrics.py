@@ -0,0 +1,80 @@
+import re
+
+import main
+import metrics
+
+
+def _sample(text, name, **labels):
+    """/metrics 출력에서 지정한 레이블의 샘플 값을 읽습니다. 없으면 0."""
+    for line in text.splitlines():
+        match = re.match(r"^([a-zA-Z_:]+)(?:\{(.*)\})? (\S+)$", line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2) or ""))
+        if found == labels:
+            return float(match.group(3))
+    return 0.0
+
+
+def test_route_label_uses_template_and_unmatched(fake_db, api):
+    assert api.get("/images/img3").status_code == 200
+    assert api.get("/images/img4").status_code == 200
+    assert api.get("/nope/123").status_code == 404
+
+    text = api.get("/metrics").text
+    assert 'route="/images/{image_id}"' in text
+    assert 'route="unmatched"' in text
+    assert "/images/img3" not in text
+    assert "/nope/123" not in text
+
+
+def test_queries_per_request_histogram(fake_db, api):
+    route = "/random-images"
+    before = api.get("/metrics").text
+    count_before = metrics.DB_QUERIES_PER_REQUEST.count(route=route)
+
+    executed = fake_db.executed
+    assert api.get("/random-images?count=5").json()["source"] == "supabase"
+    queries = fake_db.executed - executed
+
+    after = api.get("/metrics").text
+    assert metrics.DB_QUERIES_PER_REQUEST.count(route=route) == count_before + 1
+    sum_delta = _sample(after, "supabase_queries_per_request_sum", route=route) - \
+        _sample(before, "supabase_queries_per_request_sum", route=route)
+    # 전체 개수 조회 1번 + 이미지 5장
+    assert queries == 6
+    assert sum_delta == queries
+
+
+def test_fallback_reason_counters(fake_db, api):
+    counter = metrics.RANDOM_IMAGES_RESPONSES
+    supabase_before = counter.value(source="supabase", reason="")
+    disabled_before = counter.value(source="fallback", reason="disabled")
+    timeout_before = counter.value(source="fallback", reason="timeout")
+    open_before = counter.value(source="fallback", reason="circuit_open")
+
+    assert api.get("/random-images?count=3").json()["source"] == "supabase"
+    assert api.get("/random-images?count=3&use_db=false").json()["source"] == "fallback"
+    fake_db.delay = main.DB_QUERY_TIMEOUT + 0.2
+    for _ in range(main.DB_FAILURE_THRESHOLD):
+        api.get("/random-images?count=3")
+    api.get("/random-images?count=3")
+
+    assert counter.value(source="supabase", reason="") == supabase_before + 1
+    assert counter.value(source="fallback", reason="disabled") == disabled_before + 1
+    assert counter.value(source="fallback", reason="timeout") == timeout_before + main.DB_FAILURE_THRESHOLD
+    assert counter.value(source="fallback", reason="circuit_open") == open_before + 1
+
+    text = api.get("/metrics").text
+    assert _sample(text, "random_images_responses_total", source="fallback", reason="circuit_open") >= 1
+
+
+def test_circuit_state_gauge(fake_db, api):
+    assert _sample(api.get("/metrics").text, "supabase_circuit_state") == 0
+
+    fake_db.delay = main.DB_QUERY_TIMEOUT + 0.2
+    for _ in range(main.DB_FAILURE_THRESHOLD):
+        api.get("/random-images?count=3")
+    assert main.db_breaker.state == "open"
+
+    assert _sample(api.get("/metrics").text, "supabase_circuit_state") == 2
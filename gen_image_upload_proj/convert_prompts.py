@@ -1,5 +1,6 @@
 import json
 import os
+import re
 
 
 def convert_txt_to_json(input_filepath: str, output_filepath: str):
@@ -50,14 +51,60 @@ def convert_txt_to_json(input_filepath: str, output_filepath: str):
         print(f"❌ 오류 발생 중 파일 처리: {e}")
 
 
+def convert_jsonl_to_json(input_filepath: str, output_filepath: str):
+    """
+    prompt_extractor의 JSONL 배치 출력을 firefly_prompt.json 형식으로 변환합니다.
+    이미지 경로의 파일명에서 'ff-XXXXX' 태그 접두어를 찾아 키로 사용합니다.
+
+    Args:
+        input_filepath (str): prompt_extractor가 생성한 JSONL 파일 경로.
+        output_filepath (str): 출력 JSON 파일의 경로.
+    """
+    data = {}
+    pattern = re.compile(r'([a-zA-Z]{2}-\d{5})')
+
+    try:
+        with open(input_filepath, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"⚠️ 경고: {input_filepath} 파일의 {line_num}번째 줄이 올바른 JSON이 아닙니다. 건너뜁니다.")
+                    continue
+
+                match = pattern.search(os.path.basename(record.get('path', '')))
+                if not match or not record.get('positive'):
+                    print(f"⚠️ 경고: {line_num}번째 레코드에서 'ff-XXXXX' 태그 접두어 또는 프롬프트를 찾을 수 없어 건너뜁니다.")
+                    continue
+
+                data[match.group(1).lower()] = {"prompt": record['positive']}
+
+        with open(output_filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+        print(f"\n✅ 변환 완료: '{input_filepath}' -> '{output_filepath}'")
+        print(f"   총 {len(data)}개의 프롬프트가 JSON으로 저장되었습니다.")
+
+    except FileNotFoundError:
+        print(f"❌ 오류: 파일을 찾을 수 없습니다. 경로를 확인해주세요: '{input_filepath}'")
+    except Exception as e:
+        print(f"❌ 오류 발생 중 파일 처리: {e}")
+
+
 if __name__ == "__main__":
     # 사용자로부터 입력 및 출력 파일 경로 받기
-    input_file = input("변환할 텍스트 파일 경로를 입력하세요 (예: input.txt): ")
+    input_file = input("변환할 텍스트/JSONL 파일 경로를 입력하세요 (예: input.txt, prompts.jsonl): ")
     output_file = input("저장할 JSON 파일 경로를 입력하세요 (예: output.json): ")
 
     # 파일 경로 유효성 검사 (선택 사항)
     if not os.path.exists(input_file):
         print(f"❌ 오류: 입력 파일 '{input_file}'이 존재하지 않습니다.")
+    elif input_file.lower().endswith('.jsonl'):
+        convert_jsonl_to_json(input_file, output_file)
     else:
         convert_txt_to_json(input_file, output_file)
 
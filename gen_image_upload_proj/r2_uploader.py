@@ -6,6 +6,7 @@ import mimetypes
 from datetime import datetime
 import uuid
 import io
+import base64
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 from PIL import Image
@@ -17,6 +18,11 @@ load_dotenv()
 class R2Uploader:
     """Cloudflare R2 이미지 업로드 클래스"""
     
+    # 갤러리 그리드용 썸네일 가로 크기 (250px 타일의 2배 밀도 화면 기준)
+    THUMBNAIL_WIDTH = 480
+    # 이미지가 도착하기 전 흐리게 보여줄 LQIP 플레이스홀더 가로 크기
+    LQIP_WIDTH = 16
+    
     def __init__(self):
         """R2 업로더 초기화"""
         self.access_key_id = os.getenv("R2_ACCESS_KEY_ID")
@@ -96,9 +102,15 @@ class R2Uploader:
             if not webp_result['success']:
                 return webp_result  # WebP 실패시 에러 반환
             
+            # 3. 그리드용 썸네일 + LQIP 생성 (실패해도 업로드는 계속, 갤러리는 WebP를 그대로 사용)
+            thumb_key = f"thumb/{date_folder}/{webp_filename}"
+            thumb_result = self._convert_and_upload_thumbnail(file_path, thumb_key, webp_filename)
+            
             upload_status = "WebP"
             if is_png:
                 upload_status = "원본 + WebP"
+            if thumb_result['success']:
+                upload_status += " + 썸네일"
             
             print(f"✅ 업로드 완료: {file_name} ({upload_status})")
             
@@ -119,6 +131,16 @@ class R2Uploader:
                 'uploaded_at': datetime.now().isoformat()
             }
             
+            if thumb_result['success']:
+                result_data['thumbnail'] = {
+                    'public_url': thumb_result['public_url'],
+                    'r2_key': thumb_key,
+                    'width': thumb_result['width'],
+                    'height': thumb_result['height'],
+                    'file_size': thumb_result['file_size']
+                }
+                result_data['lqip'] = thumb_result['lqip']
+            
             # PNG인 경우에만 원본 정보 추가
             if is_png and original_result:
                 result_data['original'] = {
@@ -248,6 +270,62 @@ class R2Uploader:
                 'error': str(e)
             }
     
+    def _convert_and_upload_thumbnail(self, file_path: str, key: str, display_name: str) -> Dict:
+        """갤러리 그리드용 작은 WebP 썸네일을 업로드하고, 인라인용 LQIP(data URI)를 생성"""
+        try:
+            with Image.open(file_path) as img:
+                if img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+                
+                original_width, original_height = img.size
+                thumb_width = min(self.THUMBNAIL_WIDTH, original_width)
+                thumb_height = max(1, round(original_height * thumb_width / original_width))
+                thumb = img.resize((thumb_width, thumb_height), Image.Resampling.LANCZOS)
+                
+                thumb_buffer = io.BytesIO()
+                thumb.save(thumb_buffer, format='WebP', quality=75, method=6)
+                
+                # LQIP: 아주 작은 WebP를 base64로 DB에 저장 (추가 요청 없이 즉시 표시)
+                lqip_height = max(1, round(original_height * self.LQIP_WIDTH / original_width))
+                lqip_buffer = io.BytesIO()
+                thumb.resize((self.LQIP_WIDTH, lqip_height), Image.Resampling.BILINEAR) \
+                    .save(lqip_buffer, format='WebP', quality=30)
+                lqip = "data:image/webp;base64," + base64.b64encode(lqip_buffer.getvalue()).decode('ascii')
+            
+            print(f"📤 썸네일 업로드 중: {display_name} → {key} ({thumb_width}x{thumb_height})")
+            
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=thumb_buffer.getvalue(),
+                ContentType='image/webp',
+                # 내용이 바뀌지 않는 파일이므로 브라우저/CDN에서 오래 캐시
+                CacheControl='public, max-age=31536000, immutable',
+                Metadata={
+                    'upload-date': datetime.now().isoformat(),
+                    'original-filename': display_name,
+                    'resized-to': f"{thumb_width}x{thumb_height}"
+                }
+            )
+            
+            public_url = f"{self.public_url}/{key}" if self.public_url else f"https://{self.bucket_name}.r2.dev/{key}"
+            
+            return {
+                'success': True,
+                'public_url': public_url,
+                'width': thumb_width,
+                'height': thumb_height,
+                'file_size': thumb_buffer.getbuffer().nbytes,
+                'lqip': lqip
+            }
+            
+        except Exception as e:
+            print(f"⚠️ 썸네일 생성 실패 {display_name}: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def _get_image_info(self, file_path: str) -> Dict:
         """이미지 파일 정보 추출"""
         try:
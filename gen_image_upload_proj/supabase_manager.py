@@ -157,6 +157,15 @@ class SupabaseManager:
             "webp_url": webp_data.get('public_url', '')
         }
         
+        # 그리드용 썸네일과 LQIP (없으면 갤러리는 WebP URL을 그대로 사용)
+        thumbnail_data = upload_result.get('thumbnail')
+        if thumbnail_data:
+            metadata["thumbnail_url"] = thumbnail_data['public_url']
+            metadata["thumbnail_width"] = thumbnail_data['width']
+            metadata["thumbnail_height"] = thumbnail_data['height']
+        if upload_result.get('lqip'):
+            metadata["lqip"] = upload_result['lqip']
+        
         # 커스텀 데이터 병합
         if custom_data:
             metadata.update(custom_data)
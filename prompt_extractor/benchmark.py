@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+프롬프트 추출 성능 벤치마크
+ComfyUI workflow / API prompt / WebUI parameters 메타데이터를 가진 합성 PNG 코퍼스를 만들고,
+리더별로 PromptProcessor를 단일 스레드/병렬로 실행해 처리량, 읽은 바이트 수, 최대 RSS를 측정합니다.
+
+사용 예시:
+ # 합성 코퍼스 생성
+ python benchmark.py generate bench_corpus --count 300
+
+ # 벤치마크 실행
+ python benchmark.py run bench_corpus --workers 8
+ python benchmark.py run bench_corpus --readers universal --json bench_result.json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from prompt_processor import (
+    PromptProcessor,
+    ComfyUIMetadataReader,
+    ParametersMetadataReader,
+    UniversalMetadataReader,
+    ComfyUIPromptExtractor,
+    FileManager,
+)
+
+
+READERS = {
+    'comfyui': ComfyUIMetadataReader,
+    'parameters': ParametersMetadataReader,
+    'universal': UniversalMetadataReader,
+}
+
+# 실제 생성 이미지에서 흔한 해상도 (scale로 축소해서 사용)
+IMAGE_SIZES = [(512, 512), (768, 768), (1024, 1024), (832, 1216), (1216, 832)]
+
+# 워크플로우 노드 수 분포: 대부분 작은 그래프, 일부는 수백 노드의 큰 그래프
+WORKFLOW_NODE_COUNTS = [8, 15, 30, 60, 150, 300]
+WORKFLOW_NODE_WEIGHTS = [25, 30, 20, 12, 9, 4]
+
+VOCABULARY = [
+    'masterpiece', 'best quality', 'detailed', 'portrait', 'landscape', 'cinematic lighting',
+    'soft focus', 'anime style', 'photorealistic', 'dramatic shadows', 'forest', 'city at night',
+    'cherry blossoms', 'school uniform', 'cyberpunk', 'watercolor', 'oil painting', 'bokeh',
+    'wide angle', 'close-up', 'golden hour', 'volumetric fog', 'intricate details', '8k',
+]
+NEGATIVE_VOCABULARY = [
+    'lowres', 'bad anatomy', 'bad hands', 'text', 'error', 'missing fingers', 'extra digit',
+    'cropped', 'worst quality', 'jpeg artifacts', 'signature', 'watermark', 'blurry',
+]
+SAMPLERS = ['euler', 'euler_ancestral', 'dpmpp_2m', 'dpmpp_sde', 'uni_pc']
+
+
+def _random_prompt(rng: random.Random, vocabulary: List[str], min_terms: int, max_terms: int) -> str:
+    return ', '.join(rng.choice(vocabulary) for _ in range(rng.randint(min_terms, max_terms)))
+
+
+def _build_workflow(rng: random.Random, positive: str, negative: str) -> dict:
+    """positive/negative CLIPTextEncode와 KSampler를 포함한 UI workflow 형식 그래프를 만듭니다."""
+    node_count = rng.choices(WORKFLOW_NODE_COUNTS, weights=WORKFLOW_NODE_WEIGHTS)[0]
+    nodes = [
+        {'id': 1, 'type': 'CLIPTextEncode', 'title': 'Positive', 'widgets_values': [positive]},
+        {'id': 2, 'type': 'CLIPTextEncode', 'widgets_values': [negative]},
+        {
+            'id': 3, 'type': 'KSampler',
+            'inputs': [{'name': 'positive', 'link': 1}, {'name': 'negative', 'link': 2}],
+            'widgets_values': [rng.randint(0, 2 ** 32), 'randomize', rng.randint(20, 40),
+                               round(rng.uniform(4, 9), 1), rng.choice(SAMPLERS), 'karras', 1.0],
+        },
+    ]
+    # 나머지는 위치/크기/위젯 값을 가진 더미 노드로 채워 실제 그래프 크기를 흉내냅니다
+    for node_id in range(4, node_count + 1):
+        nodes.append({
+            'id': node_id,
+            'type': rng.choice(['LoraLoader', 'VAEDecode', 'ImageScale', 'ControlNetApply', 'Note']),
+            'pos': [rng.randint(0, 4000), rng.randint(0, 4000)],
+            'size': [rng.randint(200, 600), rng.randint(100, 400)],
+            'widgets_values': [_random_prompt(rng, VOCABULARY, 1, 6), rng.random(), rng.randint(0, 100)],
+        })
+
+    return {
+        'last_node_id': node_count,
+        'nodes': nodes,
+        'links': [[1, 1, 0, 3, 1, 'CONDITIONING'], [2, 2, 0, 3, 2, 'CONDITIONING']],
+        'version': 0.4,
+    }
+
+
+def _build_api_prompt(rng: random.Random, positive: str, negative: str) -> dict:
+    """workflow 없이 API prompt만 저장된 형식입니다."""
+    return {
+        '3': {'class_type': 'KSampler', 'inputs': {
+            'seed': rng.randint(0, 2 ** 32), 'steps': rng.randint(20, 40), 'cfg': round(rng.uniform(4, 9), 1),
+            'sampler_name': rng.choice(SAMPLERS), 'scheduler': 'karras', 'denoise': 1.0,
+            'positive': ['6', 0], 'negative': ['7', 0], 'model': ['4', 0], 'latent_image': ['5', 0]}},
+        '6': {'class_type': 'CLIPTextEncode', 'inputs': {'text': positive, 'clip': ['4', 1]}},
+        '7': {'class_type': 'CLIPTextEncode', 'inputs': {'text': negative, 'clip': ['4', 1]}},
+    }
+
+
+def _build_parameters(rng: random.Random, positive: str, negative: str, size: tuple) -> str:
+    return (
+        f"{positive}\nNegative prompt: {negative}\n"
+        f"Steps: {rng.randint(20, 40)}, Sampler: DPM++ 2M Karras, CFG scale: {round(rng.uniform(4, 9), 1)}, "
+        f"Seed: {rng.randint(0, 2 ** 32)}, Size: {size[0]}x{size[1]}, Model: sd_xl_base_1.0"
+    )
+
+
+def generate_corpus(output_dir: str, count: int = 200, seed: int = 0, scale: float = 0.5) -> Dict[str, int]:
+    """workflow / api_prompt / parameters 형식의 합성 PNG를 생성합니다. 형식별 생성 개수를 반환합니다."""
+    rng = random.Random(seed)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    kinds = ['workflow', 'api_prompt', 'parameters']
+    counts = {kind: 0 for kind in kinds}
+
+    for index in range(count):
+        # ComfyUI 이미지가 대부분이고 WebUI 이미지가 일부 섞인 폴더를 가정
+        kind = rng.choices(kinds, weights=[60, 15, 25])[0]
+        base_size = rng.choice(IMAGE_SIZES)
+        size = (max(8, int(base_size[0] * scale)), max(8, int(base_size[1] * scale)))
+
+        positive = _random_prompt(rng, VOCABULARY, 10, 60)
+        negative = _random_prompt(rng, NEGATIVE_VOCABULARY, 5, 30)
+
+        info = PngInfo()
+        if kind == 'workflow':
+            info.add_text('prompt', json.dumps(_build_api_prompt(rng, positive, negative)))
+            info.add_text('workflow', json.dumps(_build_workflow(rng, positive, negative)))
+        elif kind == 'api_prompt':
+            info.add_text('prompt', json.dumps(_build_api_prompt(rng, positive, negative)))
+        else:
+            info.add_text('parameters', _build_parameters(rng, positive, negative, base_size))
+
+        # 노이즈 픽셀은 거의 압축되지 않아 실제 생성 이미지와 비슷한 파일 크기가 됩니다
+        pixels = rng.randbytes(size[0] * size[1] * 3)
+        image = Image.frombytes('RGB', size, pixels)
+        image.save(output_path / f"{kind}_{index:05d}.png", pnginfo=info, compress_level=1)
+        counts[kind] += 1
+
+    return counts
+
+
+def _read_bytes_so_far() -> Optional[int]:
+    """현재 프로세스가 read 시스템 콜로 읽은 누적 바이트 수 (Linux /proc 전용)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(reader_name: str, image_paths: List[str], workers: int) -> dict:
+    """하나의 (리더, 워커 수) 조합을 실행합니다. 최대 RSS를 분리하기 위해 별도 프로세스에서 호출됩니다."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        processor = PromptProcessor(READERS[reader_name](), ComfyUIPromptExtractor(), FileManager(output_dir))
+
+        bytes_before = _read_bytes_so_far()
+        started = time.perf_counter()
+
+        if workers <= 1:
+            results = [processor.extract_record(path) for path in image_paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(processor.extract_record, image_paths))
+
+        elapsed = time.perf_counter() - started
+        bytes_after = _read_bytes_so_far()
+
+    return {
+        'reader': reader_name,
+        'workers': workers,
+        'images': len(image_paths),
+        'extracted': sum(1 for record, _ in results if record),
+        'seconds': round(elapsed, 4),
+        'images_per_sec': round(len(image_paths) / elapsed, 1) if elapsed > 0 else None,
+        'bytes_read': bytes_after - bytes_before if bytes_before is not None and bytes_after is not None else None,
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def run_benchmark(corpus_dir: str, workers: int = 4, readers: Optional[List[str]] = None) -> List[dict]:
+    """리더마다 단일 스레드와 병렬 실행을 각각 새 프로세스에서 측정합니다."""
+    image_paths = FileManager().get_image_files(corpus_dir)
+    if not image_paths:
+        raise ValueError(f"코퍼스 폴더에 이미지가 없습니다: {corpus_dir}")
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    for reader_name in readers or list(READERS):
+        for worker_count in sorted({1, workers}):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(_run_case, reader_name, image_paths, worker_count).result()
+            results.append(result)
+            print(_format_row(result))
+
+    return results
+
+
+def _format_row(result: dict) -> str:
+    bytes_read = result['bytes_read']
+    read_mb = f"{bytes_read / (1024 * 1024):.1f} MB" if bytes_read is not None else "n/a"
+    return (
+        f"{result['reader']:<12} workers={result['workers']:<3} "
+        f"{result['images_per_sec']:>9} img/s  "
+        f"추출 {result['extracted']}/{result['images']}  "
+        f"읽기 {read_mb:>10}  "
+        f"최대 RSS {result['peak_rss_mb']} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="프롬프트 추출기 벤치마크 및 합성 코퍼스 생성기",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help='합성 PNG 코퍼스 생성')
+    generate_parser.add_argument('output_dir', help='코퍼스를 생성할 폴더')
+    generate_parser.add_argument('--count', type=int, default=200, help='생성할 이미지 수 (기본값: 200)')
+    generate_parser.add_argument('--seed', type=int, default=0, help='난수 시드 (기본값: 0)')
+    generate_parser.add_argument('--scale', type=float, default=0.5,
+                                 help='해상도 배율, 파일 크기 조절용 (기본값: 0.5)')
+
+    run_parser = subparsers.add_parser('run', help='벤치마크 실행')
+    run_parser.add_argument('corpus_dir', help='코퍼스 폴더')
+    run_parser.add_argument('-w', '--workers', type=int, default=4, help='병렬 실행 워커 수 (기본값: 4)')
+    run_parser.add_argument('--readers', nargs='+', choices=list(READERS), help='측정할 리더 (기본값: 전체)')
+    run_parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        started = time.perf_counter()
+        counts = generate_corpus(args.output_dir, args.count, args.seed, args.scale)
+        print(f"✅ 코퍼스 생성 완료: {args.output_dir} ({time.perf_counter() - started:.1f}초)")
+        for kind, kind_count in counts.items():
+            print(f"  - {kind}: {kind_count}개")
+        return
+
+    print(f"📊 벤치마크: {args.corpus_dir} (페이지 캐시가 데워진 상태 기준)")
+    try:
+        results = run_benchmark(args.corpus_dir, args.workers, args.readers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"📁 저장 위치: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from prompt_processor import PromptProcessor, FileManager
+from record_writers import create_record_writer, detect_output_format
+
+try:
+    # watchdog은 Linux에서 inotify, macOS에서 FSEvents를 사용합니다
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class _ImageEventHandler(FileSystemEventHandler):
+    """파일 생성/수정/이동 이벤트를 경로 큐로 전달하는 핸들러"""
+
+    def __init__(self, event_queue: queue.Queue):
+        super().__init__()
+        self.event_queue = event_queue
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.event_queue.put(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.event_queue.put(event.src_path)
+
+    def on_moved(self, event):
+        # 임시 파일로 쓴 뒤 rename 하는 경우 도착 경로가 실제 이미지입니다
+        if not event.is_directory:
+            self.event_queue.put(event.dest_path)
+
+
+class FolderWatcher:
+    """폴더에 새로 저장되는 이미지를 감지해 프롬프트를 추출하고 구조화된 출력에 append 하는 데몬"""
+
+    def __init__(self,
+                 processor: PromptProcessor,
+                 folder_path: str,
+                 output_file: str,
+                 output_format: Optional[str] = None,
+                 workers: int = 4,
+                 settle_seconds: float = 2.0,
+                 poll_interval: float = 2.0,
+                 use_polling: bool = False):
+        self.processor = processor
+        self.folder_path = folder_path
+        self.output_file = output_file
+        self.output_format = detect_output_format(output_file, output_format)
+        self.workers = workers
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling or Observer is None
+
+        if self.output_format == 'parquet':
+            raise ValueError("감시 모드는 append 가능한 txt/jsonl 출력만 지원합니다")
+
+        self._events: queue.Queue = queue.Queue()
+        # 경로 -> (크기, 수정 시각, 마지막으로 변화가 관측된 시각)
+        self._pending: Dict[str, Tuple[int, float, float]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._processed: Set[str] = set()
+        # txt 출력에는 이미지 경로가 없으므로 처리한 경로를 별도 파일(<출력 파일>.processed)에 기록합니다
+        self.processed_file = f"{output_file}.processed" if self.output_format == 'txt' else None
+        self._processed_log = None
+
+        self.success_count = 0
+        self.failure_count = 0
+
+    def _is_image(self, path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in FileManager.IMAGE_EXTENSIONS
+
+    def _load_processed_paths(self) -> None:
+        """기존 JSONL 출력(txt는 .processed 파일)에 기록된 경로를 불러와 재시작 시 중복 처리를 막습니다."""
+        if self.processed_file:
+            if not os.path.exists(self.processed_file):
+                return
+            with open(self.processed_file, 'r', encoding='utf-8') as f:
+                self._processed.update(line.rstrip('\n') for line in f if line.strip())
+        else:
+            if not os.path.exists(self.output_file):
+                return
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        path = json.loads(line).get('path')
+                    except json.JSONDecodeError:
+                        continue
+                    if path:
+                        self._processed.add(os.path.abspath(path))
+
+        print(f"📚 기존 출력에서 처리 완료된 이미지 {len(self._processed)}개를 불러왔습니다")
+
+    def _enqueue_existing_files(self) -> None:
+        """시작 시점에 이미 폴더에 있는 미처리 이미지를 대기열에 추가합니다."""
+        for image_path in self.processor.file_manager.iter_image_files(self.folder_path):
+            self._events.put(image_path)
+
+    def _track(self, path: str, now: float) -> None:
+        """이벤트가 발생한 파일의 크기/수정 시각을 기록해 쓰기 완료 여부를 판단할 수 있게 합니다."""
+        path = os.path.abspath(path)
+        if not self._is_image(path) or path in self._processed or path in self._in_flight:
+            return
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # 이벤트 직후 삭제/이동된 파일
+            self._pending.pop(path, None)
+            return
+
+        previous = self._pending.get(path)
+        if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime:
+            return
+        self._pending[path] = (stat.st_size, stat.st_mtime, now)
+
+    def _is_complete(self, path: str) -> bool:
+        """PNG는 IEND 청크까지 기록되었는지 확인합니다. 그 외 형식은 크기 안정화만으로 판단합니다."""
+        if not path.lower().endswith('.png'):
+            return True
+        try:
+            with open(path, 'rb') as f:
+                f.seek(-12, os.SEEK_END)
+                return b'IEND' in f.read()
+        except OSError:
+            return False
+
+    def _dispatch_settled(self, executor: ThreadPoolExecutor, now: float) -> None:
+        """settle_seconds 동안 변화가 없는 파일을 워커 풀에 제출합니다."""
+        for path, (size, mtime, changed_at) in list(self._pending.items()):
+            if now - changed_at < self.settle_seconds:
+                continue
+
+            # 마지막 확인 이후 변화가 있으면 다시 대기
+            self._track(path, now)
+            if self._pending.get(path, (None, None, None))[2] != changed_at:
+                continue
+
+            del self._pending[path]
+            if size == 0 or not self._is_complete(path):
+                self._pending[path] = (size, mtime, now)
+                continue
+
+            self._in_flight[path] = executor.submit(self.processor.extract_record, path)
+
+    def _collect_results(self, writer) -> None:
+        """완료된 추출 작업의 결과를 출력 파일에 기록합니다. writer는 이 스레드에서만 사용합니다."""
+        for path, future in list(self._in_flight.items()):
+            if not future.done():
+                continue
+
+            del self._in_flight[path]
+            self._processed.add(path)
+
+            try:
+                record, error_message = future.result()
+            except Exception as e:
+                record, error_message = None, str(e)
+
+            if not record:
+                self.failure_count += 1
+                print(f"❌ {Path(path).name}: {error_message}")
+                continue
+
+            writer.write(record.to_dict())
+            if self._processed_log:
+                self._processed_log.write(f"{path}\n")
+                self._processed_log.flush()
+            self.success_count += 1
+            print(f"✅ 추가됨: {Path(path).name} ({record.format}, {len(record.positive)} 문자)")
+
+    def _start_observer(self):
+        if self.use_polling:
+            print(f"🔁 폴링 모드로 감시합니다 (간격 {self.poll_interval}초)")
+            return None
+
+        observer = Observer()
+        observer.schedule(_ImageEventHandler(self._events), self.folder_path, recursive=False)
+        observer.start()
+        print("👀 파일 시스템 이벤트로 감시합니다")
+        return observer
+
+    def run(self, initial_scan: bool = True) -> int:
+        """Ctrl+C로 중단할 때까지 폴더를 감시합니다. 성공적으로 추가된 이미지 수를 반환합니다."""
+        if not os.path.isdir(self.folder_path):
+            print(f"❌ 폴더가 존재하지 않습니다: {self.folder_path}")
+            return 0
+
+        print(f"폴더 감시 시작: {self.folder_path}")
+        print(f"📁 저장 위치: {self.output_file}")
+
+        self._load_processed_paths()
+        if initial_scan:
+            self._enqueue_existing_files()
+
+        observer = self._start_observer()
+        last_poll = time.monotonic()
+        # --settle 0이어도 바쁜 대기가 되지 않도록 최소 간격을 둠
+        tick = max(0.05, min(0.5, self.settle_seconds))
+
+        # 감시 모드는 다른 도구가 바로 읽을 수 있도록 레코드마다 flush 합니다
+        writer = create_record_writer(self.output_file, self.output_format, flush_every=1)
+        if self.processed_file:
+            self._processed_log = open(self.processed_file, 'a', encoding='utf-8')
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                if self.use_polling and now - last_poll >= self.poll_interval:
+                    self._enqueue_existing_files()
+                    last_poll = now
+
+                while True:
+                    try:
+                        self._track(self._events.get_nowait(), now)
+                    except queue.Empty:
+                        break
+
+                self._dispatch_settled(executor, now)
+                self._collect_results(writer)
+                time.sleep(tick)
+
+        except KeyboardInterrupt:
+            print("\n⏹️ 감시를 중단합니다. 진행 중인 작업을 마무리합니다...")
+
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            executor.shutdown(wait=True)
+            self._collect_results(writer)
+            writer.close()
+            if self._processed_log:
+                self._processed_log.close()
+                self._processed_log = None
+
+        print(f"\n📊 결과: 성공 {self.success_count}개, 실패 {self.failure_count}개")
+        return self.success_count
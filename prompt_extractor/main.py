@@ -8,6 +8,7 @@ import sys
 import argparse
 from pathlib import Path
 from prompt_processor import create_default_processor
+from folder_watcher import FolderWatcher
 
 
 def process_single_image_command(args):
@@ -32,7 +33,8 @@ def process_folder_command(args):
 
     success_count = processor.process_folder(
         folder_path=args.folder_path,
-        output_file=args.output_file
+        output_file=args.output_file,
+        output_format=args.format
     )
 
     if success_count > 0:
@@ -42,6 +44,28 @@ def process_folder_command(args):
         sys.exit(1)
 
 
+def watch_folder_command(args):
+    """폴더 감시 명령"""
+    processor = create_default_processor()
+
+    try:
+        watcher = FolderWatcher(
+            processor,
+            folder_path=args.folder_path,
+            output_file=args.output_file,
+            output_format=args.format,
+            workers=args.workers,
+            settle_seconds=args.settle,
+            poll_interval=args.poll_interval,
+            use_polling=args.polling
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    watcher.run(initial_scan=not args.no_initial_scan)
+
+
 def interactive_mode():
     """대화형 모드"""
     print("🤖 ComfyUI 프롬프트 추출기")
@@ -78,7 +102,7 @@ def interactive_mode():
                 print("❌ 경로가 입력되지 않았습니다.")
                 continue
 
-            output_file = input("출력 파일 경로 (예: prompts.txt): ").strip().strip('"')
+            output_file = input("출력 파일 경로 (예: prompts.txt, prompts.jsonl): ").strip().strip('"')
             if not output_file:
                 output_file = "output/batch_prompts.txt"
                 print(f"기본값 사용: {output_file}")
@@ -115,6 +139,13 @@ def main():
 
  # 폴더 배치 처리
  python main_cli.py folder /path/to/images -o batch_prompts.txt
+
+ # 경로/형식/부정 프롬프트/샘플러 설정을 포함한 구조화된 출력
+ python main_cli.py folder /path/to/images -o batch_prompts.jsonl
+ python main_cli.py folder /path/to/images -o batch_prompts.parquet
+
+ # 폴더 감시 (새 이미지가 저장될 때마다 추출하여 append, Ctrl+C로 종료)
+ python main_cli.py watch /path/to/ComfyUI/output -o watch_prompts.jsonl
        """
     )
 
@@ -136,6 +167,54 @@ def main():
         default='output/batch_prompts.txt',
         help='출력 파일 경로 (기본값: output/batch_prompts.txt)'
     )
+    folder_parser.add_argument(
+        '-f', '--format',
+        choices=['txt', 'jsonl', 'parquet'],
+        help='출력 형식 (기본값: 출력 파일 확장자로 자동 결정, 그 외는 txt). '
+             'txt/jsonl은 기존 파일 뒤에 이어서 기록하고, parquet은 파일을 새로 씁니다'
+    )
+
+    # 폴더 감시 명령
+    watch_parser = subparsers.add_parser('watch', help='폴더 감시 (새 이미지 자동 처리)')
+    watch_parser.add_argument('folder_path', help='감시할 이미지 폴더 경로')
+    watch_parser.add_argument(
+        '-o', '--output-file',
+        default='output/watch_prompts.jsonl',
+        help='출력 파일 경로 (기본값: output/watch_prompts.jsonl)'
+    )
+    watch_parser.add_argument(
+        '-f', '--format',
+        choices=['txt', 'jsonl'],
+        help='출력 형식 (기본값: 출력 파일 확장자로 자동 결정)'
+    )
+    watch_parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=4,
+        help='프롬프트 추출 워커 수 (기본값: 4)'
+    )
+    watch_parser.add_argument(
+        '--settle',
+        type=float,
+        default=2.0,
+        help='파일 크기가 이 시간(초) 동안 변하지 않으면 쓰기 완료로 판단 (기본값: 2.0)'
+    )
+    watch_parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=2.0,
+        help='폴링 모드의 폴더 확인 간격(초) (기본값: 2.0)'
+    )
+    watch_parser.add_argument(
+        '--polling',
+        action='store_true',
+        help='파일 시스템 이벤트 대신 폴링 사용 (네트워크 드라이브 등)'
+    )
+    watch_parser.add_argument(
+        '--no-initial-scan',
+        action='store_true',
+        help='시작 시 폴더에 이미 있는 이미지는 처리하지 않음'
+    )
 
     args = parser.parse_args()
 
@@ -144,6 +223,8 @@ def main():
         process_single_image_command(args)
     elif args.command == 'folder':
         process_folder_command(args)
+    elif args.command == 'watch':
+        watch_folder_command(args)
     else:
         # 명령어가 없으면 대화형 모드
         interactive_mode()
@@ -1,12 +1,15 @@
 import json
 import os
 import re
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Iterator, Tuple
 from PIL import Image
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+from record_writers import create_record_writer
+
 
 @dataclass
 class PromptResult:
@@ -16,6 +19,20 @@ class PromptResult:
     error_message: Optional[str] = None
 
 
+@dataclass
+class PromptRecord:
+    """구조화된 내보내기(JSONL/Parquet)용 이미지별 레코드"""
+    path: str
+    hash: str
+    format: str
+    positive: str
+    negative: Optional[str] = None
+    parameters: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
 class ImageMetadataReader(ABC):
     """이미지 메타데이터를 읽는 인터페이스"""
 
@@ -92,8 +109,18 @@ class ParametersMetadataReader(ImageMetadataReader):
 
     def _parse_parameters_string(self, parameters_str: str) -> dict:
         """parameters 문자열을 파싱하여 프롬프트를 추출합니다."""
+        # 마지막 줄의 'Steps: ..., Sampler: ...' 생성 설정을 먼저 분리
+        lines = parameters_str.strip().split('\n')
+        settings_line = ""
+        if lines and lines[-1].strip().startswith('Steps:'):
+            settings_line = lines.pop().strip()
+        body = '\n'.join(lines)
+
         # Negative prompt: 를 기준으로 분할
-        parts = parameters_str.split('\nNegative prompt:', 1)
+        if body.startswith('Negative prompt:'):
+            parts = ["", body[len('Negative prompt:'):]]
+        else:
+            parts = body.split('\nNegative prompt:', 1)
 
         positive_prompt = parts[0].strip()
 
@@ -101,10 +128,26 @@ class ParametersMetadataReader(ImageMetadataReader):
         return {
             'format': 'parameters',
             'positive_prompt': positive_prompt,
-            'negative_prompt': parts[1].split('\n')[0].strip() if len(parts) > 1 else "",
+            'negative_prompt': parts[1].strip() if len(parts) > 1 else "",
+            'parameters': self._parse_settings_line(settings_line),
             'raw_parameters': parameters_str
         }
 
+    def _parse_settings_line(self, settings_line: str) -> dict:
+        """'Steps: 20, Sampler: Euler a, CFG scale: 7' 형태의 설정 줄을 딕셔너리로 변환합니다."""
+        # 값에 쉼표가 들어가는 경우 WebUI는 큰따옴표로 감쌉니다
+        pattern = r'\s*([\w][\w \-/]*?):\s*("(?:\\.|[^\\"])*"|[^,]*)(?:,|$)'
+        parameters = {}
+        for key, value in re.findall(pattern, settings_line):
+            value = value.strip()
+            if value.startswith('"') and value.endswith('"'):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    value = value[1:-1]
+            parameters[key.strip()] = value
+        return parameters
+
 
 class MetadataReaderFactory:
     """적절한 메타데이터 리더를 선택하는 팩토리 클래스"""
@@ -138,6 +181,14 @@ class PromptExtractor(ABC):
     def extract_positive_prompt(self, workflow_data: dict) -> PromptResult:
         pass
 
+    def extract_negative_prompt(self, workflow_data: dict) -> Optional[str]:
+        """부정 프롬프트를 추출합니다. 지원하지 않는 구현체는 None을 반환합니다."""
+        return None
+
+    def extract_parameters(self, workflow_data: dict) -> dict:
+        """샘플러 설정(steps, cfg, seed 등)을 추출합니다."""
+        return {}
+
 
 class ComfyUIPromptExtractor(PromptExtractor):
     """ComfyUI 워크플로우에서 프롬프트를 추출하는 구현체"""
@@ -155,6 +206,56 @@ class ComfyUIPromptExtractor(PromptExtractor):
         except Exception as e:
             return PromptResult(None, False, f"프롬프트 추출 중 오류: {str(e)}")
 
+    def extract_negative_prompt(self, workflow_data: dict) -> Optional[str]:
+        """워크플로우 데이터에서 부정 프롬프트를 추출합니다."""
+        try:
+            if workflow_data.get('format') == 'parameters':
+                negative_prompt = workflow_data.get('negative_prompt')
+                return negative_prompt.strip() if negative_prompt else None
+
+            if 'nodes' not in workflow_data:
+                return None
+
+            nodes = {str(node['id']): node for node in workflow_data['nodes']}
+            prompt = self._find_by_sampler_connection(nodes, workflow_data, 'negative')
+            return prompt.strip() if prompt else None
+
+        except Exception:
+            return None
+
+    def extract_parameters(self, workflow_data: dict) -> dict:
+        """워크플로우 데이터에서 샘플러 설정을 추출합니다."""
+        try:
+            if workflow_data.get('format') == 'parameters':
+                return dict(workflow_data.get('parameters') or {})
+
+            if 'nodes' not in workflow_data:
+                return {}
+
+            nodes = {str(node['id']): node for node in workflow_data['nodes']}
+            sampler_node = self._find_sampler_node(nodes)
+            if not sampler_node:
+                return {}
+
+            return self._parse_sampler_widgets(sampler_node)
+
+        except Exception:
+            return {}
+
+    def _parse_sampler_widgets(self, sampler_node: dict) -> dict:
+        """KSampler 계열 노드의 widgets_values를 이름이 있는 설정으로 변환합니다."""
+        values = sampler_node.get('widgets_values') or []
+        parameters = {'sampler_node': sampler_node['type']}
+
+        # KSampler: [seed, control_after_generate, steps, cfg, sampler_name, scheduler, denoise]
+        if sampler_node['type'] == 'KSampler' and len(values) >= 7:
+            names = ['seed', 'control_after_generate', 'steps', 'cfg', 'sampler_name', 'scheduler', 'denoise']
+            parameters.update(zip(names, values))
+        else:
+            parameters['widgets_values'] = values
+
+        return parameters
+
     def _extract_from_parameters(self, workflow_data: dict) -> PromptResult:
         """parameters 형식에서 프롬프트를 추출합니다."""
         positive_prompt = workflow_data.get('positive_prompt')
@@ -190,24 +291,25 @@ class ComfyUIPromptExtractor(PromptExtractor):
                     return node.get('widgets_values', [''])[0]
         return None
 
-    def _find_by_sampler_connection(self, nodes: dict, workflow_data: dict) -> Optional[str]:
+    def _find_by_sampler_connection(self, nodes: dict, workflow_data: dict,
+                                    input_name: str = 'positive') -> Optional[str]:
         """샘플러 연결을 추적하여 프롬프트를 찾습니다."""
         # 샘플러 노드 찾기
         sampler_node = self._find_sampler_node(nodes)
         if not sampler_node:
             return None
 
-        # positive 입력 링크 찾기
-        positive_input = next(
-            (i for i in sampler_node.get('inputs', []) if i['name'] == 'positive'),
+        # positive/negative 입력 링크 찾기
+        prompt_input = next(
+            (i for i in sampler_node.get('inputs', []) if i['name'] == input_name),
             None
         )
-        if not positive_input or 'link' not in positive_input:
+        if not prompt_input or 'link' not in prompt_input:
             return None
 
         # 링크를 통해 프롬프트 노드 찾기
         origin_node_id = self._find_origin_node_id(
-            positive_input['link'],
+            prompt_input['link'],
             workflow_data.get('links', [])
         )
         if not origin_node_id:
@@ -285,20 +387,29 @@ class FileManager:
         with open(output_path, 'a', encoding='utf-8') as f:
             f.write(f"{prompt}\n")
 
+    IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff'}
+
     def get_image_files(self, folder_path: str) -> List[str]:
         """폴더에서 이미지 파일들을 찾습니다."""
-        folder = Path(folder_path)
-        if not folder.exists():
-            return []
+        return sorted(self.iter_image_files(folder_path))
 
-        image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff'}
-        image_files = []
+    def iter_image_files(self, folder_path: str) -> Iterator[str]:
+        """폴더의 이미지 파일 경로를 목록을 만들지 않고 하나씩 반환합니다."""
+        if not os.path.isdir(folder_path):
+            return
 
-        for file_path in folder.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                image_files.append(str(file_path))
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in self.IMAGE_EXTENSIONS:
+                    yield entry.path
 
-        return sorted(image_files)
+    def compute_file_hash(self, file_path: str, chunk_size: int = 1 << 20) -> str:
+        """파일 내용의 SHA-256 해시를 청크 단위로 계산합니다."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
 
 
 class PromptProcessor:
@@ -350,54 +461,86 @@ class PromptProcessor:
             print(f"❌ 파일 저장 실패: {e}")
             return False
 
-    def process_folder(self, folder_path: str, output_file: str) -> int:
-        """폴더 내 모든 이미지의 프롬프트를 하나의 파일에 저장합니다."""
+    def extract_record(self, image_path: str) -> Tuple[Optional[PromptRecord], Optional[str]]:
+        """이미지 한 장을 구조화된 레코드로 변환합니다. 실패 시 (None, 오류 메시지)를 반환합니다."""
+        # 워크플로우 데이터 읽기
+        workflow_data = self.metadata_reader.read_workflow_data(image_path)
+        if not workflow_data:
+            return None, "워크플로우 데이터를 읽을 수 없습니다"
+
+        # 프롬프트 추출
+        result = self.prompt_extractor.extract_positive_prompt(workflow_data)
+        if not result.success:
+            return None, f"프롬프트 추출 실패: {result.error_message}"
+
+        if not result.positive_prompt:
+            return None, "추출된 프롬프트가 비어있습니다"
+
+        record = PromptRecord(
+            path=str(image_path),
+            hash=self.file_manager.compute_file_hash(image_path),
+            format=workflow_data.get('format', 'comfyui'),
+            positive=result.positive_prompt,
+            negative=self.prompt_extractor.extract_negative_prompt(workflow_data),
+            parameters=self.prompt_extractor.extract_parameters(workflow_data)
+        )
+        return record, None
+
+    def process_folder(self, folder_path: str, output_file: str, output_format: Optional[str] = None) -> int:
+        """폴더 내 모든 이미지의 프롬프트를 하나의 파일에 저장합니다.
+
+        output_format: 'txt'(프롬프트만 라인별), 'jsonl', 'parquet'. 생략 시 출력 파일 확장자로 결정합니다.
+        실행마다 같은 순서로 기록되도록 이미지 경로 목록은 정렬해 메모리에 두지만,
+        추출 결과는 모으지 않고 한 장씩 기록하므로 이미지 수가 늘어도 경로 문자열만큼만 메모리가 늘어납니다.
+        """
         print(f"폴더 처리 중: {folder_path}")
 
-        # 이미지 파일 목록 가져오기
-        image_files = self.file_manager.get_image_files(folder_path)
-        if not image_files:
+        if not os.path.isdir(folder_path):
             print("❌ 폴더에 이미지 파일이 없습니다")
             return 0
 
-        print(f"발견된 이미지 파일: {len(image_files)}개")
-
+        total_count = 0
         success_count = 0
 
-        for image_path in image_files:
-            print(f"\n처리 중: {Path(image_path).name}")
+        try:
+            writer = create_record_writer(output_file, output_format)
+        except (ImportError, ValueError) as e:
+            print(f"❌ 출력 파일을 열 수 없습니다: {e}")
+            return 0
+
+        with writer:
+            # 파일 시스템의 나열 순서와 관계없이 실행할 때마다 같은 순서로 기록되도록 경로만 정렬
+            for image_path in sorted(self.file_manager.iter_image_files(folder_path)):
+                total_count += 1
+                print(f"\n처리 중: {Path(image_path).name}")
 
-            # 워크플로우 데이터 읽기
-            workflow_data = self.metadata_reader.read_workflow_data(image_path)
-            if not workflow_data:
-                print(f"❌ 워크플로우 데이터를 읽을 수 없습니다")
-                continue
+                try:
+                    record, error_message = self.extract_record(image_path)
+                except OSError as e:
+                    print(f"❌ 파일을 읽을 수 없습니다: {e}")
+                    continue
 
-            # 데이터 형식 확인
-            data_format = workflow_data.get('format', 'comfyui')
-            print(f"📋 형식: {data_format}")
+                if not record:
+                    print(f"❌ {error_message}")
+                    continue
 
-            # 프롬프트 추출
-            result = self.prompt_extractor.extract_positive_prompt(workflow_data)
-            if not result.success:
-                print(f"❌ 프롬프트 추출 실패: {result.error_message}")
-                continue
+                print(f"📋 형식: {record.format}")
 
-            if not result.positive_prompt:
-                print("❌ 추출된 프롬프트가 비어있습니다")
-                continue
+                # 파일에 append
+                try:
+                    writer.write(record.to_dict())
+                    print(f"✅ 추가됨: {len(record.positive)} 문자")
+                    success_count += 1
 
-            # 파일에 append
-            try:
-                self.file_manager.append_prompt_to_file(result.positive_prompt, output_file)
-                print(f"✅ 추가됨: {len(result.positive_prompt)} 문자")
-                success_count += 1
+                except Exception as e:
+                    print(f"❌ 파일 저장 실패: {e}")
+                    continue
 
-            except Exception as e:
-                print(f"❌ 파일 저장 실패: {e}")
-                continue
+        if total_count == 0:
+            print("❌ 폴더에 이미지 파일이 없습니다")
+            return 0
 
-        print(f"\n📊 결과: {success_count}/{len(image_files)} 개 성공")
+        print(f"\n📊 결과: {success_count}/{total_count} 개 성공")
         print(f"📁 저장 위치: {output_file}")
 
         return success_count
@@ -0,0 +1,138 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, List
+
+
+# 구조화된 레코드의 컬럼 순서 (JSONL 키 / Parquet 컬럼)
+RECORD_FIELDS = ['path', 'hash', 'format', 'positive', 'negative', 'parameters']
+
+
+class RecordWriter(ABC):
+    """추출 결과를 스트리밍으로 기록하는 인터페이스"""
+
+    @abstractmethod
+    def write(self, record: dict) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TextRecordWriter(RecordWriter):
+    """긍정 프롬프트만 한 줄씩 기록하는 기존 txt 형식 구현체"""
+
+    def __init__(self, output_file: str, flush_every: int = 100, buffer_size: int = 1 << 20):
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._pending = 0
+        self._file = open(output_path, 'a', encoding='utf-8', buffering=buffer_size)
+
+    def write(self, record: dict) -> None:
+        self._file.write(f"{record['positive']}\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class JsonlRecordWriter(RecordWriter):
+    """레코드를 한 줄에 하나의 JSON 객체로 기록하는 구현체"""
+
+    def __init__(self, output_file: str, flush_every: int = 100, buffer_size: int = 1 << 20):
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._pending = 0
+        # append 모드: 여러 번 실행해도 기존 결과 뒤에 이어서 기록합니다
+        self._file = open(output_path, 'a', encoding='utf-8', buffering=buffer_size)
+
+    def write(self, record: dict) -> None:
+        row = {key: record.get(key) for key in RECORD_FIELDS}
+        # ensure_ascii=False + 개행 이스케이프로 여러 줄 프롬프트도 한 줄에 기록됩니다
+        self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class ParquetRecordWriter(RecordWriter):
+    """레코드를 row group 단위로 Parquet 파일에 기록하는 구현체 (pyarrow 필요, 기존 파일은 덮어씀)"""
+
+    def __init__(self, output_file: str, row_group_size: int = 1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow")
+
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._pa = pa
+        self.row_group_size = row_group_size
+        self._buffer: List[dict] = []
+        # parameters는 형식마다 키가 달라 JSON 문자열로 저장합니다
+        self._schema = pa.schema([(key, pa.string()) for key in RECORD_FIELDS])
+        self._writer = pq.ParquetWriter(str(output_path), self._schema)
+
+    def write(self, record: dict) -> None:
+        row = {key: record.get(key) for key in RECORD_FIELDS}
+        row['parameters'] = json.dumps(row['parameters'] or {}, ensure_ascii=False)
+        self._buffer.append(row)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush_buffer()
+        self._writer.close()
+        self._writer = None
+
+
+OUTPUT_FORMATS = {
+    'txt': TextRecordWriter,
+    'jsonl': JsonlRecordWriter,
+    'parquet': ParquetRecordWriter,
+}
+
+
+def detect_output_format(output_file: str, output_format: Optional[str] = None) -> str:
+    """명시된 형식 또는 출력 파일 확장자로 출력 형식을 결정합니다."""
+    if output_format:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format}")
+        return output_format
+
+    suffix = Path(output_file).suffix.lower().lstrip('.')
+    return suffix if suffix in OUTPUT_FORMATS else 'txt'
+
+
+def create_record_writer(output_file: str, output_format: Optional[str] = None, **options) -> RecordWriter:
+    """출력 형식에 맞는 RecordWriter를 생성합니다. options는 writer 생성자에 그대로 전달됩니다."""
+    return OUTPUT_FORMATS[detect_output_format(output_file, output_format)](output_file, **options)
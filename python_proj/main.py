@@ -1,55 +1,228 @@
 import functions_framework
 import firebase_admin
 from firebase_admin import credentials, db
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import Counter
+import secrets
+import time
 
 CREDENTIALS_PATH = "fresh-mint.json"  # Firebase 인증 파일 경로
 DATABASE_URL = "https://fresh-mint.firebaseio.com/"  # Firebase 실시간 DB URL
 SERVERS_PATH = "servers"  # 서버 정보가 저장되는 RTDB 루트 경로
+ACCESS_LOG_KEY = "access_log"  # 접근 기록: push 키 → 접근 시각 (추가만 하고 수정하지 않음)
+LEGACY_ACCESS_KEY = "access_date"  # 예전 리스트 형식의 접근 기록 (더 이상 쓰지 않음, 압축 작업이 정리)
+ROLLUPS_KEY = "rollups"  # 시간/일 단위 접근 횟수 집계: rollups/hourly/{시간}, rollups/daily/{날짜}, rollups/total
 
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+HOUR_FORMAT = "%Y-%m-%dT%H"
+DAY_FORMAT = "%Y-%m-%d"
 
-def initialize_firebase(credentials_file: str = CREDENTIALS_PATH, database_url: str = DATABASE_URL) -> None:
-    if not firebase_admin._apps:
-        cred = credentials.Certificate(credentials_file)
-        firebase_admin.initialize_app(cred, {
-            'databaseURL': database_url
-        })
-    print("Firebase initialized")
+RAW_RETENTION_DAYS = 7  # access_log 원본을 보관하는 기간 (이후에는 집계만 남음)
+HOURLY_RETENTION_DAYS = 30  # 시간 단위 집계를 보관하는 기간 (일 단위 집계는 계속 보관)
+COMPACTION_BATCH_SIZE = 1000  # 압축 시 한 번에 읽고 지우는 키 수
+MAX_BATCH_EVENTS = 500  # 한 요청에 담을 수 있는 접근 이벤트 수
 
-def append_access_date(ref, data: dict, current_time: str) -> dict:
-    if "access_date" in data:
-        data["access_date"].append(current_time)
-    else:
-        data["access_date"] = [current_time]
-    return data
+# RTDB 키에 사용할 수 없는 문자 (server_name이 다른 경로에 쓰이지 않도록 검사)
+INVALID_KEY_CHARS = set(".#$[]/")
+
+# Firebase push 키에 사용하는 문자 (사전순 = 시간순이 되도록 정렬된 base64 변형)
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+
+
+# warm 인스턴스에서 재사용하는 Firebase 앱 (요청마다 초기화하지 않음)
+_firebase_app = None
+
+
+def initialize_firebase(credentials_file: str = CREDENTIALS_PATH, database_url: str = DATABASE_URL):
+    global _firebase_app
+    if _firebase_app is None:
+        if firebase_admin._apps:
+            _firebase_app = firebase_admin.get_app()
+        else:
+            cred = credentials.Certificate(credentials_file)
+            _firebase_app = firebase_admin.initialize_app(cred, {
+                'databaseURL': database_url
+            })
+            print("Firebase initialized")
+    return _firebase_app
+
+def push_id_prefix(now_ms: int) -> str:
+    """push 키의 앞 8자리(시각 부분). 이 값보다 작은 키는 해당 시각 이전에 만들어진 키입니다."""
+    time_chars = []
+    for _ in range(8):
+        time_chars.append(PUSH_CHARS[now_ms % 64])
+        now_ms //= 64
+    return "".join(reversed(time_chars))
+
+def generate_push_id(now_ms: int = None) -> str:
+    """
+    Firebase push()와 같은 형식의 키를 로컬에서 생성합니다. (앞 8자리 시각 + 뒤 12자리 난수)
+    ref.push()는 키를 받기 위해 요청을 한 번 더 보내므로, 키를 직접 만들어 한 번의 update로 기록합니다.
+    """
+    now = int(time.time() * 1000) if now_ms is None else now_ms
+    random_chars = "".join(secrets.choice(PUSH_CHARS) for _ in range(12))
+    return push_id_prefix(now) + random_chars
+
+def increment(amount: int) -> dict:
+    """RTDB 서버 측 원자적 증가 (읽지 않고 동시 요청에서도 정확하게 합산)"""
+    return {".sv": {"increment": amount}}
+
+def is_valid_server_name(server_name) -> bool:
+    return isinstance(server_name, str) and bool(server_name) and not (set(server_name) & INVALID_KEY_CHARS)
 
-def create_new_server_data(server_name: str, current_time: str) -> dict:
-    return {
-        "access_date": [current_time],
-        "description": f"This is {server_name}",
-        "name": server_name
-    }
+def build_access_update(accesses: list, received_at: datetime = None) -> dict:
+    """
+    접근 이벤트 목록 [(server_name, 접근 시각)]을 servers 경로 기준의 multi-path update 하나로 만듭니다.
+    기존 기록을 읽지 않고 이벤트마다 새 push 키만 추가하므로 기록 수와 관계없이 크기가 일정하고,
+    동시에 들어온 요청도 서로 다른 키에 기록되어 유실되지 않습니다.
+    시간/일 단위 집계는 같은 요청에서 서버 측 increment로 갱신하며, 같은 버킷의 이벤트는 합산해 한 번에 증가시킵니다.
+    last_access는 클라이언트가 보낸 접근 시각이 아닌 서버가 요청을 받은 시각(received_at)으로 기록합니다.
+    늦게 도착하거나 다시 전송된 배치가 last_access를 과거로 되돌리지 않게 하기 위해서입니다.
+    """
+    received_at = received_at or datetime.now()
+    update = {}
+    hourly, daily, total = Counter(), Counter(), Counter()
+
+    for server_name, accessed in accesses:
+        update[f"{server_name}/{ACCESS_LOG_KEY}/{generate_push_id(int(accessed.timestamp() * 1000))}"] = \
+            accessed.strftime(TIME_FORMAT)
+        hourly[(server_name, accessed.strftime(HOUR_FORMAT))] += 1
+        daily[(server_name, accessed.strftime(DAY_FORMAT))] += 1
+        total[server_name] += 1
+
+    for (server_name, hour), count in hourly.items():
+        update[f"{server_name}/{ROLLUPS_KEY}/hourly/{hour}"] = increment(count)
+    for (server_name, day), count in daily.items():
+        update[f"{server_name}/{ROLLUPS_KEY}/daily/{day}"] = increment(count)
+    for server_name, count in total.items():
+        update[f"{server_name}/{ROLLUPS_KEY}/total"] = increment(count)
+        update[f"{server_name}/last_access"] = received_at.strftime(TIME_FORMAT)
+        update[f"{server_name}/description"] = f"This is {server_name}"
+        update[f"{server_name}/name"] = server_name
+
+    return update
+
+def update_servers_access(accesses: list) -> str:
+    """여러 서버의 접근 이벤트를 한 번의 요청으로 기록합니다. (서버 노드가 없으면 update가 새로 만듦)"""
+    server_names = sorted({server_name for server_name, _ in accesses})
+    try:
+        db.reference(SERVERS_PATH).update(build_access_update(accesses))
+        return f"[SUCCESS] {len(accesses)} access events recorded for {', '.join(server_names)}"
+    except Exception as e:
+        error_msg = f"[ERROR] Failed to update servers {', '.join(server_names)}: {e}"
+        print(error_msg)
+        return error_msg
 
 def update_server_access(server_name: str) -> str:
+    now = datetime.now()
+    result = update_servers_access([(server_name, now)])
+    if result.startswith("[SUCCESS]"):
+        return f"[SUCCESS] '{server_name}' updated with access_date {now.strftime(TIME_FORMAT)}"
+    return result
+
+def parse_access_events(request_json: dict, request_args) -> list:
+    """
+    요청에서 접근 이벤트 목록을 만듭니다.
+    - server_name: 서버 하나 (기존 형식, JSON 또는 쿼리 파라미터)
+    - server_names: 서버 이름 목록
+    - events: [{"server_name": ..., "accessed_at": "YYYY-MM-DD HH:MM:SS"(생략 시 현재 시각)}]
+    형식이 잘못된 이벤트가 있으면 ValueError를 발생시킵니다. (기록이 조용히 빠지지 않도록)
+    """
+    now = datetime.now()
+    events = []
+
+    if request_json.get('server_name'):
+        events.append((request_json['server_name'], now))
+    elif request_args.get('server_name'):
+        events.append((request_args['server_name'], now))
+
+    for server_name in request_json.get('server_names') or []:
+        events.append((server_name, now))
+
+    for index, event in enumerate(request_json.get('events') or []):
+        if not isinstance(event, dict):
+            raise ValueError(f"Invalid event at index {index}: {event!r}")
+        accessed = now
+        if event.get('accessed_at'):
+            try:
+                accessed = datetime.strptime(event['accessed_at'], TIME_FORMAT)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid accessed_at in event at index {index}: {event!r}") from None
+        events.append((event.get('server_name'), accessed))
+
+    return events
+
+def delete_keys_before(ref, child: str, end_key: str) -> int:
+    """
+    ref/child 아래에서 end_key보다 작은 키를 COMPACTION_BATCH_SIZE개씩 지웁니다.
+    반환값: 지운 키 수
+    """
+    deleted = 0
+    while True:
+        old = ref.child(child).order_by_key().end_at(end_key).limit_to_first(COMPACTION_BATCH_SIZE).get()
+        # end_at은 end_key와 같은 키도 포함하므로 제외
+        keys = [key for key in (old or {}) if key < end_key]
+        if not keys:
+            return deleted
+        ref.update({f"{child}/{key}": None for key in keys})
+        deleted += len(keys)
+        if len(keys) < COMPACTION_BATCH_SIZE:
+            return deleted
+
+def fold_legacy_access_dates(ref, cutoff: datetime) -> int:
+    """
+    예전 access_date 리스트를 집계에 합치고 지웁니다. (이 기록들은 작성 시 집계되지 않았음)
+    보관 기간 안의 기록은 시각에 맞는 push 키로 access_log에 옮겨 원본을 유지합니다.
+    반환값: 합친 기록 수
+    """
+    legacy = ref.child(LEGACY_ACCESS_KEY).get()
+    if not legacy:
+        return 0
+
+    entries = legacy.values() if isinstance(legacy, dict) else legacy
+    hourly, daily = Counter(), Counter()
+    update = {LEGACY_ACCESS_KEY: None}
+    for entry in entries:
+        try:
+            accessed = datetime.strptime(entry, TIME_FORMAT)
+        except (TypeError, ValueError):
+            continue
+        hourly[accessed.strftime(HOUR_FORMAT)] += 1
+        daily[accessed.strftime(DAY_FORMAT)] += 1
+        if accessed >= cutoff:
+            update[f"{ACCESS_LOG_KEY}/{generate_push_id(int(accessed.timestamp() * 1000))}"] = entry
+
+    for hour, count in hourly.items():
+        update[f"{ROLLUPS_KEY}/hourly/{hour}"] = increment(count)
+    for day, count in daily.items():
+        update[f"{ROLLUPS_KEY}/daily/{day}"] = increment(count)
+    update[f"{ROLLUPS_KEY}/total"] = increment(sum(daily.values()))
+
+    # 집계 반영과 리스트 삭제를 한 번의 multi-path update로 처리 (중간에 실패해도 두 번 세지 않음)
+    ref.update(update)
+    return sum(daily.values())
+
+def compact_server_access(server_name: str, retention_days: int = RAW_RETENTION_DAYS) -> str:
+    """
+    서버 한 곳의 접근 기록을 압축합니다.
+    - 예전 access_date 리스트를 집계에 합치고 삭제
+    - 보관 기간이 지난 access_log 원본 삭제 (작성 시 이미 집계됨)
+    - HOURLY_RETENTION_DAYS가 지난 시간 단위 집계 삭제 (일 단위 집계는 유지)
+    """
     try:
         ref = db.reference(f"{SERVERS_PATH}/{server_name}")
-        print(f"Reference obtained for server: {server_name}")
+        now = datetime.now()
+        cutoff = now - timedelta(days=retention_days)
 
-        existing_data = ref.get()
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        folded = fold_legacy_access_dates(ref, cutoff)
+        raw_deleted = delete_keys_before(ref, ACCESS_LOG_KEY, push_id_prefix(int(cutoff.timestamp() * 1000)))
+        hourly_cutoff = (now - timedelta(days=HOURLY_RETENTION_DAYS)).strftime(HOUR_FORMAT)
+        hourly_deleted = delete_keys_before(ref, f"{ROLLUPS_KEY}/hourly", hourly_cutoff)
 
-        if existing_data and isinstance(existing_data, dict):
-            print(f"Existing server data: {existing_data}")
-            updated_data = append_access_date(ref, existing_data, current_time)
-            ref.update(updated_data)
-            return f"[SUCCESS] '{server_name}' updated with access_date {current_time}"
-        else:
-            print(f"No data for server: {server_name}. Creating new data.")
-            new_data = create_new_server_data(server_name, current_time)
-            ref.set(new_data)
-            return f"[SUCCESS] New data created for '{server_name}' with initial access_date {current_time}"
+        return (f"[SUCCESS] '{server_name}' compacted: {folded} legacy entries folded, "
+                f"{raw_deleted} raw entries and {hourly_deleted} hourly buckets removed")
     except Exception as e:
-        error_msg = f"[ERROR] Failed to update server '{server_name}': {e}"
+        error_msg = f"[ERROR] Failed to compact server '{server_name}': {e}"
         print(error_msg)
         return error_msg
 
@@ -62,18 +235,66 @@ def update_server_access_http(request):
     initialize_firebase()
 
     request_json = request.get_json(silent=True)
-    request_args = request.args
+    if not isinstance(request_json, dict):
+        request_json = {}
 
-    if (not request_json or 'server_name' not in request_json) and \
-       (not request_args or 'server_name' not in request_args):
-        return "[ERROR] Missing 'server_name' parameter", 400
+    try:
+        events = parse_access_events(request_json, request.args)
+    except ValueError as e:
+        return f"[ERROR] {e}", 400
+    if not events:
+        return "[ERROR] Missing 'server_name', 'server_names' or 'events' parameter", 400
+    if len(events) > MAX_BATCH_EVENTS:
+        return f"[ERROR] Too many events in one request (max {MAX_BATCH_EVENTS})", 400
+
+    invalid = [server_name for server_name, _ in events if not is_valid_server_name(server_name)]
+    if invalid:
+        return f"[ERROR] Invalid server_name: {invalid[0]!r}", 400
+
+    # 서버 수와 관계없이 multi-path update 한 번으로 기록 (읽기 없음)
+    return update_servers_access(events)
+
+@functions_framework.http
+def compact_access_history_http(request):
+    """
+    접근 기록 압축 작업 (Cloud Scheduler에서 하루 한 번 호출)
+    server_name을 지정하지 않으면 모든 서버를 압축합니다.
+    """
+    initialize_firebase()
+
+    request_json = request.get_json(silent=True)
+    if request_json is None:
+        request_json = {}
+    if not isinstance(request_json, dict):
+        return "[ERROR] Request body must be a JSON object", 400
+
+    server_name = request_json.get('server_name') or request.args.get('server_name')
+    if server_name and not is_valid_server_name(server_name):
+        return f"[ERROR] Invalid server_name: {server_name!r}", 400
+
+    # 0이나 false도 기본값으로 바뀌지 않고 검사되도록 None인지만 확인
+    retention_days = request_json.get('retention_days')
+    if retention_days is None:
+        retention_days = request.args.get('retention_days')
+    if retention_days is None:
+        retention_days = RAW_RETENTION_DAYS
+    # bool은 int의 하위 타입이라 true가 1일로 받아들여지지 않도록 따로 거부
+    if isinstance(retention_days, bool) or (isinstance(retention_days, float) and not retention_days.is_integer()):
+        return f"[ERROR] Invalid retention_days: {retention_days!r}", 400
+    try:
+        retention_days = int(retention_days)
+    except (TypeError, ValueError):
+        return f"[ERROR] Invalid retention_days: {retention_days!r}", 400
+    if retention_days < 1:
+        return "[ERROR] retention_days must be at least 1", 400
 
-    if request_json and 'server_name' in request_json:
-        server_name = request_json['server_name']
+    if server_name:
+        server_names = [server_name]
     else:
-        server_name = request_args['server_name']
+        # shallow 조회: 서버 이름만 받고 하위 기록은 내려받지 않음
+        server_names = list((db.reference(SERVERS_PATH).get(shallow=True) or {}).keys())
 
-    result_message = update_server_access(server_name)
-    return result_message
+    results = [compact_server_access(name, retention_days) for name in server_names]
+    return "\n".join(results) if results else "[SUCCESS] No servers to compact"
 
 #test_update_server_access("server1")  # 기존 서버 업데이트
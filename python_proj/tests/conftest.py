@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+class FakeRequest:
+    """Cloud Functions(flask) 요청 대역"""
+
+    def __init__(self, json=None, args=None):
+        self._json = json
+        self.args = args or {}
+
+    def get_json(self, silent=False):
+        return self._json
+
+
+class FakeDatabase:
+    """
+    Firebase RTDB를 흉내 내는 메모리 저장소.
+    multi-path update, 서버 측 increment, None 삭제, order_by_key 범위 조회, shallow 조회를 지원하고
+    읽기/쓰기 횟수를 기록합니다.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.reads = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def reference(self, path=''):
+        return FakeReference(self, [part for part in path.split('/') if part])
+
+    def get_path(self, parts):
+        node = self.root
+        for part in parts:
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def set_path(self, parts, value):
+        node = self.root
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        if value is None:
+            node.pop(parts[-1], None)
+            return
+        if isinstance(value, dict) and '.sv' in value:
+            value = (node.get(parts[-1]) or 0) + value['.sv']['increment']
+        node[parts[-1]] = value
+
+
+class FakeQuery:
+    def __init__(self, ref):
+        self.ref = ref
+        self.end = None
+        self.limit = None
+
+    def order_by_key(self):
+        return self
+
+    def end_at(self, key):
+        self.end = key
+        return self
+
+    def limit_to_first(self, limit):
+        self.limit = limit
+        return self
+
+    def get(self):
+        data = self.ref.get() or {}
+        keys = sorted(key for key in data if self.end is None or key <= self.end)[:self.limit]
+        return {key: data[key] for key in keys}
+
+
+class FakeReference:
+    def __init__(self, database, parts):
+        self.database = database
+        self.parts = parts
+
+    def child(self, path):
+        return FakeReference(self.database, self.parts + [part for part in path.split('/') if part])
+
+    def get(self, shallow=False):
+        with self.database._lock:
+            self.database.reads += 1
+            value = self.database.get_path(self.parts)
+            if shallow and isinstance(value, dict):
+                return {key: True for key in value}
+            return value
+
+    def update(self, values):
+        with self.database._lock:
+            self.database.writes += 1
+            for path, value in values.items():
+                self.database.set_path(self.parts + [part for part in path.split('/') if part], value)
+
+    def order_by_key(self):
+        return FakeQuery(self).order_by_key()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(main.db, 'reference', database.reference)
+    return database
+
+
+@pytest.fixture
+def no_firebase_init(monkeypatch):
+    monkeypatch.setattr(main, 'initialize_firebase', lambda *args, **kwargs: None)
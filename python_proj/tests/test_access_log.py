@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from conftest import FakeRequest
+
+
+def test_build_access_update_appends_without_touching_existing_entries():
+    accessed = datetime(2026, 1, 2, 3, 4, 5)
+
+    update = main.build_access_update([('server1', accessed), ('server1', accessed)])
+
+    log_keys = [path for path in update if path.startswith('server1/access_log/')]
+    assert len(log_keys) == 2
+    assert all(update[path] == '2026-01-02 03:04:05' for path in log_keys)
+    assert update['server1/rollups/hourly/2026-01-02T03'] == main.increment(2)
+    assert update['server1/rollups/daily/2026-01-02'] == main.increment(2)
+    assert update['server1/rollups/total'] == main.increment(2)
+
+
+def test_push_ids_sort_by_time():
+    earlier = main.generate_push_id(1_700_000_000_000)
+    later = main.generate_push_id(1_700_000_000_001)
+
+    assert len(earlier) == 20
+    assert earlier < later
+    assert earlier[:8] == main.push_id_prefix(1_700_000_000_000)
+
+
+def test_concurrent_updates_do_not_lose_entries_or_read(fake_db):
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(main.update_server_access, ['server1'] * 200))
+
+    assert all(result.startswith('[SUCCESS]') for result in results)
+    server = fake_db.root['servers']['server1']
+    assert len(server['access_log']) == 200
+    assert server['rollups']['total'] == 200
+    assert server['name'] == 'server1'
+    # 쓰기 경로에서는 기존 기록을 읽지 않음
+    assert fake_db.reads == 0
+    assert fake_db.writes == 200
+
+
+def test_delayed_batch_does_not_move_last_access_backwards(fake_db):
+    main.update_server_access('server1')
+    latest = fake_db.root['servers']['server1']['last_access']
+
+    replayed = datetime.now() - timedelta(days=3)
+    events = main.parse_access_events(
+        {'events': [{'server_name': 'server1', 'accessed_at': replayed.strftime(main.TIME_FORMAT)}]}, {}
+    )
+    main.update_servers_access(events)
+
+    server = fake_db.root['servers']['server1']
+    assert server['last_access'] >= latest
+    # 접근 기록과 집계는 클라이언트가 보낸 접근 시각 기준
+    assert replayed.strftime(main.TIME_FORMAT) in server['access_log'].values()
+    assert server['rollups']['daily'][replayed.strftime(main.DAY_FORMAT)] == 1
+
+
+@pytest.mark.parametrize('event', [
+    {'server_name': 'server1', 'accessed_at': '2026/01/02 03:04'},
+    {'server_name': 'server1', 'accessed_at': 1767322800},
+    'server1',
+])
+def test_malformed_event_is_rejected_instead_of_dropped(fake_db, no_firebase_init, event):
+    body, status = main.update_server_access_http(FakeRequest(json={'events': [
+        {'server_name': 'server2', 'accessed_at': '2026-01-02 03:04:05'},
+        event,
+    ]}))
+
+    assert status == 400
+    assert 'index 1' in body
+    assert fake_db.writes == 0
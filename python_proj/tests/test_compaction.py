@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from conftest import FakeRequest
+
+
+def test_compaction_folds_legacy_list_and_drops_old_raw_entries(fake_db):
+    now = datetime.now()
+    old = now - timedelta(days=main.RAW_RETENTION_DAYS + 1)
+    fake_db.root['servers'] = {'server1': {
+        'access_date': [old.strftime(main.TIME_FORMAT), now.strftime(main.TIME_FORMAT)],
+    }}
+    fake_db.reference(main.SERVERS_PATH).update(main.build_access_update([('server1', old), ('server1', now)]))
+
+    result = main.compact_server_access('server1')
+
+    assert result.startswith('[SUCCESS]')
+    server = fake_db.root['servers']['server1']
+    assert 'access_date' not in server
+    # 보관 기간 안의 기록만 원본으로 남고, 집계에는 모든 기록이 반영됨
+    assert sorted(server['access_log'].values()) == [now.strftime(main.TIME_FORMAT)] * 2
+    assert server['rollups']['total'] == 4
+    assert server['rollups']['daily'][old.strftime(main.DAY_FORMAT)] == 2
+
+
+@pytest.mark.parametrize('request_kwargs', [
+    {'args': {'retention_days': 'abc'}},
+    {'json': {'retention_days': 'abc'}},
+    {'args': {'retention_days': '0'}},
+    {'json': {'retention_days': 0}},
+    {'json': {'retention_days': False}},
+    {'json': {'retention_days': True}},
+    {'json': {'retention_days': 1.5}},
+    {'json': []},
+    {'json': 'x'},
+    {'json': {'server_name': 'bad/name'}},
+])
+def test_compaction_rejects_invalid_input(fake_db, no_firebase_init, request_kwargs):
+    body, status = main.compact_access_history_http(FakeRequest(**request_kwargs))
+
+    assert status == 400
+    assert body.startswith('[ERROR]')
+    assert fake_db.writes == 0
+
+
+def test_compaction_without_server_name_compacts_all_servers(fake_db, no_firebase_init):
+    fake_db.reference(main.SERVERS_PATH).update(
+        main.build_access_update([('server1', datetime.now()), ('server2', datetime.now())])
+    )
+
+    result = main.compact_access_history_http(FakeRequest(args={'retention_days': '3'}))
+
+    assert result.count('[SUCCESS]') == 2
@@ -1,22 +1,88 @@
 import os
 
-# 환경 설정
+# 환경 설정 (개발 환경: ENV=dev)
 IS_DEV = os.getenv('ENV', 'production').lower() == 'dev'
-IS_DEV = True  # 개발 환경으로 설정
-TARGET_FILE = 'target_dev.json' if IS_DEV else 'target.json'
+TARGET_FILE = os.getenv('SCRAPER_TARGETS', 'target_dev.json' if IS_DEV else 'target.json')
 
 # 브라우저 설정
 BROWSER_CONFIG = {
     'user_data_dir': os.path.expanduser("/Users/izowooi/Downloads/temp/chrome-selenium-data"),
     'port': 9222,
-    'page_load_wait': 3
+    'page_load_wait': 3,
+    # 워커 브라우저에서 이미지/웹폰트/미디어 자동 재생을 차단 (DOM과 src/srcset 속성은 그대로 남음)
+    'block_resources': os.getenv('SCRAPER_BLOCK_RESOURCES', '1') != '0'
+}
+
+# 네트워크 요청 차단/수집 설정 (CDP Network.setBlockedURLs)
+NETWORK_CONFIG = {
+    'enabled': os.getenv('SCRAPER_NETWORK_BLOCK', '1') != '0',
+    'block_images': True,  # 이미지 URL은 srcset 속성/요청 이벤트에서 읽으므로 실제 파일은 필요 없음
+    'block_media': True,  # 트레일러 미리 받기(preload) 차단, URL은 요청 이벤트로 수집
+    'block_fonts': True,
+    'blocked_domains': [  # 분석/광고 등 서드파티 도메인
+        'google-analytics.com',
+        'googletagmanager.com',
+        'doubleclick.net',
+        'facebook.net',
+        'hotjar.com',
+        'segment.io',
+        'sentry.io'
+    ],
+    'capture': True  # performance 로그에서 .mp4/_3840x2160.webp 요청 URL 수집
+}
+
+# 병렬 처리 설정 (do_all_parallel)
+WORKER_CONFIG = {
+    'workers': int(os.getenv('SCRAPER_WORKERS', 4)),  # 동시에 띄울 브라우저 인스턴스 수
+    'per_domain_limit': 2,  # 같은 도메인에 동시에 접속하는 최대 워커 수
+    'headless': os.getenv('SCRAPER_HEADLESS', '1') != '0',  # 워커 브라우저를 헤드리스로 실행
+    'window_size': '1920,1080',
+    'restart_after_pages': int(os.getenv('SCRAPER_RESTART_AFTER_PAGES', 200)),  # 이 페이지 수마다 브라우저 재시작 (0: 끔)
+    'max_rss_mb': int(os.getenv('SCRAPER_MAX_RSS_MB', 1500)),  # 브라우저 프로세스 전체 RSS 상한, 넘으면 재시작 (psutil 필요, 0: 끔)
+    'max_url_reassign': 2,  # 브라우저 장애로 같은 URL을 다시 큐에 넣는 최대 횟수
+    'max_restart_failures': 3  # 브라우저 시작이 연속으로 이만큼 실패하면 워커 종료
 }
 
 # 다운로드 설정
 DOWNLOAD_CONFIG = {
     'trailer_dir': os.path.expanduser('~/Downloads/trailer_mp4'),  # 트레일러 MP4 저장 경로
     'title_image_dir': os.path.expanduser('~/Downloads/trailer_title'),  # 타이틀 이미지 저장 경로
-    'default_dir': os.path.expanduser('~/Downloads')  # 기본 다운로드 경로
+    'default_dir': os.path.expanduser('~/Downloads'),  # 기본 다운로드 경로
+    'max_concurrent': 4,  # 동시 다운로드 수
+    'max_queued': 16,  # 대기열 최대 길이 (가득 차면 브라우저 진행이 잠시 멈춤)
+    'connect_timeout': 10,
+    'read_timeout': 60,
+    'retries': 3,
+    'chunk_size_min': 64 * 1024,  # 처리량에 따라 chunk_size_max까지 두 배씩 증가
+    'chunk_size_max': 4 * 1024 * 1024,
+    'parallel_threshold': 64 * 1024 * 1024,  # 이 크기 이상이고 Range를 지원하면 구간 병렬 다운로드
+    'parallel_segments': 4,  # 구간 병렬 다운로드 연결 수
+    'verify_existing': False  # True면 기존 파일 크기를 HEAD로 확인해 불완전한 파일을 이어받음
+}
+
+# 브라우저 없는 미디어 URL 탐색 설정 (__NEXT_DATA__)
+RESOLVER_CONFIG = {
+    'enabled': os.getenv('SCRAPER_HTTP_RESOLVER', '1') != '0',  # 실패 시에만 Selenium으로 처리
+    'workers': 16,  # do_all_parallel에서 HTML을 동시에 가져오는 스레드 수
+    'timeout': (5, 15),  # (연결, 읽기) 타임아웃
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'
+}
+
+# 크롤 상태 저장소 설정
+CRAWL_STATE_CONFIG = {
+    'db_path': os.getenv('SCRAPER_STATE_DB', 'crawl_state.db'),  # URL별 처리 상태를 저장하는 SQLite 파일
+    'max_retries': 3  # 실패한 URL을 다시 시도하는 최대 횟수
+}
+
+# 목록 페이지 자동 수집 설정 (crawl_hrefs)
+CRAWL_CONFIG = {
+    'page_param': 'page',  # 페이지 번호 쿼리 파라미터
+    'concurrency': 4,  # 동시에 가져오는 목록 페이지 수
+    'requests_per_second': 2,  # 목록 페이지 요청 속도 제한
+    'max_pages': 500,  # 안전 장치: 한 번에 넘기는 최대 페이지 수
+    'page_retries': 3,  # 목록 페이지 요청이 실패(5xx/시간 초과)하면 다시 시도하는 횟수
+    'retry_backoff': 2.0,  # 재시도 대기 시간(초), 시도할 때마다 두 배로 증가
+    'stop_when_known': True  # True면 이미 저장소에 있는 링크만 있는 페이지에서도 멈춤 (증분 수집)
 }
 
 # 셀렉터 설정
@@ -29,14 +95,37 @@ SELECTORS = {
         "main .VideoHero__Container img",
         "main picture img"
     ],
+    # 목록 페이지의 썸네일 링크 (앞쪽 선택자로 찾지 못하면 다음 선택자 사용)
+    'video_links': [
+        "#__next > main > div > div.videos__SidebarAndVideoList-sc-1u2b7uh-1.kvnDtB > div.videos__StyledVideoListContainer-sc-1u2b7uh-3.lgqsma > div > div > div > div.VideoThumbnailPreview__Container-sc-1l0c3o7-7.lhLsZD > a",
+        "[class*='VideoThumbnailPreview__Container'] > a[href]"
+    ],
     'trailer_source': "#__next > main > div > div.BoundingArea__StyledBoundingArea-u294wc-0.dgQZkG > div > div.Hero-a7asd6-0.dUZdxD > div.VideoPlayerWrapper-sc-19xo1j4-0.keBsYD > div > div > div > div.plyr__video-wrapper.plyr__video-wrapper--fixed-ratio > video > source:nth-child(5)"
 }
 
-# 대기 시간 설정
+# 선택자 통계 설정 (성공률 기록 및 순서 조정)
+SELECTOR_STATS_CONFIG = {
+    'stats_file': os.getenv('SCRAPER_SELECTOR_STATS', 'selector_stats.json'),
+    'autosave_every': 20,  # 대기 결과 N건마다 파일에 저장
+    'min_attempts': 10,  # 이 횟수 이상 시도한 선택자만 오래됨 판정
+    'stale_hit_rate': 0.05,  # 성공률이 이보다 낮으면 오래된 선택자로 보고
+    'stale_after_days': 7,  # 이 기간 동안 한 번도 성공하지 못하면 오래된 선택자로 보고
+    'recent_weight': 0.1  # 최근 성공률(지수 이동 평균)에서 마지막 결과가 차지하는 비중
+}
+
+# 대기 시간 설정 (초)
+# 고정 sleep이 아니라 조건이 충족되면 즉시 진행하며, 아래 값은 최대 대기 시간입니다
 WAIT_TIMES = {
-    'page_load': 3,
-    'element_wait': 1,
-    'after_click': 3
+    'page_load': 15,  # document.readyState == 'complete' 대기
+    'element_wait': 5,  # 후보 선택자 중 하나가 나타날 때까지 대기
+    'after_click': 10,  # 클릭 후 페이지 전환/모달 닫힘 대기
+    'poll_frequency': 0.1  # 조건 확인 간격
+}
+
+# 단계별 소요 시간 기록 설정
+METRICS_CONFIG = {
+    'enabled': os.getenv('SCRAPER_EVENTS', '1') != '0',
+    'events_file': os.getenv('SCRAPER_EVENTS_FILE', 'scrape_events.jsonl')  # 단계/다운로드 이벤트 JSONL
 }
 
 # 로깅 설정
@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import CRAWL_STATE_CONFIG
+from logger import logger
+
+
+class CrawlState:
+    """
+    수집한 URL과 처리 상태를 저장하는 SQLite 크롤 프론티어.
+    hrefs_<domain>.json을 매번 통째로 다시 쓰는 대신 URL 단위로 추가/갱신하고,
+    이미 처리된 URL은 페이지를 열기 전에 건너뛸 수 있게 합니다.
+
+    상태(status): discovered(수집됨) → visited(방문함) → done(완료) / failed(실패, retry_count 증가)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS urls (
+            url TEXT PRIMARY KEY,
+            domain TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'discovered',
+            trailer_url TEXT,
+            trailer_done INTEGER NOT NULL DEFAULT 0,
+            image_url TEXT,
+            image_done INTEGER NOT NULL DEFAULT 0,
+            retry_count INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            discovered_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_urls_domain_status ON urls (domain, status);
+        CREATE INDEX IF NOT EXISTS idx_urls_status ON urls (status);
+        CREATE TABLE IF NOT EXISTS imported_files (
+            filename TEXT PRIMARY KEY,
+            imported_at TEXT NOT NULL
+        );
+    """
+
+    # 한 번의 방문에서 다운로드 실패와 페이지 실패가 함께 기록되어도 재시도 횟수는 한 번만 증가
+    _FAIL_SQL = (
+        "UPDATE urls SET status = 'failed', retry_count = retry_count + 1, last_error = ?, updated_at = ? "
+        "WHERE url = ? AND status != 'failed'"
+    )
+
+    def __init__(self, db_path=None, max_retries=None):
+        self.db_path = db_path or CRAWL_STATE_CONFIG['db_path']
+        self.max_retries = max_retries if max_retries is not None else CRAWL_STATE_CONFIG['max_retries']
+        # 병렬 워커와 다운로드 스레드가 함께 사용하므로 하나의 연결을 잠금으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def _now(self):
+        return time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _domain(self, url):
+        return urlparse(url).netloc
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def add_discovered(self, urls):
+        """
+        새로 수집한 URL을 추가합니다. 이미 있는 URL은 상태를 유지합니다.
+        반환값: 새로 추가된 URL 수
+        """
+        now = self._now()
+        rows = [(url, self._domain(url), now, now) for url in dict.fromkeys(urls)]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, domain, discovered_at, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def import_legacy_hrefs(self, filename):
+        """
+        예전 hrefs_<domain>.json 파일의 URL을 한 번만 가져옵니다.
+        반환값: 새로 추가된 URL 수
+        """
+        if not os.path.exists(filename):
+            return 0
+
+        with self._lock:
+            imported = self._conn.execute(
+                "SELECT 1 FROM imported_files WHERE filename = ?", (os.path.abspath(filename),)
+            ).fetchone()
+        if imported:
+            return 0
+
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                hrefs = json.load(f).get('hrefs', [])
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"기존 JSON 파일 로드 중 오류 발생: {str(e)}")
+            return 0
+
+        added = self.add_discovered(hrefs)
+        self._execute(
+            "INSERT OR IGNORE INTO imported_files (filename, imported_at) VALUES (?, ?)",
+            (os.path.abspath(filename), self._now())
+        )
+        logger.info(f"{filename}에서 {added}개의 URL을 가져왔습니다.")
+        return added
+
+    def is_known(self, url):
+        """이미 수집된 URL인지 확인합니다."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def should_skip(self, url):
+        """
+        페이지를 열 필요가 없는 URL인지 확인합니다.
+        완료되었거나 재시도 횟수를 모두 사용한 URL은 건너뜁니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, retry_count FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return False
+        status, retry_count = row
+        return status == 'done' or (status == 'failed' and retry_count >= self.max_retries)
+
+    def filter_pending(self, urls):
+        """처리할 필요가 있는 URL만 순서를 유지해 반환합니다."""
+        return [url for url in urls if not self.should_skip(url)]
+
+    def pending_urls(self, domain=None, limit=None):
+        """아직 완료되지 않았고 재시도 가능한 URL 목록을 반환합니다."""
+        sql = "SELECT url FROM urls WHERE (status IN ('discovered', 'visited') OR (status = 'failed' AND retry_count < ?))"
+        params = [self.max_retries]
+        if domain:
+            sql += " AND domain = ?"
+            params.append(domain)
+        sql += " ORDER BY discovered_at"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def mark_visited(self, url):
+        now = self._now()
+        self._execute(
+            "INSERT INTO urls (url, domain, status, discovered_at, updated_at) VALUES (?, ?, 'visited', ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET status = 'visited', updated_at = excluded.updated_at",
+            (url, self._domain(url), now, now)
+        )
+
+    def set_media_url(self, url, kind, media_url):
+        """페이지에서 찾은 트레일러(kind='trailer') 또는 타이틀 이미지(kind='image') URL을 기록합니다."""
+        column = self._media_column(kind)
+        self._execute(
+            f"UPDATE urls SET {column}_url = ?, {column}_done = 0, updated_at = ? WHERE url = ?",
+            (media_url, self._now(), url)
+        )
+
+    def mark_media(self, url, kind, success, error=None):
+        """
+        트레일러/이미지 다운로드 결과를 기록합니다. (다운로드 매니저의 완료 콜백)
+        트레일러가 완료되고 이미지가 없거나 완료되었으면 URL 전체를 done으로 바꿉니다.
+        """
+        column = self._media_column(kind)
+        now = self._now()
+        with self._lock:
+            if success:
+                self._conn.execute(
+                    f"UPDATE urls SET {column}_done = 1, updated_at = ? WHERE url = ?", (now, url)
+                )
+                self._conn.execute(
+                    "UPDATE urls SET status = 'done' WHERE url = ? AND trailer_done = 1 "
+                    "AND (image_url IS NULL OR image_done = 1)",
+                    (url,)
+                )
+            else:
+                self._conn.execute(self._FAIL_SQL, (error, now, url))
+            self._conn.commit()
+
+    def mark_done(self, url):
+        """다운로드할 트레일러가 없는 페이지처럼 더 처리할 것이 없는 URL을 완료로 기록합니다."""
+        self._execute(
+            "UPDATE urls SET status = 'done', updated_at = ? WHERE url = ? AND trailer_url IS NULL",
+            (self._now(), url)
+        )
+
+    def mark_failed(self, url, error=None):
+        self._execute(self._FAIL_SQL, (error, self._now(), url))
+
+    def count_by_status(self, domain=None):
+        sql = "SELECT status, COUNT(*) FROM urls"
+        params = ()
+        if domain:
+            sql += " WHERE domain = ?"
+            params = (domain,)
+        sql += " GROUP BY status"
+        with self._lock:
+            return dict(self._conn.execute(sql, params).fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _media_column(self, kind):
+        if kind not in ('trailer', 'image'):
+            raise ValueError(f"알 수 없는 미디어 종류: {kind}")
+        return kind
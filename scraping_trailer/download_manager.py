@@ -0,0 +1,450 @@
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import DOWNLOAD_CONFIG
+from logger import logger
+from exceptions import DownloadException
+from scrape_metrics import ScrapeMetrics
+
+
+class DownloadManager:
+    """
+    트레일러/이미지 다운로드를 브라우저 흐름과 분리해 처리하는 다운로드 매니저.
+    - 커넥션 풀을 가진 requests.Session 재사용
+    - 동시 다운로드 수와 대기열 크기 제한 (대기열이 가득 차면 submit이 블로킹되어 메모리 사용을 제한)
+    - 처리량에 따라 커지는 청크 크기
+    - .part 파일에 기록한 뒤 완료 시 원자적으로 rename
+    - 중단된 .part 파일은 Range 요청으로 이어받고, 큰 파일은 여러 구간을 병렬로 받음
+    - Content-Length와 (MD5 형식인 경우) ETag로 완성본 검증
+    """
+
+    def __init__(self, max_workers=None, max_queued=None, metrics=None):
+        self.max_workers = max_workers or DOWNLOAD_CONFIG['max_concurrent']
+        self.metrics = metrics or ScrapeMetrics.default()
+        self.session = self._create_session()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='download')
+        self._slots = threading.BoundedSemaphore(self.max_workers + (max_queued or DOWNLOAD_CONFIG['max_queued']))
+        self._lock = threading.Lock()
+        self._in_progress = {}
+
+        self.completed_count = 0
+        self.skipped_count = 0
+        self.failed_count = 0
+        self.bytes_downloaded = 0
+
+    def _create_session(self):
+        session = requests.Session()
+        retry = Retry(
+            total=DOWNLOAD_CONFIG['retries'],
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+        # 구간 병렬 다운로드까지 고려한 최대 동시 연결 수
+        pool_size = self.max_workers * DOWNLOAD_CONFIG['parallel_segments']
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # Range 오프셋이 실제 파일 바이트와 일치하도록 압축 전송을 사용하지 않음
+        session.headers['Accept-Encoding'] = 'identity'
+        return session
+
+    def get_filepath(self, url, download_dir):
+        filename = os.path.basename(urlparse(url).path)
+        return os.path.join(download_dir, filename)
+
+    def fetch(self, url, download_dir, background=False, on_complete=None):
+        """
+        파일을 다운로드합니다.
+        반환값: None(이미 존재하여 스킵), True(완료 또는 백그라운드 대기열에 등록)
+        동기 모드에서 실패하면 DownloadException을 발생시킵니다.
+        on_complete: 최종 결과를 받는 콜백 on_complete(success, error). 백그라운드 모드에서는 다운로드 스레드에서 호출됩니다.
+        """
+        filepath = self.get_filepath(url, download_dir)
+        if os.path.exists(filepath) and DOWNLOAD_CONFIG['verify_existing']:
+            self._requeue_if_truncated(url, filepath)
+
+        if os.path.exists(filepath):
+            logger.info(f"파일이 이미 존재합니다. 스킵합니다: {os.path.basename(filepath)}")
+            with self._lock:
+                self.skipped_count += 1
+            self._notify(on_complete, True)
+            return None
+
+        with self._lock:
+            future = self._in_progress.get(filepath)
+        if future:
+            logger.info(f"이미 다운로드 중입니다: {os.path.basename(filepath)}")
+            self._attach(future, on_complete)
+            return True
+
+        if not background:
+            try:
+                self._download(url, filepath)
+            except DownloadException as e:
+                self._notify(on_complete, False, str(e))
+                raise
+            self._notify(on_complete, True)
+            return True
+
+        self.submit(url, filepath, on_complete)
+        return True
+
+    def _notify(self, on_complete, success, error=None):
+        if not on_complete:
+            return
+        try:
+            on_complete(success, error)
+        except Exception as e:
+            logger.error(f"다운로드 완료 콜백 실행 중 오류 발생: {str(e)}")
+
+    def _attach(self, future, on_complete):
+        """이미 진행 중인 다운로드에 완료 콜백을 추가합니다."""
+        if on_complete:
+            future.add_done_callback(lambda done: self._notify(on_complete, bool(done.result())))
+
+    def submit(self, url, filepath, on_complete=None):
+        """
+        백그라운드 다운로드를 등록하고 Future를 반환합니다. 같은 파일이 이미 진행 중이면 기존 Future를 반환합니다.
+        """
+        with self._lock:
+            if filepath in self._in_progress:
+                self._attach(self._in_progress[filepath], on_complete)
+                return self._in_progress[filepath]
+
+        # 대기열이 가득 차면 여기서 기다림 (브라우저가 다운로드보다 너무 앞서가지 않도록)
+        self._slots.acquire()
+        with self._lock:
+            if filepath in self._in_progress:
+                self._slots.release()
+                self._attach(self._in_progress[filepath], on_complete)
+                return self._in_progress[filepath]
+            future = self.executor.submit(self._download_in_background, url, filepath, on_complete)
+            self._in_progress[filepath] = future
+
+        logger.info(f"다운로드 대기열에 추가: {os.path.basename(filepath)}")
+        return future
+
+    def _download_in_background(self, url, filepath, on_complete=None):
+        try:
+            result = self._download(url, filepath)
+            self._notify(on_complete, True)
+            return result
+        except DownloadException as e:
+            logger.error(str(e))
+            self._notify(on_complete, False, str(e))
+            return False
+        finally:
+            with self._lock:
+                self._in_progress.pop(filepath, None)
+            self._slots.release()
+
+    def _requeue_if_truncated(self, url, filepath):
+        """
+        이전 버전에서 .part 없이 받다가 끊긴 파일을 찾아 .part로 되돌려 이어받을 수 있게 합니다.
+        """
+        info = self._probe(url)
+        local_size = os.path.getsize(filepath)
+        if info['size'] and local_size < info['size']:
+            logger.warning(f"불완전한 파일을 발견했습니다 ({local_size}/{info['size']} bytes). 이어받습니다: {filepath}")
+            os.replace(filepath, filepath + '.part')
+
+    def _probe(self, url):
+        """
+        HEAD 요청으로 전체 크기, ETag, Range 지원 여부를 확인합니다. HEAD를 지원하지 않으면 빈 정보를 반환합니다.
+        """
+        info = {'size': None, 'etag': None, 'accept_ranges': False}
+        try:
+            response = self.session.head(
+                url,
+                allow_redirects=True,
+                timeout=(DOWNLOAD_CONFIG['connect_timeout'], DOWNLOAD_CONFIG['read_timeout'])
+            )
+            if response.ok:
+                length = response.headers.get('Content-Length')
+                info['size'] = int(length) if length and length.isdigit() else None
+                info['etag'] = response.headers.get('ETag')
+                info['accept_ranges'] = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        except requests.RequestException as e:
+            logger.debug(f"HEAD 요청 실패, GET 응답으로 정보를 확인합니다: {str(e)}")
+        return info
+
+    def _download(self, url, filepath):
+        filename = os.path.basename(filepath)
+        part_path = filepath + '.part'
+
+        started = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            logger.info(f"다운로드 시작: {filename}")
+
+            info = self._probe(url)
+            self._discard_stale_parts(filepath, info)
+            self._save_meta(filepath, info)
+
+            use_segments = (
+                info['accept_ranges'] and info['size']
+                and info['size'] >= DOWNLOAD_CONFIG['parallel_threshold']
+                and not os.path.exists(part_path)
+            )
+            if use_segments:
+                written = self._download_segments(url, filepath, info)
+            else:
+                written = self._download_single(url, part_path, info)
+
+            self._verify(part_path, info)
+
+            # 완성된 파일만 최종 경로에 나타나도록 원자적으로 교체
+            os.replace(part_path, filepath)
+            self._remove_quietly(filepath + '.part.json')
+            # 구간을 합치기 전에 중단되었다가 .part로 이어받은 경우 남아 있는 구간 파일 정리
+            self._remove_segment_files(filepath, DOWNLOAD_CONFIG['parallel_segments'])
+
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.completed_count += 1
+                self.bytes_downloaded += written
+            speed = written / elapsed / (1024 * 1024) if elapsed > 0 else 0
+            logger.info(f"다운로드 완료: {filepath} ({written / (1024 * 1024):.1f} MB, {speed:.1f} MB/s)")
+            self.metrics.record_download(url, filepath, written, elapsed)
+            return True
+
+        except Exception as e:
+            with self._lock:
+                self.failed_count += 1
+            self.metrics.record_download(url, filepath, 0, time.monotonic() - started, ok=False)
+            raise DownloadException(f"다운로드 중 오류 발생 ({filename}): {str(e)}")
+
+    def _download_single(self, url, part_path, info):
+        """
+        하나의 연결로 다운로드합니다. .part가 있으면 Range 요청으로 이어받습니다.
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if info['size'] is not None and offset == info['size']:
+            return 0
+        if info['size'] is not None and offset > info['size']:
+            offset = 0
+
+        headers = {}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            # 서버의 파일이 바뀌었으면 206 대신 전체 파일(200)을 받음
+            if info['etag']:
+                headers['If-Range'] = info['etag']
+
+        written = 0
+        with self.session.get(
+            url,
+            stream=True,
+            headers=headers,
+            timeout=(DOWNLOAD_CONFIG['connect_timeout'], DOWNLOAD_CONFIG['read_timeout'])
+        ) as response:
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                start, total = self._parse_content_range(response.headers.get('Content-Range'))
+                if start != offset:
+                    raise DownloadException(f"요청한 위치({offset})와 응답 위치({start})가 다릅니다")
+                mode = 'ab'
+                logger.info(f"이어받기: {os.path.basename(part_path)} ({offset} bytes부터)")
+            else:
+                total = response.headers.get('Content-Length')
+                total = int(total) if total and total.isdigit() else None
+                mode = 'wb'
+
+            # HEAD가 없던 경우 GET 응답 정보로 검증
+            if info['size'] is None and total is not None:
+                info['size'] = total
+            if info['etag'] is None:
+                info['etag'] = response.headers.get('ETag')
+
+            with open(part_path, mode) as f:
+                for chunk in self._iter_adaptive_chunks(response):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        return written
+
+    def _download_segments(self, url, filepath, info):
+        """
+        큰 파일을 여러 구간으로 나누어 병렬로 받은 뒤 .part 하나로 합칩니다.
+        구간 파일(.part.N)은 각각 이어받기가 가능합니다.
+        """
+        size = info['size']
+        segment_count = DOWNLOAD_CONFIG['parallel_segments']
+        segment_size = math.ceil(size / segment_count)
+        segments = [
+            (index, start, min(start + segment_size, size) - 1)
+            for index, start in enumerate(range(0, size, segment_size))
+        ]
+        logger.info(f"{len(segments)}개 구간으로 병렬 다운로드: {os.path.basename(filepath)}")
+
+        with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix='segment') as executor:
+            futures = [
+                executor.submit(self._download_range, url, f"{filepath}.part.{index}", start, end, info['etag'])
+                for index, start, end in segments
+            ]
+            written = sum(future.result() for future in futures)
+
+        part_path = filepath + '.part'
+        with open(part_path, 'wb') as out:
+            for index, _, _ in segments:
+                with open(f"{filepath}.part.{index}", 'rb') as segment_file:
+                    shutil.copyfileobj(segment_file, out, DOWNLOAD_CONFIG['chunk_size_max'])
+        self._remove_segment_files(filepath, len(segments))
+
+        return written
+
+    def _download_range(self, url, segment_path, start, end, etag):
+        expected = end - start + 1
+        have = os.path.getsize(segment_path) if os.path.exists(segment_path) else 0
+        if have == expected:
+            return 0
+        if have > expected:
+            have = 0
+
+        headers = {'Range': f"bytes={start + have}-{end}"}
+        if etag:
+            headers['If-Range'] = etag
+
+        written = 0
+        with self.session.get(
+            url,
+            stream=True,
+            headers=headers,
+            timeout=(DOWNLOAD_CONFIG['connect_timeout'], DOWNLOAD_CONFIG['read_timeout'])
+        ) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadException("서버가 Range 요청을 처리하지 않았거나 파일이 변경되었습니다")
+
+            with open(segment_path, 'ab' if have else 'wb') as f:
+                for chunk in self._iter_adaptive_chunks(response):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if os.path.getsize(segment_path) != expected:
+            raise DownloadException(f"구간 크기가 맞지 않습니다: {os.path.basename(segment_path)}")
+        return written
+
+    def _parse_content_range(self, content_range):
+        """
+        'bytes 100-199/1000' 형식에서 (시작 위치, 전체 크기)를 반환합니다.
+        """
+        match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', content_range or '')
+        if not match:
+            raise DownloadException(f"Content-Range 형식이 올바르지 않습니다: {content_range}")
+        total = match.group(2)
+        return int(match.group(1)), int(total) if total != '*' else None
+
+    def _verify(self, part_path, info):
+        """
+        받은 파일의 크기와 ETag(MD5 형식일 때)를 확인합니다.
+        크기가 모자라면 .part를 남겨 다음 실행에서 이어받고, 내용이 다르면 삭제합니다.
+        """
+        actual_size = os.path.getsize(part_path)
+        if info['size'] is not None and actual_size != info['size']:
+            raise DownloadException(f"파일 크기가 맞지 않습니다 ({actual_size}/{info['size']} bytes). 다음 실행에서 이어받습니다")
+
+        # S3/R2 등은 단일 업로드 파일의 ETag로 MD5를 사용합니다 (약한 ETag나 멀티파트 ETag는 검증 불가)
+        etag = (info['etag'] or '').strip('"')
+        if re.fullmatch(r'[0-9a-f]{32}', etag):
+            digest = hashlib.md5()
+            with open(part_path, 'rb') as f:
+                for block in iter(lambda: f.read(DOWNLOAD_CONFIG['chunk_size_max']), b''):
+                    digest.update(block)
+            if digest.hexdigest() != etag:
+                self._remove_quietly(part_path)
+                raise DownloadException("ETag(MD5)가 일치하지 않습니다. 손상된 파일을 삭제했습니다")
+
+    def _save_meta(self, filepath, info):
+        with open(filepath + '.part.json', 'w', encoding='utf-8') as f:
+            json.dump({'size': info['size'], 'etag': info['etag'], 'segments': DOWNLOAD_CONFIG['parallel_segments']}, f)
+
+    def _discard_stale_parts(self, filepath, info):
+        """
+        서버 파일이 이전 다운로드 이후 바뀌었으면 남아 있는 부분 파일을 삭제합니다.
+        """
+        meta_path = filepath + '.part.json'
+        if not os.path.exists(meta_path):
+            return
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            meta = {}
+
+        changed = (
+            (meta.get('etag') and info['etag'] and meta['etag'] != info['etag'])
+            or (meta.get('size') and info['size'] and meta['size'] != info['size'])
+        )
+        if changed or meta.get('segments') != DOWNLOAD_CONFIG['parallel_segments']:
+            logger.info(f"서버 파일이 변경되어 부분 파일을 삭제합니다: {os.path.basename(filepath)}")
+            self._remove_quietly(filepath + '.part')
+            self._remove_segment_files(filepath, max(meta.get('segments') or 0, DOWNLOAD_CONFIG['parallel_segments']))
+
+    def _remove_segment_files(self, filepath, count):
+        for index in range(count):
+            self._remove_quietly(f"{filepath}.part.{index}")
+
+    def _remove_quietly(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _iter_adaptive_chunks(self, response):
+        """
+        청크가 빠르게 도착하면 청크 크기를 두 배로 늘려 시스템 콜과 파이썬 루프 오버헤드를 줄입니다.
+        """
+        chunk_size = DOWNLOAD_CONFIG['chunk_size_min']
+        raw = response.raw
+
+        while True:
+            started = time.monotonic()
+            chunk = raw.read(chunk_size, decode_content=True)
+            if not chunk:
+                break
+            yield chunk
+
+            if time.monotonic() - started < 0.05 and chunk_size < DOWNLOAD_CONFIG['chunk_size_max']:
+                chunk_size = min(chunk_size * 2, DOWNLOAD_CONFIG['chunk_size_max'])
+
+    def wait_all(self):
+        """
+        대기 중인 다운로드가 모두 끝날 때까지 기다립니다.
+        """
+        while True:
+            with self._lock:
+                pending = list(self._in_progress.values())
+            if not pending:
+                return
+            logger.info(f"남은 다운로드 {len(pending)}개가 끝나기를 기다립니다...")
+            for future in pending:
+                future.result()
+
+    def log_summary(self):
+        logger.info("\n=== 다운로드 통계 ===")
+        logger.info(f"다운로드 완료: {self.completed_count}")
+        logger.info(f"이미 존재하여 스킵: {self.skipped_count}")
+        logger.info(f"다운로드 실패: {self.failed_count}")
+        logger.info(f"받은 용량: {self.bytes_downloaded / (1024 * 1024):.1f} MB")
+        logger.info("===================")
+
+    def close(self):
+        self.wait_all()
+        self.executor.shutdown(wait=True)
+        self.session.close()
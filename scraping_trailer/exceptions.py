@@ -16,4 +16,8 @@ class ConfigurationException(TrailerScraperException):
 
 class BrowserException(TrailerScraperException):
     """브라우저 관련 예외"""
+    pass
+
+class CrawlException(TrailerScraperException):
+    """목록 페이지 수집 중 재시도 후에도 페이지를 가져오지 못했을 때 발생하는 예외"""
     pass 
\ No newline at end of file
@@ -0,0 +1,173 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+
+import requests
+
+from config import CRAWL_CONFIG, RESOLVER_CONFIG
+from exceptions import CrawlException
+from logger import logger
+
+
+class RateLimiter:
+    """요청 시작 간격을 일정하게 유지하는 스레드 안전 속도 제한기"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class ListingCrawler:
+    """
+    목록 페이지를 자동으로 넘기며 비디오 링크를 수집하는 크롤러.
+    페이지는 HTTP로 여러 개를 동시에(속도 제한 내에서) 가져오고, 새 링크가 없는 페이지가 나오면 멈춥니다.
+    HTML에서 링크를 찾지 못하면(클라이언트 렌더링) fallback_fetch로 브라우저를 사용해 한 페이지씩 수집합니다.
+    """
+
+    # VideoThumbnailPreview 컨테이너 바로 아래의 a 태그 (collect_video_hrefs의 DOM 선택자와 같은 기준)
+    THUMBNAIL_LINK_PATTERN = re.compile(
+        r'class="[^"]*VideoThumbnailPreview__Container[^"]*"[^>]*>\s*<a[^>]*?\shref="([^"]+)"'
+    )
+
+    def __init__(self, session=None, fallback_fetch=None, is_known=None,
+                 concurrency=None, requests_per_second=None, max_pages=None):
+        """
+        fallback_fetch: page_url -> href 목록. HTML로 수집할 수 없을 때 사용 (예: 브라우저)
+        is_known: url -> bool. 이전 크롤에서 이미 수집된 URL도 새 링크로 세지 않을 때 사용
+        """
+        self.session = session or requests.Session()
+        self.fallback_fetch = fallback_fetch
+        self.is_known = is_known
+        self.concurrency = concurrency or CRAWL_CONFIG['concurrency']
+        self.rate_limiter = RateLimiter(requests_per_second or CRAWL_CONFIG['requests_per_second'])
+        self.max_pages = max_pages or CRAWL_CONFIG['max_pages']
+
+    def page_url(self, base_url, page):
+        """base_url의 페이지 번호 쿼리 파라미터를 page로 바꾼 URL을 반환합니다."""
+        parsed = urlparse(base_url)
+        query = parse_qs(parsed.query)
+        query[CRAWL_CONFIG['page_param']] = [str(page)]
+        return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+    def start_page(self, base_url):
+        values = parse_qs(urlparse(base_url).query).get(CRAWL_CONFIG['page_param'])
+        return int(values[0]) if values and values[0].isdigit() else 1
+
+    def fetch_page_hrefs(self, page_url):
+        """
+        목록 페이지 HTML에서 썸네일 링크를 추출합니다.
+        반환값: 절대 URL 목록 (404/410은 목록의 끝으로 보고 빈 목록),
+        다시 시도할 만한 실패(5xx, 429, 시간 초과, 연결 오류)면 None. 그 밖의 4xx는 CrawlException
+        """
+        self.rate_limiter.wait()
+        try:
+            response = self.session.get(
+                page_url,
+                headers={'User-Agent': RESOLVER_CONFIG['user_agent'], 'Accept-Encoding': 'gzip, deflate'},
+                timeout=RESOLVER_CONFIG['timeout']
+            )
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            if status in (404, 410):
+                logger.info(f"목록 페이지가 없습니다 ({page_url}, HTTP {status}). 목록의 끝으로 봅니다.")
+                return []
+            if status < 500 and status != 429:
+                raise CrawlException(f"목록 페이지 요청이 거부되었습니다 ({page_url}): {str(e)}") from e
+            logger.error(f"목록 페이지를 가져올 수 없습니다 ({page_url}): {str(e)}")
+            return None
+        except requests.RequestException as e:
+            logger.error(f"목록 페이지를 가져올 수 없습니다 ({page_url}): {str(e)}")
+            return None
+
+        hrefs = [urljoin(page_url, href) for href in self.THUMBNAIL_LINK_PATTERN.findall(response.text)]
+        return list(dict.fromkeys(hrefs))
+
+    def _retry_page(self, base_url, page):
+        """
+        요청이 실패한 페이지를 간격을 늘려 가며 다시 가져옵니다.
+        반환값: href 목록, 재시도 후에도 실패하면 None
+        """
+        for attempt in range(CRAWL_CONFIG['page_retries']):
+            delay = CRAWL_CONFIG['retry_backoff'] * (2 ** attempt)
+            logger.warning(f"목록 페이지 {page} 요청 실패, {delay:.0f}초 후 다시 시도합니다 ({attempt + 1}/{CRAWL_CONFIG['page_retries']})")
+            time.sleep(delay)
+            hrefs = self.fetch_page_hrefs(self.page_url(base_url, page))
+            if hrefs is not None:
+                return hrefs
+        return None
+
+    def _fetch_batch(self, executor, base_url, pages, use_browser):
+        if use_browser:
+            # 브라우저는 하나뿐이므로 순서대로 처리
+            results = []
+            for page in pages:
+                self.rate_limiter.wait()
+                results.append(self.fallback_fetch(self.page_url(base_url, page)))
+            return results
+        return list(executor.map(lambda page: self.fetch_page_hrefs(self.page_url(base_url, page)), pages))
+
+    def crawl(self, base_url, on_page=None):
+        """
+        base_url부터 페이지를 넘기며 링크를 수집합니다.
+        on_page(page, hrefs): 새 링크를 찾은 페이지마다 호출 (예: 크롤 상태 저장소에 바로 기록)
+        반환값: 수집한 전체 링크 목록 (수집 순서 유지)
+        """
+        seen = {}
+        first_page = page = self.start_page(base_url)
+        last_page = page + self.max_pages - 1
+        use_browser = False
+        batch_size = self.concurrency
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='crawl') as executor:
+            while page <= last_page:
+                pages = list(range(page, min(page + batch_size, last_page + 1)))
+                batch = self._fetch_batch(executor, base_url, pages, use_browser)
+
+                # 동시에 가져온 페이지도 순서대로 확인해 첫 번째 빈 페이지에서 멈춤
+                for current_page, hrefs in zip(pages, batch):
+                    # 실패한 페이지는 순서대로 다시 시도하므로, 앞 페이지에서 목록이 끝나면 뒤 페이지는 재시도하지 않음
+                    if hrefs is None and not use_browser:
+                        hrefs = self._retry_page(base_url, current_page)
+                    # 요청 실패를 빈 페이지로 보고 멈추면 나머지 목록이 조용히 빠지므로 오류로 중단
+                    if hrefs is None:
+                        raise CrawlException(
+                            f"{current_page} 페이지를 가져오지 못해 수집을 중단합니다 (지금까지 새 링크 {len(seen)}개는 저장됨)"
+                        )
+
+                    # 첫 페이지를 HTML로 수집할 수 없으면 브라우저로 다시 시도
+                    if not use_browser and current_page == first_page and not hrefs and self.fallback_fetch:
+                        logger.info("HTML에서 링크를 찾을 수 없어 브라우저로 수집합니다.")
+                        use_browser = True
+                        batch_size = 1
+                        break
+
+                    new_hrefs = [
+                        href for href in hrefs
+                        if href not in seen and not (self.is_known and self.is_known(href))
+                    ]
+                    if not new_hrefs:
+                        logger.info(f"{current_page} 페이지에 새 링크가 없어 수집을 마칩니다.")
+                        return list(seen)
+
+                    for href in new_hrefs:
+                        seen[href] = True
+                    logger.info(f"{current_page} 페이지: 새 링크 {len(new_hrefs)}개 (누적 {len(seen)}개)")
+                    if on_page:
+                        on_page(current_page, new_hrefs)
+                else:
+                    page = pages[-1] + 1
+
+        logger.info(f"최대 페이지 수({self.max_pages})에 도달해 수집을 마칩니다.")
+        return list(seen)
@@ -2,20 +2,31 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.common.exceptions import WebDriverException, ElementClickInterceptedException
 from webdriver_manager.chrome import ChromeDriverManager
 import os
-import requests
-from urllib.parse import urlparse
+import sys
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urljoin
 import json
 import time
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import re
 
-from config import IS_DEV, TARGET_FILE, BROWSER_CONFIG, SELECTORS, WAIT_TIMES, DOWNLOAD_CONFIG
+from config import IS_DEV, TARGET_FILE, BROWSER_CONFIG, SELECTORS, WAIT_TIMES, DOWNLOAD_CONFIG, WORKER_CONFIG, RESOLVER_CONFIG, CRAWL_CONFIG, NETWORK_CONFIG
 from logger import logger
 from exceptions import ElementNotFoundException, DownloadException, BrowserException
+from stats import ProcessStats
+from worker_pool import ScrapeWorkerPool, is_session_alive
+from download_manager import DownloadManager
+from media_resolver import MediaResolver
+from crawl_state import CrawlState
+from href_crawler import ListingCrawler
+from network_interceptor import NetworkInterceptor
+from selector_registry import SelectorRegistry
+from scrape_metrics import ScrapeMetrics
+from waits import wait_for_page_ready, wait_for_any_element, wait_for_attribute, wait_for_navigation, wait_for_element_gone, matching_locators
 
 
 class BrowserManager:
@@ -24,6 +35,7 @@ class BrowserManager:
         self.port = BROWSER_CONFIG['port']
         self.driver = None
         self.is_existing_session = False
+        self.network = None
 
     def create_or_attach_browser(self):
         chrome_options = Options()
@@ -31,6 +43,7 @@ class BrowserManager:
         try:
             # 기존 세션에 연결 시도
             chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{self.port}")
+            NetworkInterceptor.configure_options(chrome_options)
             self.driver = webdriver.Chrome(options=chrome_options)
             logger.info("기존 Chrome 세션에 연결되었습니다.")
             self.is_existing_session = True
@@ -40,60 +53,152 @@ class BrowserManager:
             chrome_options.add_argument(f"user-data-dir={self.user_data_dir}")
             chrome_options.add_argument(f"--remote-debugging-port={self.port}")
             chrome_options.add_experimental_option("detach", True)
+            NetworkInterceptor.configure_options(chrome_options)
 
-            try:
-                # webdriver-manager를 사용하여 자동으로 ChromeDriver 관리
-                logger.info("webdriver-manager를 사용하여 Chrome 버전에 맞는 ChromeDriver를 다운로드합니다...")
-
-                # Chrome 139 버전용 ChromeDriver를 명시적으로 다운로드
-                driver_manager = ChromeDriverManager(driver_version="139.0.7258.157")
-                driver_path = driver_manager.install()
-
-                # 다운로드된 경로가 올바른 실행 파일인지 확인하고 수정
-                import os
-                import stat
-                if driver_path.endswith('THIRD_PARTY_NOTICES.chromedriver'):
-                    # 올바른 chromedriver 실행 파일 경로로 수정
-                    correct_path = os.path.join(os.path.dirname(driver_path), 'chromedriver')
-                    if os.path.exists(correct_path):
-                        driver_path = correct_path
-                        logger.info(f"ChromeDriver 경로를 수정했습니다: {driver_path}")
-                    else:
-                        logger.error(f"올바른 ChromeDriver 실행 파일을 찾을 수 없습니다: {correct_path}")
-
-                # 실행 권한 확인 및 설정
-                if os.path.exists(driver_path):
-                    current_permissions = os.stat(driver_path).st_mode
-                    if not (current_permissions & stat.S_IXUSR):
-                        os.chmod(driver_path, current_permissions | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-                        logger.info(f"ChromeDriver 실행 권한을 설정했습니다: {driver_path}")
-
-                service = Service(driver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("webdriver-manager를 사용하여 새로운 Chrome 세션을 생성했습니다.")
-            except Exception as wdm_error:
-                logger.warning(f"webdriver-manager 실패: {str(wdm_error)}")
-                logger.info("기본 ChromeDriver로 재시도합니다...")
-                try:
-                    # 기본 ChromeDriver 사용 (fallback)
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    logger.info("기본 ChromeDriver로 새로운 Chrome 세션을 생성했습니다.")
-                except Exception as default_error:
-                    logger.error(f"모든 ChromeDriver 옵션 실패: {str(default_error)}")
-                    logger.error("Chrome 버전과 ChromeDriver 버전이 호환되지 않습니다.")
-                    logger.error("해결 방법:")
-                    logger.error("1. Chrome 브라우저를 최신 버전으로 업데이트하세요.")
-                    logger.error("2. 또는 'brew upgrade chromedriver'로 ChromeDriver를 업데이트하세요.")
-                    raise BrowserException(f"ChromeDriver 세션을 생성할 수 없습니다: {str(default_error)}")
-
+            self.driver = self._start_chrome(chrome_options)
             self.is_existing_session = False
 
+        self._enable_network_interception()
         return self.driver, self.is_existing_session
 
+    def create_browser(self, headless=True):
+        """
+        병렬 워커용 독립 Chrome 인스턴스를 생성합니다.
+        디버깅 포트와 사용자 데이터 디렉토리를 공유하지 않으므로 여러 개를 동시에 띄울 수 있습니다.
+        """
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument(f"--window-size={WORKER_CONFIG['window_size']}")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--mute-audio")
+        if BROWSER_CONFIG['block_resources']:
+            self._block_heavy_resources(chrome_options)
+        NetworkInterceptor.configure_options(chrome_options)
+
+        self.driver = self._start_chrome(chrome_options)
+        self.is_existing_session = False
+        self._enable_network_interception()
+        return self.driver
+
+    def _enable_network_interception(self):
+        """
+        CDP로 불필요한 요청(이미지/미디어/폰트/분석 도메인)을 차단하고 요청 URL 수집을 시작합니다.
+        """
+        if not NETWORK_CONFIG['enabled']:
+            self.network = None
+            return
+        self.network = NetworkInterceptor(self.driver)
+        self.network.enable()
+
+    def _block_heavy_resources(self, chrome_options):
+        """
+        페이지 로딩에 필요 없는 무거운 리소스를 받지 않도록 설정합니다.
+        이미지/비디오 URL은 DOM 속성에서 읽으므로 실제 파일을 받지 않아도 수집할 수 있습니다.
+        """
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+
+    def _start_chrome(self, chrome_options):
+        try:
+            # webdriver-manager를 사용하여 자동으로 ChromeDriver 관리
+            logger.info("webdriver-manager를 사용하여 Chrome 버전에 맞는 ChromeDriver를 다운로드합니다...")
+
+            # Chrome 139 버전용 ChromeDriver를 명시적으로 다운로드
+            driver_manager = ChromeDriverManager(driver_version="139.0.7258.157")
+            driver_path = driver_manager.install()
+
+            # 다운로드된 경로가 올바른 실행 파일인지 확인하고 수정
+            import stat
+            if driver_path.endswith('THIRD_PARTY_NOTICES.chromedriver'):
+                # 올바른 chromedriver 실행 파일 경로로 수정
+                correct_path = os.path.join(os.path.dirname(driver_path), 'chromedriver')
+                if os.path.exists(correct_path):
+                    driver_path = correct_path
+                    logger.info(f"ChromeDriver 경로를 수정했습니다: {driver_path}")
+                else:
+                    logger.error(f"올바른 ChromeDriver 실행 파일을 찾을 수 없습니다: {correct_path}")
+
+            # 실행 권한 확인 및 설정
+            if os.path.exists(driver_path):
+                current_permissions = os.stat(driver_path).st_mode
+                if not (current_permissions & stat.S_IXUSR):
+                    os.chmod(driver_path, current_permissions | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                    logger.info(f"ChromeDriver 실행 권한을 설정했습니다: {driver_path}")
+
+            service = Service(driver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            logger.info("webdriver-manager를 사용하여 새로운 Chrome 세션을 생성했습니다.")
+            return driver
+        except Exception as wdm_error:
+            logger.warning(f"webdriver-manager 실패: {str(wdm_error)}")
+            logger.info("기본 ChromeDriver로 재시도합니다...")
+            try:
+                # 기본 ChromeDriver 사용 (fallback)
+                driver = webdriver.Chrome(options=chrome_options)
+                logger.info("기본 ChromeDriver로 새로운 Chrome 세션을 생성했습니다.")
+                return driver
+            except Exception as default_error:
+                logger.error(f"모든 ChromeDriver 옵션 실패: {str(default_error)}")
+                logger.error("Chrome 버전과 ChromeDriver 버전이 호환되지 않습니다.")
+                logger.error("해결 방법:")
+                logger.error("1. Chrome 브라우저를 최신 버전으로 업데이트하세요.")
+                logger.error("2. 또는 'brew upgrade chromedriver'로 ChromeDriver를 업데이트하세요.")
+                raise BrowserException(f"ChromeDriver 세션을 생성할 수 없습니다: {str(default_error)}")
+
 
 class WebPage:
-    def __init__(self, driver):
+    # 후보 locator 목록: 모든 후보를 동시에 기다리고, 동시에 있으면 앞쪽 후보를 우선합니다
+    AGREE_LOCATORS = [
+        (By.CSS_SELECTOR, SELECTORS['agree_button']),
+        (By.XPATH, '//*[@id="__next"]/div[1]/div/div[2]/div/button[2]'),
+    ]
+    MAIN_CONTENT_LOCATORS = [(By.CSS_SELECTOR, selector) for selector in SELECTORS['main_content']]
+    TITLE_IMAGE_LOCATORS = [
+        (By.CSS_SELECTOR, "#__next > main > div > div.BoundingArea__StyledBoundingArea-sc-14t8hgr-0.kTqlJd > div > div.Hero-a7asd6-0.dUZdxD > div.VideoCoverWrapper-n2it0r-0.cYQYBf > div.ProgressiveImage__ImageSizeContainer-ptxr6s-0.ihEUCS > picture > img"),
+        (By.CSS_SELECTOR, "main .Hero-a7asd6-0 .VideoCoverWrapper-n2it0r-0 picture img"),  # 더 간단한 선택자
+        (By.CSS_SELECTOR, "main .VideoCoverWrapper picture img"),  # 더 일반적인 선택자
+        (By.XPATH, '//*[@id="__next"]/main/div/div[1]/div/div[1]/div[2]/div[1]/picture/img'),
+        (By.CSS_SELECTOR, "main picture img[srcset]"),  # srcset 속성이 있는 이미지
+    ]
+    # 상세 페이지 플레이어 구조에만 있는 locator (페이지 전환 확인에도 사용)
+    TRAILER_PLAYER_LOCATORS = [
+        (By.CSS_SELECTOR, "#__next > main > div > div.BoundingArea__StyledBoundingArea-sc-14t8hgr-0.kTqlJd > div > div.Hero-a7asd6-0.dUZdxD > div.VideoPlayerWrapper-sc-19xo1j4-0.keBsYD > div > div > div > div.plyr__video-wrapper.plyr__video-wrapper--fixed-ratio > video > source:nth-child(5)"),
+        (By.CSS_SELECTOR, SELECTORS['trailer_source']),
+        (By.XPATH, '//*[@id="__next"]/main/div/div[1]/div/div[1]/div[1]/div/div/div/div[2]/video/source[5]'),
+        (By.XPATH, '/html/body/div[2]/main/div/div[1]/div/div[1]/div[1]/div/div/div/div[2]/video/source[5]'),
+    ]
+    TRAILER_SOURCE_LOCATORS = TRAILER_PLAYER_LOCATORS + [
+        (By.CSS_SELECTOR, "main video source[src*='.mp4']"),  # 구조가 바뀐 경우의 최후 후보
+    ]
+
+    # 네트워크 이벤트에서 찾을 미디어 URL 패턴
+    TRAILER_URL_PATTERN = r'\.mp4(\?|$)'
+    TITLE_IMAGE_URL_PATTERN = r'_3840x2160\.webp'
+
+    def __init__(self, driver, download_manager=None, background_downloads=False, resolve_without_browser=None,
+                 crawl_state=None, network=None, selector_registry=None, metrics=None):
         self.driver = driver
+        self.metrics = metrics or ScrapeMetrics.default()
+        # 선택자별 성공률 기록 및 순서 조정 (병렬 워커가 같은 통계를 공유)
+        self.selector_registry = selector_registry or SelectorRegistry.default()
+        # NetworkInterceptor: 요청 이벤트에서 미디어 URL을 DOM보다 먼저 찾음 (없으면 DOM만 사용)
+        self.network = network
+        self.download_manager = download_manager or DownloadManager()
+        self.crawl_state = crawl_state or CrawlState()
+        # True면 다운로드를 대기열에 넣고 바로 다음 페이지로 진행합니다
+        self.background_downloads = background_downloads
+
+        if resolve_without_browser is None:
+            resolve_without_browser = RESOLVER_CONFIG['enabled']
+        # HTML은 다운로드와 같은 커넥션 풀로 가져옵니다
+        self.media_resolver = MediaResolver(self.download_manager.session) if resolve_without_browser else None
 
     def get_title(self):
         try:
@@ -149,68 +254,92 @@ class WebPage:
             print(f"선택자로 I AGREE 버튼을 찾는 중 오류 발생: {str(e)}")
             return False
 
+    def wait_for_selector(self, group, locators, attribute=None, timeout=None):
+        """
+        최근에 성공한 선택자를 먼저 확인하도록 정렬해 기다리고, 결과를 선택자 통계에 기록합니다.
+        attribute를 주면 그 속성 값이 채워진 요소를 기다립니다.
+        반환값: (locator, element 또는 속성값), 시간 초과 시 (None, None)
+        """
+        ordered = self.selector_registry.ordered(group, locators)
+        started = time.monotonic()
+        if attribute:
+            locator, result = wait_for_attribute(self.driver, ordered, attribute, timeout)
+        else:
+            locator, result = wait_for_any_element(self.driver, ordered, timeout)
+        latency = time.monotonic() - started
+
+        hit_locators = []
+        if locator is not None:
+            # 우선순위에서 밀렸을 뿐 지금도 맞는 선택자는 실패가 아니므로 함께 성공으로 기록
+            predicate = (lambda element: element.get_attribute(attribute)) if attribute else None
+            hit_locators = matching_locators(self.driver, ordered, predicate)
+            if locator not in hit_locators:
+                hit_locators.append(locator)
+        self.selector_registry.record(group, ordered, hit_locators, latency)
+        return locator, result
+
+    def dismiss_agree_modal(self, timeout=None):
+        """
+        나이 확인(Agree) 모달이 있으면 클릭하고 모달이 사라질 때까지 기다립니다.
+        """
+        locator, element = self.wait_for_selector('agree', self.AGREE_LOCATORS, timeout=timeout)
+        if element is None:
+            return False
+
+        logger.debug(f"Agree 버튼을 찾았습니다. 클릭합니다: {locator[1]}")
+        element.click()
+        wait_for_element_gone(self.driver, element)
+        return True
+
     def click_main_content(self):
         try:
-            for selector in SELECTORS['main_content']:
-                try:
-                    logger.debug(f"선택자 시도 중: {selector}")
-                    element = WebDriverWait(self.driver, WAIT_TIMES['element_wait']).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if element:
-                        logger.debug(f"요소를 찾았습니다: {selector}")
-                        element.click()
-                        return True
-                except:
-                    continue
-
-            raise ElementNotFoundException("메인 컨텐츠를 찾을 수 없습니다.")
+            locator, element = self.wait_for_selector('main_content', self.MAIN_CONTENT_LOCATORS)
+            if element is None:
+                raise ElementNotFoundException("메인 컨텐츠를 찾을 수 없습니다.")
+
+            logger.debug(f"요소를 찾았습니다: {locator[1]}")
+            try:
+                element.click()
+            except ElementClickInterceptedException:
+                # 메인 컨텐츠보다 늦게 뜬 Agree 모달이 클릭을 가로챈 경우
+                logger.debug("클릭이 가로막혔습니다. Agree 모달을 닫고 다시 시도합니다.")
+                self.dismiss_agree_modal(timeout=0)
+                element.click()
+            return True
 
         except Exception as e:
             logger.error(f"메인 컨텐츠를 찾는 중 오류 발생: {str(e)}")
             return False
 
+    def find_trailer_source_url(self, timeout=None):
+        """
+        트레일러 video source의 src를 기다려서 반환합니다. 찾지 못하면 None을 반환합니다.
+        플레이어가 이미 .mp4를 요청했다면 DOM을 기다리지 않고 네트워크 이벤트의 URL을 사용합니다.
+        """
+        if self.network:
+            src = self.network.find_url(self.TRAILER_URL_PATTERN)
+            if src:
+                logger.info(f"네트워크 요청에서 트레일러 URL을 찾았습니다: {src}")
+                return src
+
+        locator, src = self.wait_for_selector('trailer_source', self.TRAILER_SOURCE_LOCATORS, 'src', timeout)
+        if src:
+            logger.debug(f"트레일러 소스를 찾았습니다: {locator[1]}")
+            logger.info(f"트레일러 소스 URL: {src}")
+        return src
+
     def get_trailer_source(self):
         try:
-            # CSS 선택자로 찾기
-            selector = "#__next > main > div > div.BoundingArea__StyledBoundingArea-sc-14t8hgr-0.kTqlJd > div > div.Hero-a7asd6-0.dUZdxD > div.VideoPlayerWrapper-sc-19xo1j4-0.keBsYD > div > div > div > div.plyr__video-wrapper.plyr__video-wrapper--fixed-ratio > video > source:nth-child(5)"
-            try:
-                logger.debug(f"CSS 선택자로 트레일러 소스 시도 중: {selector}")
-                element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                src = element.get_attribute('src')
-                if src:
-                    logger.debug("CSS 선택자로 트레일러 소스를 찾았습니다.")
-                    logger.info(f"트레일러 소스 URL: {src}")
-
-                    # .mp4 파일인 경우 다운로드 시도
-                    if '.mp4' in src:
-                        self.download_mp4(src)
-
-                    return True
-            except Exception as e:
-                logger.debug(f"CSS 선택자로 트레일러 소스를 찾지 못했습니다: {str(e)}")
+            src = self.find_trailer_source_url()
+            if not src:
+                logger.error("모든 방법으로 트레일러 소스를 찾을 수 없습니다.")
+                return False
 
-            # XPath로 백업 시도
-            try:
-                logger.debug("XPath로 트레일러 소스 시도 중.")
-                xpath = '//*[@id="__next"]/main/div/div[1]/div/div[1]/div[1]/div/div/div/div[2]/video/source[5]'
-                xpath = '/html/body/div[2]/main/div/div[1]/div/div[1]/div[1]/div/div/div/div[2]/video/source[5]'
-                element = self.driver.find_element(By.XPATH, xpath)
-                src = element.get_attribute('src')
-                if src:
-                    logger.debug("XPath로 트레일러 소스를 찾았습니다.")
-                    logger.info(f"트레일러 소스 URL: {src}")
-
-                    # .mp4 파일인 경우 다운로드 시도
-                    if '.mp4' in src:
-                        self.download_mp4(src)
-
-                    return True
-            except Exception as e:
-                logger.debug(f"XPath로 트레일러 소스를 찾지 못했습니다: {str(e)}")
+            # .mp4 파일인 경우 다운로드 시도
+            if '.mp4' in src:
+                self.download_mp4(src)
 
-            logger.error("모든 방법으로 트레일러 소스를 찾을 수 없습니다.")
-            return False
+            return True
 
         except Exception as e:
             logger.error(f"트레일러 소스를 찾는 중 오류 발생: {str(e)}")
@@ -236,66 +365,54 @@ class WebPage:
             os.makedirs(directory, exist_ok=True)
             logger.debug(f"다운로드 디렉토리 생성: {directory}")
 
-    def download_mp4(self, url):
-        try:
-            parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            download_dir = self.get_download_dir('trailer')
-            self.ensure_download_dir(download_dir)
-            filepath = os.path.join(download_dir, filename)
-            
-            if os.path.exists(filepath):
-                logger.info(f"파일이 이미 존재합니다. 스킵합니다: {filename}")
-                return None  # 스킵된 경우
-            
-            logger.info(f"다운로드 시작: {filename}")
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            logger.info(f"다운로드 완료: {filepath}")
-            return True
-        except Exception as e:
-            raise DownloadException(f"다운로드 중 오류 발생: {str(e)}")
+    def download_mp4(self, url, page_url=None):
+        download_dir = self.get_download_dir('trailer')
+        on_complete = self._track_media(page_url, 'trailer', url)
+        return self.download_manager.fetch(url, download_dir, background=self.background_downloads, on_complete=on_complete)
 
-    def do_process(self):
+    def _track_media(self, page_url, kind, media_url):
+        """
+        페이지에서 찾은 미디어 URL을 크롤 상태에 기록하고, 다운로드 결과를 기록할 콜백을 반환합니다.
+        """
+        if not page_url:
+            return None
+        self.crawl_state.set_media_url(page_url, kind, media_url)
+        return functools.partial(self.crawl_state.mark_media, page_url, kind)
+
+    def do_process(self, page_url=None):
         try:
-            # 1. Agree 버튼 체크 및 클릭
-            try:
-                agree_element = self.driver.find_element(By.CSS_SELECTOR, SELECTORS['agree_button'])
-                if agree_element:
-                    logger.debug("기본 선택자로 Agree 버튼을 찾았습니다. 클릭합니다.")
-                    agree_element.click()
-                    time.sleep(WAIT_TIMES['after_click'])
-            except NoSuchElementException:
-                logger.debug("기본 선택자로 Agree 버튼을 찾을 수 없습니다. XPath로 시도합니다.")
-                
-                # XPath로 백업 시도
-                try:
-                    xpath = '//*[@id="__next"]/div[1]/div/div[2]/div/button[2]'
-                    agree_element = self.driver.find_element(By.XPATH, xpath)
-                    if agree_element:
-                        logger.debug("XPath로 Agree 버튼을 찾았습니다. 클릭합니다.")
-                        agree_element.click()
-                        time.sleep(WAIT_TIMES['after_click'])
-                except NoSuchElementException:
-                    logger.debug("모든 방법으로 Agree 버튼을 찾을 수 없습니다. 다음 단계로 진행합니다.")
+            # 1. Agree 모달과 메인 컨텐츠 중 먼저 나타나는 쪽을 기다림 (모달이 없는 페이지에서 대기하지 않도록)
+            # (모달 유무를 판단하기 위한 대기라 통계에는 기록하지 않고 순서만 반영)
+            candidates = (self.selector_registry.ordered('agree', self.AGREE_LOCATORS)
+                          + self.selector_registry.ordered('main_content', self.MAIN_CONTENT_LOCATORS))
+            with self.metrics.stage('agree_modal') as outcome:
+                locator, element = wait_for_any_element(self.driver, candidates)
+                outcome['ok'] = element is not None
+                if element is not None and locator in self.AGREE_LOCATORS:
+                    logger.debug("Agree 버튼을 찾았습니다. 클릭합니다.")
+                    element.click()
+                    wait_for_element_gone(self.driver, element)
+                else:
+                    logger.debug("Agree 버튼이 없습니다. 다음 단계로 진행합니다.")
 
             # 2. 메인 컨텐츠 체크 및 클릭
-            if not self.click_main_content():
-                logger.debug("메인 컨텐츠를 찾을 수 없습니다.")
-            else:
-                logger.debug("메인 컨텐츠를 성공적으로 클릭했습니다.")
-                time.sleep(WAIT_TIMES['after_click'])
+            previous_url = self.driver.current_url
+            if self.network:
+                # 목록 페이지의 요청이 상세 페이지 결과로 잡히지 않도록 이동 전에 비움
+                self.network.reset()
+            with self.metrics.stage('main_click') as outcome:
+                outcome['ok'] = self.click_main_content()
+                if not outcome['ok']:
+                    logger.debug("메인 컨텐츠를 찾을 수 없습니다.")
+                else:
+                    logger.debug("메인 컨텐츠를 성공적으로 클릭했습니다.")
+                    # 이전 페이지의 이미지를 타이틀 이미지로 오인하지 않도록 페이지 전환을 기다림
+                    wait_for_navigation(self.driver, previous_url, self.TRAILER_PLAYER_LOCATORS)
 
             # 3. 타이틀 이미지 저장 (실패해도 계속 진행)
             try:
                 logger.debug("타이틀 이미지 저장을 시도합니다.")
-                title_image_result = self.get_and_save_title_image()
+                title_image_result = self.get_and_save_title_image(page_url)
                 if title_image_result is None:
                     logger.debug("타이틀 이미지가 이미 존재하여 스킵되었습니다.")
                 elif title_image_result:
@@ -306,124 +423,132 @@ class WebPage:
                 logger.debug(f"타이틀 이미지 저장 중 오류 발생: {str(e)}")
 
             # 4. 트레일러 소스 체크 및 다운로드
-            try:
-                logger.debug("CSS 선택자로 트레일러 소스 시도 중")
-                trailer_element = self.driver.find_element(By.CSS_SELECTOR, SELECTORS['trailer_source'])
-                if trailer_element:
-                    src = trailer_element.get_attribute('src')
-                    if src:
-                        logger.debug(f"트레일러 소스를 찾았습니다: {src}")
-                        if '.mp4' in src:
-                            return self.download_mp4(src)
-                        else:
-                            logger.debug("MP4 파일이 아닙니다. 스킵합니다.")
-                            return None
-            except NoSuchElementException:
-                logger.debug("CSS 선택자로 트레일러 소스를 찾을 수 없습니다. XPath로 시도합니다.")
-
-                # XPath로 백업 시도
-                try:
-                    logger.debug("XPath로 트레일러 소스 시도 중..")
-                    xpath = '//*[@id="__next"]/main/div/div[1]/div/div[1]/div[1]/div/div/div/div[2]/video/source[5]'
-                    trailer_element = self.driver.find_element(By.XPATH, xpath)
-                    if trailer_element:
-                        src = trailer_element.get_attribute('src')
-                        if src:
-                            logger.debug(f"XPath로 트레일러 소스를 찾았습니다: {src}")
-                            if '.mp4' in src:
-                                return self.download_mp4(src)
-                            else:
-                                logger.debug("MP4 파일이 아닙니다. 스킵합니다.")
-                                return None
-                except NoSuchElementException:
-                    logger.debug("XPath로도 트레일러 소스를 찾을 수 없습니다.")
-                    return False
-
-            return None  # 트레일러를 찾지 못한 경우 스킵으로 처리
+            with self.metrics.stage('trailer_lookup') as outcome:
+                src = self.find_trailer_source_url()
+                outcome['ok'] = bool(src)
+            if not src:
+                logger.debug("트레일러 소스를 찾을 수 없습니다.")
+                return False
+
+            if '.mp4' in src:
+                return self.download_mp4(src, page_url)
+
+            logger.debug("MP4 파일이 아닙니다. 스킵합니다.")
+            return None
         except Exception as e:
             logger.error(f"프로세스 실행 중 오류 발생: {str(e)}")
             return False
 
-    def visit_and_process(self, urls):
+    def process_without_browser(self, url):
+        """
+        브라우저 없이 __NEXT_DATA__에서 찾은 미디어 URL로 바로 다운로드합니다.
+        반환값: (처리 여부, do_process와 같은 결과). 트레일러 URL을 찾지 못하면 (False, None)
+        """
+        if not self.media_resolver:
+            return False, None
+
+        with self.metrics.stage('http_resolve', url) as outcome:
+            media = self.media_resolver.resolve(url)
+            outcome['ok'] = bool(media and media['trailer_url'])
+        if not outcome['ok']:
+            logger.debug(f"HTML에서 트레일러를 찾지 못해 브라우저로 처리합니다: {url}")
+            return False, None
+
+        logger.info(f"브라우저 없이 미디어 URL을 찾았습니다: {url}")
+
+        # 타이틀 이미지는 실패해도 계속 진행
+        if media['title_image_url']:
+            try:
+                self.download_title_image(media['title_image_url'], url)
+            except DownloadException as e:
+                logger.debug(f"타이틀 이미지 저장 중 오류 발생: {str(e)}")
+
         try:
-            total_sites = len(urls)
-            trailer_skipped_count = 0
-            trailer_downloaded_count = 0
-            error_count = 0
+            return True, self.download_mp4(media['trailer_url'], url)
+        except DownloadException as e:
+            logger.error(str(e))
+            return True, False
 
-            for url in urls:
-                logger.info(f"\n{url} 사이트 방문을 시작합니다.")
+    def visit_url(self, url):
+        """
+        URL 하나를 방문하여 전체 프로세스를 실행합니다.
+        HTML에서 미디어 URL을 찾으면 브라우저를 사용하지 않고, 실패한 경우에만 Selenium으로 처리합니다.
+        크롤 상태에 이미 완료된 URL은 페이지를 열지 않고 건너뜁니다.
+        반환값은 do_process와 같습니다: True(다운로드), None(스킵), False(에러)
+        """
+        if self.crawl_state.should_skip(url):
+            logger.info(f"이미 처리된 URL입니다. 스킵합니다: {url}")
+            return None
+
+        self.metrics.begin_url(url)
+        self.crawl_state.mark_visited(url)
+        handled, result = self.process_without_browser(url)
+        if not handled:
+            if self.network:
+                self.network.reset()
+            with self.metrics.stage('navigate'):
                 self.driver.get(url)
-                time.sleep(WAIT_TIMES['page_load'])
+                wait_for_page_ready(self.driver)
+
+            logger.info(f"프로세스를 시작합니다.")
+            result = self.do_process(url)
 
-                logger.info(f"프로세스를 시작합니다.")
-                result = self.do_process()
+        if result is False:
+            self.crawl_state.mark_failed(url, "프로세스 실행 실패")
+        elif result is None:
+            # 트레일러가 없는 페이지 (트레일러가 있으면 다운로드 완료 콜백이 상태를 기록)
+            self.crawl_state.mark_done(url)
+        self.metrics.end_url(result)
+        return result
 
-                if result is None:  # 스킵된 경우
-                    trailer_skipped_count += 1
-                    logger.info(f"{url} 트레일러 처리가 스킵되었습니다.")
-                elif result:  # 다운로드 성공
-                    trailer_downloaded_count += 1
-                    logger.info(f"{url} 트레일러 처리가 완료되었습니다.")
-                else:  # 에러 발생
-                    error_count += 1
-                    logger.error(f"{url}에서 프로세스 실행 중 오류가 발생했습니다.")
+    def visit_and_process(self, urls):
+        background_downloads = self.background_downloads
+        # 다운로드는 백그라운드에서 진행하고 브라우저는 바로 다음 페이지로 이동
+        self.background_downloads = True
+        try:
+            stats = ProcessStats(total_sites=len(urls))
+            self.metrics.start_run()
+
+            for index, url in enumerate(urls):
+                logger.info(f"\n{url} 사이트 방문을 시작합니다.")
+                try:
+                    result = self.visit_url(url)
+                except Exception as e:
+                    # 한 사이트의 오류로 전체 실행이 멈추지 않도록 에러로 기록하고 계속 진행
+                    logger.error(f"{url} 처리 중 오류 발생: {str(e)}")
+                    result = False
+                stats.record(url, result)
+
+                # 연결된 브라우저는 직접 다시 띄울 수 없으므로 세션이 죽으면 남은 URL은 에러로 기록하고 중단
+                if result is False and not is_session_alive(self.driver):
+                    logger.error("브라우저 세션이 응답하지 않아 처리를 중단합니다. (장시간 실행은 run 커맨드 사용 권장)")
+                    for remaining_url in urls[index + 1:]:
+                        stats.record(remaining_url, False)
+                    break
+
+            self.download_manager.wait_all()
 
             # 최종 통계 출력
-            logger.info("\n=== 처리 결과 통계 ===")
-            logger.info(f"총 사이트 수: {total_sites}")
-            logger.info(f"트레일러 다운로드 완료: {trailer_downloaded_count}")
-            logger.info(f"트레일러 스킵된 사이트: {trailer_skipped_count}")
-            logger.info(f"에러 발생: {error_count}")
-            logger.info("===================")
+            stats.log_summary()
+            self.download_manager.log_summary()
+            self.metrics.log_summary()
+            self.selector_registry.save()
 
             return True
         except Exception as e:
             logger.error(f"사이트 방문 및 처리 중 오류 발생: {str(e)}")
             return False
+        finally:
+            self.background_downloads = background_downloads
 
     def get_title_image_srcset(self):
         try:
-            # 여러 선택자 시도
-            selectors = [
-                "#__next > main > div > div.BoundingArea__StyledBoundingArea-sc-14t8hgr-0.kTqlJd > div > div.Hero-a7asd6-0.dUZdxD > div.VideoCoverWrapper-n2it0r-0.cYQYBf > div.ProgressiveImage__ImageSizeContainer-ptxr6s-0.ihEUCS > picture > img",
-                "main .Hero-a7asd6-0 .VideoCoverWrapper-n2it0r-0 picture img",  # 더 간단한 선택자
-                "main .VideoCoverWrapper picture img",  # 더 일반적인 선택자
-                "main picture img[srcset]"  # srcset 속성이 있는 이미지
-            ]
-
-            for selector in selectors:
-                try:
-                    logger.debug(f"타이틀 이미지 선택자 시도 중: {selector}")
-                    element = WebDriverWait(self.driver, WAIT_TIMES['element_wait']).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if element:
-                        srcset = element.get_attribute('srcset')
-                        if srcset:
-                            logger.debug(f"요소를 찾았습니다: {selector}")
-                            logger.info(f"타이틀 이미지 srcset: {srcset}")
-                            return srcset
-                        else:
-                            logger.debug(f"srcset 속성이 없습니다: {selector}")
-                except:
-                    continue
-
-            # XPath도 시도
-            try:
-                logger.debug("XPath로 타이틀 이미지 시도 중")
-                element = WebDriverWait(self.driver, WAIT_TIMES['element_wait']).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, '//*[@id="__next"]/main/div/div[1]/div/div[1]/div[2]/div[1]/picture/img'))
-                )
-                if element:
-                    srcset = element.get_attribute('srcset')
-                    if srcset:
-                        logger.debug("XPath로 요소를 찾았습니다")
-                        logger.info(f"타이틀 이미지 srcset: {srcset}")
-                        return srcset
-            except:
-                pass
+            # 모든 후보 선택자를 동시에 기다림
+            locator, srcset = self.wait_for_selector('title_image', self.TITLE_IMAGE_LOCATORS, 'srcset')
+            if srcset:
+                logger.debug(f"요소를 찾았습니다: {locator[1]}")
+                logger.info(f"타이틀 이미지 srcset: {srcset}")
+                return srcset
 
             logger.error("타이틀 이미지를 찾을 수 없습니다.")
             return None
@@ -453,51 +578,46 @@ class WebPage:
             logger.error(f"이미지 URL 추출 중 오류 발생: {str(e)}")
             return None
 
-    def download_title_image(self, url):
+    def download_title_image(self, url, page_url=None):
         """
         타이틀 이미지를 다운로드합니다.
         """
-        try:
-            parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            download_dir = self.get_download_dir('title_image')
-            self.ensure_download_dir(download_dir)
-            filepath = os.path.join(download_dir, filename)
-            
-            if os.path.exists(filepath):
-                logger.info(f"이미지 파일이 이미 존재합니다. 스킵합니다: {filename}")
-                return None  # 스킵된 경우
-            
-            logger.info(f"이미지 다운로드 시작: {filename}")
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            logger.info(f"이미지 다운로드 완료: {filepath}")
-            return True
-        except Exception as e:
-            raise DownloadException(f"이미지 다운로드 중 오류 발생: {str(e)}")
+        download_dir = self.get_download_dir('title_image')
+        on_complete = self._track_media(page_url, 'image', url)
+        return self.download_manager.fetch(url, download_dir, background=self.background_downloads, on_complete=on_complete)
 
-    def get_and_save_title_image(self):
+    def find_title_image_url(self):
+        """
+        고해상도 타이틀 이미지 URL을 찾습니다. 찾지 못하면 None을 반환합니다.
+        """
+        # 브라우저가 4K 후보를 요청했다면 srcset 탐색 없이 사용 (보통은 화면 크기에 맞는 후보만 요청)
+        image_url = self.network.find_url(self.TITLE_IMAGE_URL_PATTERN) if self.network else None
+        if image_url:
+            logger.info(f"네트워크 요청에서 타이틀 이미지 URL을 찾았습니다: {image_url}")
+            return image_url
+
+        srcset = self.get_title_image_srcset()
+        if not srcset:
+            logger.error("srcset을 가져올 수 없습니다.")
+            return None
+
+        image_url = self.extract_high_res_image_url(srcset)
+        if not image_url:
+            logger.error("이미지 URL을 추출할 수 없습니다.")
+        return image_url
+
+    def get_and_save_title_image(self, page_url=None):
         """
         타이틀 이미지를 가져와서 저장합니다.
         """
         try:
-            srcset = self.get_title_image_srcset()
-            if not srcset:
-                logger.error("srcset을 가져올 수 없습니다.")
-                return False
-
-            image_url = self.extract_high_res_image_url(srcset)
+            with self.metrics.stage('srcset_lookup') as outcome:
+                image_url = self.find_title_image_url()
+                outcome['ok'] = bool(image_url)
             if not image_url:
-                logger.error("이미지 URL을 추출할 수 없습니다.")
                 return False
 
-            result = self.download_title_image(image_url)
+            result = self.download_title_image(image_url, page_url)
             if result is None:
                 logger.info("이미지가 이미 존재하여 스킵되었습니다.")
                 return None
@@ -512,56 +632,60 @@ class WebPage:
             logger.error(f"타이틀 이미지 저장 중 오류 발생: {str(e)}")
             return False
 
+    # 후보 선택자를 순서대로 시도해 썸네일 링크 href를 한 번의 스크립트 실행으로 가져옴
+    COLLECT_HREFS_SCRIPT = """
+        for (const selector of arguments[0]) {
+            const hrefs = Array.from(document.querySelectorAll(selector), a => a.href).filter(Boolean);
+            if (hrefs.length) return hrefs;
+        }
+        return [];
+    """
+
     def collect_video_hrefs(self, base_url):
         """
         비디오 목록에서 href를 수집합니다.
         """
         try:
-            hrefs = []
-            
-            # 1부터 12까지 각 아이템을 체크
-            for i in range(1, 13):
-                try:
-                    # 각 그리드 아이템의 선택자
-                    item_selector = f"#__next > main > div > div.videos__SidebarAndVideoList-sc-1u2b7uh-1.kvnDtB > div.videos__StyledVideoListContainer-sc-1u2b7uh-3.lgqsma > div > div:nth-child({i})"
-                    
-                    # 아이템이 존재하는지 확인
-                    item_element = self.driver.find_element(By.CSS_SELECTOR, item_selector)
-                    if item_element:
-                        # 해당 아이템 내의 a 태그 찾기
-                        link_selector = f"{item_selector} > div > div.VideoThumbnailPreview__Container-sc-1l0c3o7-7.lhLsZD > a"
-                        try:
-                            link_element = item_element.find_element(By.CSS_SELECTOR, "div > div.VideoThumbnailPreview__Container-sc-1l0c3o7-7.lhLsZD > a")
-                            href = link_element.get_attribute('href')
-                            
-                            if href:
-                                # 상대 경로인 경우 도메인 추가
-                                if href.startswith('/'):
-                                    # base_url에서 도메인 추출
-                                    from urllib.parse import urlparse
-                                    parsed_base = urlparse(base_url)
-                                    full_url = f"{parsed_base.scheme}://{parsed_base.netloc}{href}"
-                                else:
-                                    full_url = href
-                                
-                                hrefs.append(full_url)
-                                logger.debug(f"href 수집 완료 ({i}): {full_url}")
-                            
-                        except NoSuchElementException:
-                            logger.debug(f"아이템 {i}에서 링크를 찾을 수 없습니다.")
-                            continue
-                            
-                except NoSuchElementException:
-                    logger.debug(f"아이템 {i}를 찾을 수 없습니다.")
-                    continue
-            
+            raw_hrefs = self.driver.execute_script(self.COLLECT_HREFS_SCRIPT, SELECTORS['video_links'])
+
+            # a.href는 절대 URL이지만 혹시 모를 상대 경로는 base_url 기준으로 변환, 순서 유지하며 중복 제거
+            hrefs = list(dict.fromkeys(urljoin(base_url, href) for href in raw_hrefs))
+            for href in hrefs:
+                logger.debug(f"href 수집 완료: {href}")
+
             logger.info(f"총 {len(hrefs)}개의 href를 수집했습니다.")
             return hrefs
-            
+
         except Exception as e:
             logger.error(f"href 수집 중 오류 발생: {str(e)}")
             return []
 
+    def fetch_listing_hrefs(self, page_url):
+        """
+        브라우저로 목록 페이지를 열고 썸네일 링크를 수집합니다. (자동 수집의 브라우저 대체 경로)
+        """
+        if self.network:
+            self.network.reset()
+        self.driver.get(page_url)
+        wait_for_page_ready(self.driver)
+        wait_for_any_element(self.driver, [(By.CSS_SELECTOR, selector) for selector in SELECTORS['video_links']])
+        return self.collect_video_hrefs(page_url)
+
+    def crawl_and_save_hrefs(self, base_url):
+        """
+        base_url부터 목록 페이지를 자동으로 넘기며 href를 수집하고 페이지마다 크롤 상태 저장소에 저장합니다.
+        반환값: 새로 수집한 href 수
+        """
+        self.crawl_state.import_legacy_hrefs(f"hrefs_{self.get_domain_name(base_url)}.json")
+        crawler = ListingCrawler(
+            session=self.download_manager.session,
+            fallback_fetch=self.fetch_listing_hrefs,
+            is_known=self.crawl_state.is_known if CRAWL_CONFIG['stop_when_known'] else None
+        )
+        hrefs = crawler.crawl(base_url, on_page=lambda page, new_hrefs: self.crawl_state.add_discovered(new_hrefs))
+        logger.info(f"자동 수집 완료: 새 href {len(hrefs)}개, 도메인 전체 상태: {self.crawl_state.count_by_status(urlparse(base_url).netloc)}")
+        return len(hrefs)
+
     def get_domain_name(self, url):
         """
         URL에서 도메인명을 추출합니다.
@@ -578,82 +702,31 @@ class WebPage:
             logger.error(f"도메인명 추출 중 오류 발생: {str(e)}")
             return "unknown"
 
-    def load_existing_hrefs(self, filename):
+    def save_hrefs(self, new_hrefs, base_url):
         """
-        기존 JSON 파일에서 href 목록을 로드합니다.
+        수집된 href를 크롤 상태 저장소에 추가합니다. (이미 있는 URL은 상태를 유지)
+        예전 hrefs_<domain>.json 파일이 있으면 처음 한 번 함께 가져옵니다.
         """
         try:
-            if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('hrefs', []), data
-            else:
-                logger.debug(f"기존 파일이 없습니다: {filename}")
-                return [], {}
-        except Exception as e:
-            logger.error(f"기존 JSON 파일 로드 중 오류 발생: {str(e)}")
-            return [], {}
+            legacy_file = f"hrefs_{self.get_domain_name(base_url)}.json"
+            self.crawl_state.import_legacy_hrefs(legacy_file)
 
-    def save_hrefs_to_json(self, new_hrefs, base_url, filename=None):
-        """
-        수집된 href를 JSON 파일로 저장합니다. (중복 제거 및 병합)
-        """
-        try:
-            # 도메인명 추출
-            domain_name = self.get_domain_name(base_url)
-            
-            # 파일명 생성
-            if not filename:
-                filename = f"hrefs_{domain_name}.json"
-            
-            # 기존 데이터 로드
-            existing_hrefs, existing_data = self.load_existing_hrefs(filename)
-            
-            # 중복 제거를 위해 set 사용
-            existing_hrefs_set = set(existing_hrefs)
-            new_hrefs_set = set(new_hrefs)
-            
-            # 새로운 href만 추출 (중복 제거)
-            unique_new_hrefs = new_hrefs_set - existing_hrefs_set
-            
-            # 전체 href 목록 생성 (기존 + 새로운)
-            all_hrefs = existing_hrefs + list(unique_new_hrefs)
-            
-            # 데이터 구성
-            data = {
-                "domain": base_url,
-                "last_updated": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_count": len(all_hrefs),
-                "new_added_count": len(unique_new_hrefs),
-                "hrefs": all_hrefs
-            }
-            
-            # 기존 데이터가 있으면 생성 시간 유지
-            if existing_data and "created_at" in existing_data:
-                data["created_at"] = existing_data["created_at"]
-            else:
-                data["created_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # JSON 파일로 저장
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # 결과 로깅
-            if len(unique_new_hrefs) > 0:
-                logger.info(f"href 목록이 {filename}에 저장되었습니다.")
-                logger.info(f"기존: {len(existing_hrefs)}개, 새로 추가: {len(unique_new_hrefs)}개, 총: {len(all_hrefs)}개")
+            new_count = self.crawl_state.add_discovered(new_hrefs)
+            if new_count > 0:
+                counts = self.crawl_state.count_by_status(urlparse(base_url).netloc)
+                logger.info(f"새로 추가: {new_count}개, 도메인 전체 상태: {counts}")
             else:
                 logger.info(f"새로운 href가 없습니다. 모든 링크가 이미 수집되어 있습니다.")
-            
-            return True, len(unique_new_hrefs)
-            
+
+            return True, new_count
+
         except Exception as e:
-            logger.error(f"JSON 파일 저장 중 오류 발생: {str(e)}")
+            logger.error(f"href 저장 중 오류 발생: {str(e)}")
             return False, 0
 
     def collect_and_save_hrefs(self, base_url):
         """
-        href를 수집하고 JSON 파일로 저장합니다.
+        href를 수집하고 크롤 상태 저장소에 저장합니다.
         """
         try:
             # href 수집
@@ -663,8 +736,8 @@ class WebPage:
                 logger.warning("수집된 href가 없습니다.")
                 return False
             
-            # JSON 파일로 저장 (도메인별, 중복 제거)
-            success, new_count = self.save_hrefs_to_json(hrefs, base_url)
+            # 크롤 상태 저장소에 추가 (중복 제거)
+            success, new_count = self.save_hrefs(hrefs, base_url)
             
             if success:
                 logger.info(f"href 수집 완료: 총 {len(hrefs)}개 수집, {new_count}개 새로 추가")
@@ -691,9 +764,13 @@ class CommandHandler:
             'trailer': self.handle_trailer_source,
             'do_process': self.handle_do_process,
             'do_all': self.handle_do_all,
+            'do_pending': self.handle_do_pending,
+            'do_all_parallel': self.handle_do_all_parallel,
             'title_image': self.handle_title_image,
             'save_title_image': self.handle_save_title_image,
             'collect_hrefs': self.handle_collect_hrefs,
+            'crawl_hrefs': self.handle_crawl_hrefs,
+            'selector_report': self.handle_selector_report,
             'quit': self.handle_quit
         }
 
@@ -759,34 +836,60 @@ class CommandHandler:
         else:
             print("메인 컨텐츠 클릭 또는 트레일러 다운로드에 실패했습니다.")
 
+    def load_target_urls(self, target_file=TARGET_FILE):
+        return load_target_urls(target_file)
+
     def handle_do_all(self):
         try:
-            if not os.path.exists(TARGET_FILE):
-                logger.error(f"{TARGET_FILE} 파일을 찾을 수 없습니다.")
+            urls = self.load_target_urls()
+            if not urls:
                 return True
 
-            with open(TARGET_FILE, 'r') as f:
-                try:
-                    data = json.load(f)
-                    urls = data.get('sites', [])
+            logger.info(f"총 {len(urls)}개의 사이트를 처리합니다.")
+            if self.web_page.visit_and_process(urls):
+                logger.info("모든 사이트 처리가 성공적으로 완료되었습니다.")
+            else:
+                logger.error("일부 사이트 처리 중 오류가 발생했습니다.")
 
-                    if not urls:
-                        logger.error(f"{TARGET_FILE} 파일에 sites 목록이 비어있습니다.")
-                        return True
+        except Exception as e:
+            logger.error(f"파일 처리 중 오류 발생: {str(e)}")
+            return True
+
+        return True
 
-                    logger.info(f"총 {len(urls)}개의 사이트를 처리합니다.")
-                    if self.web_page.visit_and_process(urls):
-                        logger.info("모든 사이트 처리가 성공적으로 완료되었습니다.")
-                    else:
-                        logger.error("일부 사이트 처리 중 오류가 발생했습니다.")
+    def handle_do_all_parallel(self):
+        """
+        타겟 사이트를 여러 헤드리스 브라우저로 동시에 처리합니다.
+        현재 연결된 브라우저는 사용하지 않고 워커마다 새 인스턴스를 띄웁니다.
+        """
+        try:
+            urls = self.load_target_urls()
+            if not urls:
+                return True
 
-                except json.JSONDecodeError:
-                    logger.error(f"{TARGET_FILE} 파일의 JSON 형식이 올바르지 않습니다.")
-                    return True
+            run_parallel(self.web_page, urls)
 
         except Exception as e:
-            logger.error(f"파일 처리 중 오류 발생: {str(e)}")
-            return True
+            logger.error(f"병렬 처리 중 오류 발생: {str(e)}")
+
+        return True
+
+    def handle_do_pending(self):
+        """
+        collect_hrefs로 수집했지만 아직 처리되지 않은 URL을 처리합니다.
+        """
+        try:
+            urls = self.web_page.crawl_state.pending_urls()
+            if not urls:
+                print("처리할 URL이 없습니다.")
+                return True
+
+            logger.info(f"크롤 상태 저장소의 미처리 URL {len(urls)}개를 처리합니다.")
+            self.web_page.visit_and_process(urls)
+            logger.info(f"크롤 상태: {self.web_page.crawl_state.count_by_status()}")
+
+        except Exception as e:
+            logger.error(f"미처리 URL 처리 중 오류 발생: {str(e)}")
 
         return True
 
@@ -823,6 +926,25 @@ class CommandHandler:
             logger.error(f"href 수집 처리 중 오류 발생: {str(e)}")
             print("href 수집 중 오류가 발생했습니다.")
 
+    def handle_crawl_hrefs(self):
+        """
+        현재 목록 페이지부터 마지막 페이지까지 자동으로 넘기며 href를 수집합니다.
+        """
+        try:
+            current_url = self.web_page.driver.current_url
+            logger.info(f"목록 페이지 자동 수집을 시작합니다: {current_url}")
+            new_count = self.web_page.crawl_and_save_hrefs(current_url)
+            print(f"자동 수집이 완료되었습니다. 새로 수집한 href: {new_count}개")
+
+        except Exception as e:
+            logger.error(f"자동 수집 중 오류 발생: {str(e)}")
+            print("자동 수집 중 오류가 발생했습니다.")
+
+    def handle_selector_report(self):
+        self.web_page.selector_registry.save()
+        stale = self.web_page.selector_registry.log_report()
+        print(f"선택자 통계를 출력했습니다. 점검이 필요한 선택자: {len(stale)}개")
+
     def handle_quit(self):
         return True
 
@@ -835,19 +957,190 @@ class CommandHandler:
             return False
 
 
-def main():
+def load_target_urls(target_file=TARGET_FILE):
+    """
+    타겟 파일에서 sites 목록을 읽습니다. 읽을 수 없으면 None을 반환합니다.
+    """
+    if not os.path.exists(target_file):
+        logger.error(f"{target_file} 파일을 찾을 수 없습니다.")
+        return None
+
+    with open(target_file, 'r') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            logger.error(f"{target_file} 파일의 JSON 형식이 올바르지 않습니다.")
+            return None
+
+    urls = data.get('sites', [])
+    if not urls:
+        logger.error(f"{target_file} 파일에 sites 목록이 비어있습니다.")
+        return None
+
+    return urls
+
+
+def process_urls_without_browser(web_page, urls, stats):
+    """
+    브라우저 없이 URL들을 동시에 처리하고, HTML에서 미디어를 찾지 못한 URL 목록을 반환합니다.
+    """
+    if not web_page.media_resolver:
+        return urls
+
+    crawl_state = web_page.crawl_state
+    metrics = web_page.metrics
+    for url in urls:
+        crawl_state.mark_visited(url)
+
+    def process(url):
+        # 브라우저로 넘어가는 URL은 워커의 visit_url에서 페이지 이벤트를 기록
+        metrics.begin_url(url)
+        handled, result = web_page.process_without_browser(url)
+        if handled:
+            metrics.end_url(result)
+        return handled, result
+
+    handled_count = 0
+    remaining = []
+    with ThreadPoolExecutor(max_workers=RESOLVER_CONFIG['workers']) as executor:
+        results = executor.map(process, urls)
+        for url, (handled, result) in zip(urls, results):
+            if handled:
+                handled_count += 1
+                stats.record(url, result)
+                if result is False:
+                    crawl_state.mark_failed(url, "다운로드 실패")
+            else:
+                remaining.append(url)
+
+    logger.info(f"브라우저 없이 {handled_count}개 처리, 브라우저로 처리할 사이트 {len(remaining)}개")
+    return remaining
+
+
+def run_parallel(web_page, urls, workers=None):
+    """
+    이미 처리된 URL 제외 → HTML만으로 처리 → 남은 URL은 브라우저 워커 풀 순서로 처리하고 전체 통계를 반환합니다.
+    web_page의 다운로드 매니저와 크롤 상태는 모든 워커가 공유합니다. (커넥션 풀과 동시 다운로드 수 제한 공유)
+    """
+    crawl_state = web_page.crawl_state
+    download_manager = web_page.download_manager
+    stats = ProcessStats(total_sites=len(urls))
+    web_page.metrics.start_run()
+
+    # 1. 이미 처리된 URL은 HTML 요청이나 브라우저 없이 제외
+    pending = crawl_state.filter_pending(urls)
+    if len(pending) < len(urls):
+        logger.info(f"이미 처리된 {len(urls) - len(pending)}개의 사이트를 건너뜁니다.")
+        pending_set = set(pending)
+        for url in urls:
+            if url not in pending_set:
+                stats.record(url, None)
+
+    # 2. HTML만으로 처리할 수 있는 URL을 먼저 동시에 처리
+    remaining = process_urls_without_browser(web_page, pending, stats) if pending else []
+
+    # 3. 남은 URL만 브라우저 워커로 처리 (없으면 브라우저를 띄우지 않음)
+    if remaining:
+        pool = ScrapeWorkerPool(functools.partial(create_worker_page, download_manager, crawl_state), workers=workers)
+        pool.run(remaining, stats)
+
+    download_manager.wait_all()
+    stats.log_summary()
+    download_manager.log_summary()
+    web_page.metrics.log_summary()
+    web_page.selector_registry.save()
+    return stats
+
+
+def create_worker_page(download_manager=None, crawl_state=None):
+    """
+    워커 풀용 WebPage와 종료 함수를 생성합니다.
+    """
+    browser_manager = BrowserManager()
+    driver = browser_manager.create_browser(headless=WORKER_CONFIG['headless'])
+    # HTML 탐색은 워커 풀에 넘기기 전에 이미 시도했으므로 브라우저로만 처리
+    web_page = WebPage(driver, download_manager, background_downloads=True, resolve_without_browser=False,
+                       crawl_state=crawl_state, network=browser_manager.network)
+    return web_page, driver.quit
+
+
+# run 커맨드 종료 코드
+EXIT_OK = 0  # 모든 사이트 처리 성공 (스킵 포함)
+EXIT_FATAL = 1  # 타겟을 읽을 수 없거나 실행 중 예외 발생
+EXIT_PARTIAL = 2  # 일부 사이트 또는 다운로드 실패
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="트레일러 스크래퍼. 커맨드 없이 실행하면 기존 Chrome 세션에 연결하는 대화형 모드로 동작합니다."
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='타겟 사이트를 대화 없이 일괄 처리합니다')
+    run_parser.add_argument('--targets', default=TARGET_FILE, help=f'sites 목록 JSON 파일 (기본값: {TARGET_FILE})')
+    run_parser.add_argument('-w', '--workers', type=int, default=WORKER_CONFIG['workers'], help='브라우저 워커 수')
+    run_parser.add_argument('--headless', action=argparse.BooleanOptionalAction, default=WORKER_CONFIG['headless'],
+                            help='워커 브라우저를 헤드리스로 실행')
+    run_parser.add_argument('--block-resources', action=argparse.BooleanOptionalAction,
+                            default=BROWSER_CONFIG['block_resources'], help='이미지/웹폰트/미디어 로딩 차단')
+    run_parser.add_argument('--http-resolver', action=argparse.BooleanOptionalAction,
+                            default=RESOLVER_CONFIG['enabled'], help='브라우저 없이 __NEXT_DATA__에서 먼저 탐색')
+    return parser.parse_args(argv)
+
+
+def run_batch(args):
+    """
+    스케줄러/서버에서 실행하기 위한 비대화형 일괄 처리. 결과에 따라 종료 코드를 반환합니다.
+    """
+    WORKER_CONFIG['headless'] = args.headless
+    BROWSER_CONFIG['block_resources'] = args.block_resources
+
+    urls = load_target_urls(args.targets)
+    if not urls:
+        return EXIT_FATAL
+
+    download_manager = DownloadManager()
+    crawl_state = CrawlState()
+    # 브라우저는 HTML로 처리하지 못한 URL이 있을 때만 워커 풀에서 띄웁니다
+    web_page = WebPage(None, download_manager, background_downloads=True,
+                       resolve_without_browser=args.http_resolver, crawl_state=crawl_state)
+
+    try:
+        logger.info(f"총 {len(urls)}개의 사이트를 처리합니다. (워커 {args.workers}개, 헤드리스 {args.headless})")
+        stats = run_parallel(web_page, urls, workers=args.workers)
+    except Exception as e:
+        logger.error(f"일괄 처리 중 오류 발생: {str(e)}")
+        return EXIT_FATAL
+    finally:
+        download_manager.close()
+        crawl_state.close()
+        web_page.metrics.close()
+
+    # 사이트 개편으로 맞지 않게 된 선택자가 있으면 실행 로그에 남김
+    if web_page.selector_registry.stale_selectors():
+        web_page.selector_registry.log_report()
+
+    if stats.error_count or download_manager.failed_count:
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def run_interactive():
+    """
+    기존 Chrome 세션에 연결해 커맨드를 입력받는 대화형 모드.
+    """
     try:
         # 브라우저 초기화
         browser_manager = BrowserManager()
         driver, _ = browser_manager.create_or_attach_browser()
 
         # 웹페이지 및 명령어 핸들러 초기화
-        web_page = WebPage(driver)
+        web_page = WebPage(driver, network=browser_manager.network)
         command_handler = CommandHandler(web_page)
 
         # 메인 루프
         while True:
-            command = input("명령어를 입력하세요 (title/bar/login/loginbtn/agree/agreebtn/main/trailer/do_process/do_all/title_image/save_title_image/collect_hrefs/quit): ")
+            command = input("명령어를 입력하세요 (title/bar/login/loginbtn/agree/agreebtn/main/trailer/do_process/do_all/do_all_parallel/do_pending/title_image/save_title_image/collect_hrefs/crawl_hrefs/selector_report/quit): ")
             if command_handler.execute_command(command):
                 break
 
@@ -858,6 +1151,14 @@ def main():
     return 0
 
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        return run_batch(args)
+
+    return run_interactive()
+
+
 if __name__ == "__main__":
-    exit(main())
+    sys.exit(main())
 
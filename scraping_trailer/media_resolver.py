@@ -0,0 +1,160 @@
+import json
+import re
+from collections import deque
+from urllib.parse import urljoin, urlparse, unquote
+
+import requests
+
+from config import RESOLVER_CONFIG
+from logger import logger
+
+
+class MediaResolver:
+    """
+    브라우저 없이 페이지 HTML만 받아 트레일러/타이틀 이미지 URL을 찾는 리졸버.
+    대상 사이트는 Next.js 앱이므로 렌더링 결과에 쓰이는 데이터가 __NEXT_DATA__ JSON에 그대로 들어 있습니다.
+    JSON 구조가 바뀌어도 동작하도록 특정 경로 대신 문자열 값에서 URL 패턴을 찾되,
+    관련/추천 영상의 미디어가 섞이지 않도록 페이지 URL의 slug/id와 일치하는 영상 객체 안에서만 찾습니다.
+    """
+
+    NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+    MP4_PATTERN = re.compile(r'(?:https?:)?//[^\s"\'<>,]+?\.mp4(?:\?[^\s"\'<>,]*)?')
+    # extract_high_res_image_url과 같은 기준 (srcset 문자열 안에 섞여 있어도 추출)
+    TITLE_IMAGE_PATTERN = re.compile(r'(?:https?:)?//[^\s"\'<>,]+?_3840x2160\.webp')
+    RESOLUTION_PATTERN = re.compile(r'(\d{3,4})p')
+    # 영상 객체를 식별하는 키 (페이지 URL의 마지막 경로 또는 Next.js 라우트 파라미터와 비교)
+    ID_KEYS = ('slug', 'id', 'videoId', 'video_id', 'uuid', 'handle')
+
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
+
+    def fetch_next_data(self, url):
+        """
+        페이지의 __NEXT_DATA__ JSON을 반환합니다. 받을 수 없거나 없으면 None을 반환합니다.
+        """
+        try:
+            response = self.session.get(
+                url,
+                headers={
+                    'User-Agent': RESOLVER_CONFIG['user_agent'],
+                    # 다운로드 세션은 Range 때문에 압축을 끄므로 HTML 요청에서만 다시 허용
+                    'Accept-Encoding': 'gzip, deflate'
+                },
+                timeout=RESOLVER_CONFIG['timeout']
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.debug(f"페이지 HTML을 가져올 수 없습니다 ({url}): {str(e)}")
+            return None
+
+        match = self.NEXT_DATA_PATTERN.search(response.text)
+        if not match:
+            logger.debug(f"__NEXT_DATA__를 찾을 수 없습니다: {url}")
+            return None
+
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError as e:
+            logger.debug(f"__NEXT_DATA__ JSON 파싱 실패 ({url}): {str(e)}")
+            return None
+
+    def resolve(self, url):
+        """
+        트레일러와 타이틀 이미지 URL을 찾습니다.
+        반환값: {'trailer_url': ..., 'title_image_url': ...} (찾지 못한 값은 None), 페이지 데이터가 없으면 None
+        """
+        data = self.fetch_next_data(url)
+        if data is None:
+            return None
+
+        identifiers = self._page_identifiers(data, url)
+        video = self._find_page_video(data, identifiers)
+        if video is None:
+            logger.debug(f"__NEXT_DATA__에서 페이지의 영상 객체를 찾을 수 없습니다: {url}")
+            return None
+
+        trailer_urls = []
+        title_image_url = None
+        for value in self._iter_own_strings(video, identifiers):
+            for match in self.MP4_PATTERN.findall(value):
+                trailer_urls.append(urljoin(url, match))
+            if title_image_url is None:
+                match = self.TITLE_IMAGE_PATTERN.search(value)
+                if match:
+                    title_image_url = urljoin(url, match.group(0))
+
+        media = {
+            'trailer_url': self._pick_trailer(trailer_urls),
+            'title_image_url': title_image_url
+        }
+        logger.debug(f"__NEXT_DATA__에서 찾은 미디어: {media}")
+        return media
+
+    def _page_identifiers(self, data, url):
+        """페이지 URL의 마지막 경로와 Next.js 라우트 파라미터(query) 중 식별자 값을 반환합니다."""
+        identifiers = set()
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        if segments:
+            identifiers.add(unquote(segments[-1]))
+        query = data.get('query') if isinstance(data, dict) else None
+        if isinstance(query, dict):
+            identifiers.update(str(query[key]) for key in self.ID_KEYS if isinstance(query.get(key), (str, int)))
+        return identifiers
+
+    def _identifier(self, value):
+        """dict의 식별자 값 목록 (문자열/숫자만)"""
+        return [str(value[key]) for key in self.ID_KEYS if isinstance(value.get(key), (str, int))]
+
+    def _find_page_video(self, data, identifiers):
+        """
+        pageProps(없으면 전체 데이터)를 넓이 우선으로 탐색해 식별자가 페이지 URL과 일치하는 첫 객체를 반환합니다.
+        """
+        props = data.get('props', {}) if isinstance(data, dict) else {}
+        root = props.get('pageProps', data) if isinstance(props, dict) else data
+        queue = deque([root])
+        while queue:
+            value = queue.popleft()
+            if isinstance(value, dict):
+                if any(identifier in identifiers for identifier in self._identifier(value)):
+                    return value
+                queue.extend(value.values())
+            elif isinstance(value, list):
+                queue.extend(value)
+        return None
+
+    def _iter_own_strings(self, video, identifiers):
+        """
+        영상 객체의 문자열 값을 순회합니다.
+        식별자가 다른 하위 객체 중 .mp4를 포함한 것(관련/추천 영상)은 건너뜁니다.
+        """
+        stack = [video]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                yield value
+            elif isinstance(value, dict):
+                if value is not video and self._is_other_video(value, identifiers):
+                    continue
+                stack.extend(reversed(list(value.values())))
+            elif isinstance(value, list):
+                stack.extend(reversed(value))
+
+    def _is_other_video(self, value, identifiers):
+        own_ids = self._identifier(value)
+        if not own_ids or any(identifier in identifiers for identifier in own_ids):
+            return False
+        return '.mp4' in json.dumps(value)
+
+    def _pick_trailer(self, urls):
+        """
+        여러 화질이 있으면 URL에 표시된 해상도(예: 1080p)가 가장 높은 것을 선택합니다.
+        해상도 표시가 없으면 처음 나온 URL을 사용합니다.
+        """
+        if not urls:
+            return None
+
+        def resolution(url):
+            values = [int(value) for value in self.RESOLUTION_PATTERN.findall(url)]
+            return max(values) if values else 0
+
+        return max(urls, key=resolution)
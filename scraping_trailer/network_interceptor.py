@@ -0,0 +1,98 @@
+import json
+import re
+
+from selenium.common.exceptions import WebDriverException
+
+from config import NETWORK_CONFIG
+from logger import logger
+
+
+class NetworkInterceptor:
+    """
+    CDP로 브라우저의 네트워크 요청을 차단하고, 요청 이벤트에서 미디어 URL을 수집합니다.
+    - Network.setBlockedURLs로 이미지/미디어/폰트/서드파티 도메인 요청을 차단
+    - performance 로그의 Network.requestWillBeSent 이벤트에서 URL 수집
+      (차단된 요청도 이벤트는 발생하므로 .mp4를 받지 않고도 URL을 알 수 있음)
+    """
+
+    IMAGE_PATTERNS = ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*']
+    MEDIA_PATTERNS = ['*.mp4*', '*.webm*', '*.m3u8*', '*.m4s*', '*.mp3*']
+    FONT_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*']
+
+    LOGGING_PREFS = {'performance': 'ALL'}
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.capture_enabled = NETWORK_CONFIG['capture']
+        self._urls = []
+
+    @classmethod
+    def configure_options(cls, chrome_options):
+        """요청 이벤트를 수집할 수 있도록 브라우저 시작 전에 performance 로그를 켭니다."""
+        if NETWORK_CONFIG['enabled'] and NETWORK_CONFIG['capture']:
+            chrome_options.set_capability('goog:loggingPrefs', cls.LOGGING_PREFS)
+
+    def blocked_patterns(self):
+        patterns = []
+        if NETWORK_CONFIG['block_images']:
+            patterns += self.IMAGE_PATTERNS
+        if NETWORK_CONFIG['block_media']:
+            patterns += self.MEDIA_PATTERNS
+        if NETWORK_CONFIG['block_fonts']:
+            patterns += self.FONT_PATTERNS
+        patterns += [f"*{domain}*" for domain in NETWORK_CONFIG['blocked_domains']]
+        return patterns
+
+    def enable(self):
+        """네트워크 차단 규칙을 적용합니다. 실패해도 스크래핑은 차단 없이 계속 진행합니다."""
+        if not NETWORK_CONFIG['enabled']:
+            return False
+
+        patterns = self.blocked_patterns()
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            logger.info(f"네트워크 차단 규칙 {len(patterns)}개를 적용했습니다.")
+            return True
+        except WebDriverException as e:
+            logger.warning(f"네트워크 차단을 적용할 수 없습니다: {str(e)}")
+            return False
+
+    def _drain(self):
+        """performance 로그를 읽어 요청 URL을 버퍼에 추가합니다."""
+        if not self.capture_enabled:
+            return
+
+        try:
+            entries = self.driver.get_log('performance')
+        except WebDriverException as e:
+            # loggingPrefs 없이 시작된 브라우저 (예: 이미 실행 중인 세션에 연결)
+            logger.debug(f"네트워크 이벤트를 읽을 수 없어 수집을 끕니다: {str(e)}")
+            self.capture_enabled = False
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            if message.get('method') == 'Network.requestWillBeSent':
+                url = message.get('params', {}).get('request', {}).get('url')
+                if url:
+                    self._urls.append(url)
+
+    def reset(self):
+        """지금까지의 요청을 버립니다. 새 페이지로 이동하기 직전에 호출해 이전 페이지의 URL과 섞이지 않게 합니다."""
+        self._drain()
+        self._urls = []
+
+    def find_url(self, pattern):
+        """
+        수집된 요청 URL 중 pattern(정규식)과 일치하는 마지막 URL을 반환합니다. 없으면 None.
+        """
+        self._drain()
+        regex = re.compile(pattern)
+        for url in reversed(self._urls):
+            if regex.search(url):
+                return url
+        return None
@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import METRICS_CONFIG
+from logger import logger
+
+
+def percentile(sorted_values, ratio):
+    """정렬된 값에서 nearest-rank 방식으로 백분위 값을 구합니다."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(ratio * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ScrapeMetrics:
+    """
+    URL마다 단계별 소요 시간(이동, Agree 모달, 메인 클릭, srcset/트레일러 탐색, 다운로드)을 기록합니다.
+    - 모든 이벤트를 JSONL 파일에 한 줄씩 기록 (느린 실행의 원인을 사후에 분석할 수 있도록)
+    - 실행이 끝나면 단계별 p50/p90/p99와 다운로드 처리량(bytes/sec) 요약 출력
+    여러 워커 스레드가 함께 사용하며, 현재 처리 중인 URL은 스레드별로 관리합니다.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, events_file=None, enabled=None):
+        self.enabled = METRICS_CONFIG['enabled'] if enabled is None else enabled
+        self.events_file = events_file or METRICS_CONFIG['events_file']
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        self.start_run()
+
+    @classmethod
+    def default(cls):
+        """WebPage와 다운로드 매니저가 함께 쓰는 기본 인스턴스"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def start_run(self):
+        """요약 집계를 새로 시작합니다. (이벤트 파일은 계속 이어서 기록)"""
+        with self._lock:
+            self._durations = {}
+            self._throughputs = []
+            self._page_results = {}
+            self._run_started = time.monotonic()
+
+    def _write(self, event):
+        if not self.enabled:
+            return
+        event = {'ts': time.strftime("%Y-%m-%dT%H:%M:%S"), **event}
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.events_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # 줄 단위 버퍼링: 실행 중에도 tail -f 로 확인 가능
+                self._file = open(self.events_file, 'a', encoding='utf-8', buffering=1)
+            self._file.write(line)
+
+    def begin_url(self, url):
+        """현재 스레드가 처리하는 URL을 설정합니다. 이후 stage 이벤트에 이 URL이 기록됩니다."""
+        self._local.url = url
+        self._local.started = time.monotonic()
+
+    def current_url(self):
+        return getattr(self._local, 'url', None)
+
+    def end_url(self, result):
+        """URL 처리 결과와 전체 소요 시간을 기록합니다. result: do_process 반환값"""
+        url = self.current_url()
+        elapsed = time.monotonic() - getattr(self._local, 'started', time.monotonic())
+        status = 'skipped' if result is None else ('downloaded' if result else 'error')
+        self._add_duration('page_total', elapsed)
+        with self._lock:
+            self._page_results[status] = self._page_results.get(status, 0) + 1
+        self._write({'type': 'page', 'url': url, 'result': status, 'seconds': round(elapsed, 3)})
+        self._local.url = None
+
+    def _add_duration(self, stage, seconds):
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def stage(self, name, url=None):
+        """
+        with 블록의 소요 시간을 단계 이벤트로 기록합니다. url을 생략하면 현재 스레드의 URL을 사용합니다.
+        블록 안에서 yield된 dict의 'ok'를 False로 바꾸면 실패(예: 요소를 찾지 못함)로 기록됩니다.
+        """
+        outcome = {'ok': True}
+        started = time.monotonic()
+        try:
+            yield outcome
+        except Exception:
+            outcome['ok'] = False
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self._add_duration(name, elapsed)
+            self._write({
+                'type': 'stage', 'url': url or self.current_url(), 'stage': name,
+                'seconds': round(elapsed, 3), 'ok': bool(outcome['ok'])
+            })
+
+    def record_download(self, url, filepath, size, seconds, ok=True):
+        """다운로드 한 건의 크기와 처리량을 기록합니다. (다운로드 스레드에서 호출)"""
+        stage = 'mp4_download' if filepath.lower().endswith('.mp4') else 'image_download'
+        bytes_per_sec = size / seconds if seconds > 0 else 0
+        self._add_duration(stage, seconds)
+        if ok and size:
+            with self._lock:
+                self._throughputs.append(bytes_per_sec)
+        self._write({
+            'type': 'download', 'url': url, 'stage': stage, 'bytes': size,
+            'seconds': round(seconds, 3), 'bytes_per_sec': round(bytes_per_sec), 'ok': ok
+        })
+
+    def log_summary(self):
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+            throughputs = sorted(self._throughputs)
+            page_results = dict(self._page_results)
+            run_seconds = time.monotonic() - self._run_started
+
+        pages = sum(page_results.values())
+        logger.info("\n=== 단계별 소요 시간 (초) ===")
+        logger.info(f"{'단계':<16}{'건수':>6}{'p50':>8}{'p90':>8}{'p99':>8}{'최대':>8}")
+        for stage, values in durations.items():
+            logger.info(
+                f"{stage:<16}{len(values):>6}{percentile(values, 0.5):>8.2f}{percentile(values, 0.9):>8.2f}"
+                f"{percentile(values, 0.99):>8.2f}{values[-1]:>8.2f}"
+            )
+
+        if throughputs:
+            to_mb = 1024 * 1024
+            logger.info(
+                f"다운로드 처리량 (MB/s): p50 {percentile(throughputs, 0.5) / to_mb:.1f}, "
+                f"p90 {percentile(throughputs, 0.9) / to_mb:.1f}, 최소 {throughputs[0] / to_mb:.1f}"
+            )
+        if pages and run_seconds > 0:
+            logger.info(f"페이지 처리량: {pages / run_seconds * 60:.1f} 페이지/분 ({page_results})")
+        if self.enabled:
+            logger.info(f"이벤트 로그: {self.events_file}")
+        logger.info("===================")
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+
+from config import SELECTOR_STATS_CONFIG
+from logger import logger
+
+
+class SelectorRegistry:
+    """
+    선택자(locator)별 성공률과 대기 시간을 기록하고, 최근에 성공한 선택자를 먼저 시도하도록 순서를 정합니다.
+    통계는 JSON 파일에 저장되어 다음 실행에도 이어집니다.
+    사이트 개편으로 styled-components 클래스 해시가 바뀌면 해당 선택자가 뒤로 밀리고 보고서에 표시됩니다.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, stats_file=None, autosave_every=None):
+        self.stats_file = stats_file or SELECTOR_STATS_CONFIG['stats_file']
+        self.autosave_every = autosave_every or SELECTOR_STATS_CONFIG['autosave_every']
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        # {그룹: {locator 키: {attempts, hits, total_latency, last_hit, last_miss, recent_hit_rate}}}
+        self.stats = self._load()
+
+    @classmethod
+    def default(cls):
+        """여러 WebPage(병렬 워커)가 함께 쓰는 기본 레지스트리"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def _load(self):
+        if not os.path.exists(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"선택자 통계 파일을 읽을 수 없어 새로 시작합니다: {str(e)}")
+            return {}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.stats, indent=2, ensure_ascii=False)
+            self._unsaved = 0
+        temp_file = self.stats_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_file, self.stats_file)
+
+    def _key(self, locator):
+        by, value = locator
+        return f"{by}={value}"
+
+    def _entry(self, group, locator):
+        return self.stats.setdefault(group, {}).setdefault(self._key(locator), {
+            'attempts': 0, 'hits': 0, 'total_latency': 0.0, 'last_hit': None, 'last_miss': None,
+            'recent_hit_rate': None
+        })
+
+    def _recent_hit_rate(self, entry):
+        """최근 결과에 가중치를 둔 성공률 (이전 버전 통계 파일에는 없으므로 전체 성공률로 대신함)"""
+        if entry.get('recent_hit_rate') is not None:
+            return entry['recent_hit_rate']
+        return entry['hits'] / entry['attempts'] if entry['attempts'] else 0.0
+
+    def _is_recent(self, entry, now):
+        stale_after = SELECTOR_STATS_CONFIG['stale_after_days'] * 86400
+        return entry['last_hit'] is not None and now - entry['last_hit'] <= stale_after
+
+    def ordered(self, group, locators):
+        """
+        최근에 성공한 선택자 → 아직 기록이 없는 선택자 → 계속 실패한 선택자 순서로 정렬합니다.
+        최근에 성공한 선택자는 stale_after_days 안에 성공했고 최근 성공률이 stale_hit_rate 이상인 것으로,
+        그 안에서는 최근 성공률이 높은 순서입니다. 같은 값이면 원래 순서(우선순위)를 유지합니다.
+        """
+        group_stats = self.stats.get(group, {})
+        min_attempts = SELECTOR_STATS_CONFIG['min_attempts']
+        now = time.time()
+
+        def sort_key(indexed):
+            index, locator = indexed
+            entry = group_stats.get(self._key(locator))
+            if not entry or entry['attempts'] == 0:
+                return (1, 0, index)
+            recent_hit_rate = self._recent_hit_rate(entry)
+            if self._is_recent(entry, now) and recent_hit_rate >= SELECTOR_STATS_CONFIG['stale_hit_rate']:
+                return (0, -recent_hit_rate, index)
+            return (2 if entry['attempts'] >= min_attempts else 1, 0, index)
+
+        with self._lock:
+            return [locator for _, locator in sorted(enumerate(locators), key=sort_key)]
+
+    def record(self, group, locators, hit_locators, latency):
+        """
+        한 번의 대기 결과를 기록합니다. 함께 기다린 선택자 중 hit_locators(요소가 있던 선택자)는 성공,
+        나머지는 실패로 셉니다. hit_locators가 비어 있으면 모두 실패(시간 초과)입니다.
+        """
+        now = time.time()
+        weight = SELECTOR_STATS_CONFIG['recent_weight']
+        with self._lock:
+            for locator in locators:
+                entry = self._entry(group, locator)
+                hit = locator in hit_locators
+                previous = self._recent_hit_rate(entry) if entry['attempts'] else float(hit)
+                entry['recent_hit_rate'] = previous + weight * (float(hit) - previous)
+                entry['attempts'] += 1
+                if hit:
+                    entry['hits'] += 1
+                    entry['total_latency'] += latency
+                    entry['last_hit'] = now
+                else:
+                    entry['last_miss'] = now
+            self._unsaved += 1
+            should_save = self._unsaved >= self.autosave_every
+
+        if should_save:
+            self.save()
+
+    def stale_selectors(self):
+        """
+        충분히 시도했지만 최근 성공률이 낮거나 오랫동안 성공하지 못한 선택자 목록을 반환합니다.
+        """
+        min_attempts = SELECTOR_STATS_CONFIG['min_attempts']
+        now = time.time()
+        stale = []
+        with self._lock:
+            for group, entries in self.stats.items():
+                for key, entry in entries.items():
+                    if entry['attempts'] < min_attempts:
+                        continue
+                    low_hit_rate = self._recent_hit_rate(entry) < SELECTOR_STATS_CONFIG['stale_hit_rate']
+                    if low_hit_rate or not self._is_recent(entry, now):
+                        stale.append((group, key, entry))
+        return stale
+
+    def log_report(self):
+        """그룹별 선택자 성공률/평균 대기 시간과 오래된 선택자를 출력합니다."""
+        logger.info("\n=== 선택자 통계 ===")
+        with self._lock:
+            snapshot = json.loads(json.dumps(self.stats))
+        for group, entries in snapshot.items():
+            logger.info(f"[{group}]")
+            for key, entry in entries.items():
+                hit_rate = entry['hits'] / entry['attempts'] if entry['attempts'] else 0
+                avg_latency = entry['total_latency'] / entry['hits'] if entry['hits'] else 0
+                logger.info(f"  {hit_rate:6.1%} ({entry['hits']}/{entry['attempts']}), 최근 {self._recent_hit_rate(entry):6.1%}, 평균 {avg_latency:.2f}초  {key[:100]}")
+
+        stale = self.stale_selectors()
+        if stale:
+            logger.warning(f"오래되었거나 거의 맞지 않는 선택자 {len(stale)}개 (사이트 구조 변경 가능성):")
+            for group, key, entry in stale:
+                logger.warning(f"  [{group}] {entry['hits']}/{entry['attempts']}  {key[:100]}")
+        logger.info("===================")
+        return stale
@@ -0,0 +1,38 @@
+import threading
+
+from logger import logger
+
+
+class ProcessStats:
+    """사이트 처리 결과 통계 (여러 워커가 동시에 기록할 수 있도록 스레드 안전)"""
+
+    def __init__(self, total_sites=0):
+        self.total_sites = total_sites
+        self.trailer_downloaded_count = 0
+        self.trailer_skipped_count = 0
+        self.error_count = 0
+        self._lock = threading.Lock()
+
+    def record(self, url, result):
+        """
+        do_process 결과를 기록합니다.
+        result: True(다운로드 완료), None(스킵), False(에러)
+        """
+        with self._lock:
+            if result is None:  # 스킵된 경우
+                self.trailer_skipped_count += 1
+                logger.info(f"{url} 트레일러 처리가 스킵되었습니다.")
+            elif result:  # 다운로드 성공
+                self.trailer_downloaded_count += 1
+                logger.info(f"{url} 트레일러 처리가 완료되었습니다.")
+            else:  # 에러 발생
+                self.error_count += 1
+                logger.error(f"{url}에서 프로세스 실행 중 오류가 발생했습니다.")
+
+    def log_summary(self):
+        logger.info("\n=== 처리 결과 통계 ===")
+        logger.info(f"총 사이트 수: {self.total_sites}")
+        logger.info(f"트레일러 다운로드 완료: {self.trailer_downloaded_count}")
+        logger.info(f"트레일러 스킵된 사이트: {self.trailer_skipped_count}")
+        logger.info(f"에러 발생: {self.error_count}")
+        logger.info("===================")
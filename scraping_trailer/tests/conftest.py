@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈이 평평한 구조(from config import ...)이므로 프로젝트 폴더를 import 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
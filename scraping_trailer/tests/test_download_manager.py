@@ -0,0 +1,189 @@
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import DOWNLOAD_CONFIG
+from download_manager import DownloadManager
+from exceptions import DownloadException
+from scrape_metrics import ScrapeMetrics
+
+
+class FakeFileServer:
+    """
+    Range/If-Range를 지원하는 테스트용 HTTP 서버.
+    - cut_after: 다음 GET 응답을 이 바이트 수까지만 보내고 연결을 끊음 (한 번만 적용)
+    - head_size: HEAD 응답의 Content-Length를 실제 크기 대신 이 값으로 보냄
+    """
+
+    def __init__(self, content, etag=None):
+        self.set_content(content, etag)
+        self.cut_after = None
+        self.head_size = None
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_headers(self, status, length, extra=None):
+                self.send_response(status)
+                self.send_header('Content-Length', str(length))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', server.etag)
+                for key, value in (extra or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+
+            def do_HEAD(self):
+                server.requests.append(('HEAD', dict(self.headers)))
+                size = server.head_size if server.head_size is not None else len(server.content)
+                self._send_headers(200, size)
+
+            def do_GET(self):
+                server.requests.append(('GET', dict(self.headers)))
+                content = server.content
+                start, end, status, extra = 0, len(content) - 1, 200, {}
+
+                range_header = self.headers.get('Range')
+                if_range = self.headers.get('If-Range')
+                if range_header and (if_range is None or if_range == server.etag):
+                    match = re.match(r'bytes=(\d+)-(\d*)', range_header)
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(content) - 1
+                    status = 206
+                    extra['Content-Range'] = f"bytes {start}-{end}/{len(content)}"
+
+                body = content[start:end + 1]
+                self._send_headers(status, len(body), extra)
+                if server.cut_after is not None:
+                    body = body[:server.cut_after]
+                    server.cut_after = None
+                    self.close_connection = True
+                self.wfile.write(body)
+                self.wfile.flush()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/files/trailer.mp4"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def set_content(self, content, etag=None):
+        self.content = content
+        self.etag = etag or f'"{hashlib.md5(content).hexdigest()}"'
+
+    def gets(self):
+        return [headers for method, headers in self.requests if method == 'GET']
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(512 * 1024)
+
+
+@pytest.fixture
+def manager():
+    dm = DownloadManager(max_workers=2, metrics=ScrapeMetrics(enabled=False))
+    yield dm
+    dm.close()
+
+
+def test_interrupted_download_resumes_from_part_file(tmp_path, payload, manager):
+    with FakeFileServer(payload) as server:
+        server.cut_after = 100 * 1024
+        with pytest.raises(DownloadException):
+            manager.fetch(server.url, str(tmp_path))
+
+        part_path = tmp_path / 'trailer.mp4.part'
+        assert part_path.exists()
+        partial_size = part_path.stat().st_size
+        assert 0 < partial_size < len(payload)
+
+        assert manager.fetch(server.url, str(tmp_path)) is True
+
+        assert (tmp_path / 'trailer.mp4').read_bytes() == payload
+        assert not part_path.exists()
+        assert not (tmp_path / 'trailer.mp4.part.json').exists()
+        last_get = server.gets()[-1]
+        assert last_get['Range'] == f"bytes={partial_size}-"
+        assert last_get['If-Range'] == server.etag
+    assert manager.failed_count == 1
+    assert manager.completed_count == 1
+
+
+def test_changed_etag_restarts_download(tmp_path, payload, manager):
+    with FakeFileServer(payload) as server:
+        server.cut_after = 100 * 1024
+        with pytest.raises(DownloadException):
+            manager.fetch(server.url, str(tmp_path))
+
+        new_payload = os.urandom(300 * 1024)
+        server.set_content(new_payload)
+        assert manager.fetch(server.url, str(tmp_path)) is True
+
+        assert (tmp_path / 'trailer.mp4').read_bytes() == new_payload
+        # 변경 전 부분 파일은 버리고 처음부터 받음
+        assert 'Range' not in server.gets()[-1]
+
+
+def test_content_length_mismatch_keeps_part_file(tmp_path, payload, manager):
+    with FakeFileServer(payload) as server:
+        server.head_size = len(payload) + 1024
+        with pytest.raises(DownloadException, match='파일 크기가 맞지 않습니다'):
+            manager.fetch(server.url, str(tmp_path))
+
+        part_path = tmp_path / 'trailer.mp4.part'
+        assert part_path.read_bytes() == payload
+        assert not (tmp_path / 'trailer.mp4').exists()
+
+
+def test_large_file_is_downloaded_in_parallel_segments(tmp_path, payload, manager, monkeypatch):
+    monkeypatch.setitem(DOWNLOAD_CONFIG, 'parallel_threshold', 64 * 1024)
+    with FakeFileServer(payload) as server:
+        assert manager.fetch(server.url, str(tmp_path)) is True
+
+        ranges = sorted(headers['Range'] for headers in server.gets())
+        assert len(ranges) == DOWNLOAD_CONFIG['parallel_segments']
+    assert (tmp_path / 'trailer.mp4').read_bytes() == payload
+    assert sorted(os.listdir(tmp_path)) == ['trailer.mp4']
+
+
+def test_leftover_segments_are_removed_after_resuming_merge(tmp_path, payload, manager, monkeypatch):
+    monkeypatch.setitem(DOWNLOAD_CONFIG, 'parallel_threshold', 64 * 1024)
+    with FakeFileServer(payload) as server:
+        # 구간을 .part로 합치던 중에 프로세스가 종료된 상태를 재현
+        filepath = str(tmp_path / 'trailer.mp4')
+        manager._save_meta(filepath, {'size': len(payload), 'etag': server.etag})
+        segment_size = len(payload) // DOWNLOAD_CONFIG['parallel_segments']
+        for index in range(DOWNLOAD_CONFIG['parallel_segments']):
+            (tmp_path / f'trailer.mp4.part.{index}').write_bytes(
+                payload[index * segment_size:(index + 1) * segment_size]
+            )
+        (tmp_path / 'trailer.mp4.part').write_bytes(payload[:segment_size + 10])
+
+        assert manager.fetch(server.url, str(tmp_path)) is True
+
+        assert server.gets()[-1]['Range'] == f"bytes={segment_size + 10}-"
+    assert (tmp_path / 'trailer.mp4').read_bytes() == payload
+    assert sorted(os.listdir(tmp_path)) == ['trailer.mp4']
+
+
+def test_directory_error_is_counted_as_failed_download(tmp_path, manager):
+    blocker = tmp_path / 'not_a_dir'
+    blocker.write_text('x')
+    with pytest.raises(DownloadException):
+        manager.fetch('http://127.0.0.1:1/trailer.mp4', str(blocker / 'sub'))
+    assert manager.failed_count == 1
@@ -0,0 +1,107 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from config import CRAWL_CONFIG
+from exceptions import CrawlException
+from href_crawler import ListingCrawler
+
+
+class ScriptedCrawler(ListingCrawler):
+    """페이지 번호별로 정해 둔 결과를 돌려주는 크롤러 (None은 요청 실패)"""
+
+    def __init__(self, responses, **kwargs):
+        super().__init__(requests_per_second=1000, concurrency=2, max_pages=20, **kwargs)
+        self.responses = responses
+        self.calls = []
+
+    def fetch_page_hrefs(self, page_url):
+        page = self.start_page(page_url)
+        self.calls.append(page)
+        results = self.responses.get(page, [[]])
+        return results.pop(0) if len(results) > 1 else results[0]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setitem(CRAWL_CONFIG, 'retry_backoff', 0)
+
+
+def links(page):
+    return [f'https://example.com/video/{page}-{index}' for index in range(2)]
+
+
+def test_transient_failure_is_retried():
+    crawler = ScriptedCrawler({1: [links(1)], 2: [None, links(2)], 3: [links(3)]})
+
+    hrefs = crawler.crawl('https://example.com/videos?page=1')
+
+    assert hrefs == links(1) + links(2) + links(3)
+    assert crawler.calls.count(2) == 2
+
+
+def test_persistent_failure_aborts_instead_of_stopping_quietly():
+    saved = []
+    crawler = ScriptedCrawler({1: [links(1)], 2: [None], 3: [links(3)]})
+
+    with pytest.raises(CrawlException):
+        crawler.crawl('https://example.com/videos?page=1', on_page=lambda page, hrefs: saved.append(page))
+
+    assert saved == [1]
+    assert crawler.calls.count(2) == 1 + CRAWL_CONFIG['page_retries']
+
+
+def test_stops_on_page_without_new_links():
+    crawler = ScriptedCrawler({1: [links(1)], 2: [links(1)]})
+
+    assert crawler.crawl('https://example.com/videos?page=1') == links(1)
+
+
+def test_later_failed_page_is_not_retried_after_listing_ends():
+    crawler = ScriptedCrawler({1: [links(1)], 2: [links(2)], 3: [[]], 4: [None]})
+
+    assert crawler.crawl('https://example.com/videos?page=1') == links(1) + links(2)
+    assert crawler.calls.count(4) == 1
+
+
+class FakeSession:
+    """페이지 번호별 HTTP 상태 코드로 응답하는 requests.Session 대역"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        page = int(parse_qs(urlparse(url).query)['page'][0])
+        self.calls.append(page)
+        response = requests.Response()
+        response.url = url
+        response.status_code = self.statuses.get(page, 404)
+        response._content = ''.join(
+            f'<div class="VideoThumbnailPreview__Container"><a href="{href}">' for href in links(page)
+        ).encode()
+        return response
+
+
+@pytest.mark.parametrize('status', [404, 410])
+def test_missing_page_ends_listing_without_retry(status):
+    session = FakeSession({1: 200, 2: 200, 3: status})
+    crawler = ListingCrawler(session=session, requests_per_second=1000, concurrency=4, max_pages=20)
+
+    assert crawler.crawl('https://example.com/videos?page=1') == links(1) + links(2)
+    assert session.calls.count(3) == 1
+
+
+def test_server_error_is_retried_and_client_error_aborts():
+    session = FakeSession({1: 200, 2: 503})
+    crawler = ListingCrawler(session=session, requests_per_second=1000, concurrency=1, max_pages=20)
+    with pytest.raises(CrawlException):
+        crawler.crawl('https://example.com/videos?page=1')
+    assert session.calls.count(2) == 1 + CRAWL_CONFIG['page_retries']
+
+    session = FakeSession({1: 200, 2: 403})
+    crawler = ListingCrawler(session=session, requests_per_second=1000, concurrency=1, max_pages=20)
+    with pytest.raises(CrawlException):
+        crawler.crawl('https://example.com/videos?page=1')
+    assert session.calls.count(2) == 1
@@ -0,0 +1,68 @@
+import json
+
+from media_resolver import MediaResolver
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, next_data):
+        self.html = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.html)
+
+
+def video(slug, resolution='1080p'):
+    return {
+        'slug': slug,
+        'trailer': {'sources': [
+            {'url': f'https://cdn.example.com/{slug}_720p.mp4'},
+            {'url': f'https://cdn.example.com/{slug}_{resolution}.mp4'},
+        ]},
+        'images': {'srcset': f'https://cdn.example.com/{slug}_1920x1080.webp 1920w, '
+                             f'https://cdn.example.com/{slug}_3840x2160.webp 3840w'},
+    }
+
+
+def resolve(next_data, url='https://www.example.com/video/main-title'):
+    return MediaResolver(FakeSession(next_data)).resolve(url)
+
+
+def test_ignores_related_videos_with_higher_resolution():
+    main = video('main-title')
+    main['related'] = [video('other-title', resolution='2160p')]
+    data = {
+        'props': {'pageProps': {'recommended': [video('first-listed', resolution='2160p')], 'video': main}},
+        'query': {'slug': 'main-title'},
+    }
+
+    media = resolve(data)
+
+    assert media == {
+        'trailer_url': 'https://cdn.example.com/main-title_1080p.mp4',
+        'title_image_url': 'https://cdn.example.com/main-title_3840x2160.webp',
+    }
+
+
+def test_returns_none_when_page_video_is_not_identified():
+    data = {'props': {'pageProps': {'recommended': [video('other-title')]}}}
+
+    assert resolve(data) is None
+
+
+def test_matches_video_by_route_parameter():
+    data = {
+        'props': {'pageProps': {'item': dict(video('ignored-slug'), id='12345')}},
+        'query': {'id': '12345'},
+    }
+
+    media = resolve(data, url='https://www.example.com/watch/12345?ref=home')
+
+    assert media['trailer_url'] == 'https://cdn.example.com/ignored-slug_1080p.mp4'
@@ -0,0 +1,50 @@
+import time
+
+from config import SELECTOR_STATS_CONFIG
+from selector_registry import SelectorRegistry
+
+PRIMARY = ('css selector', '.Primary__Button-sc-1')
+FALLBACK = ('xpath', "//button[contains(text(), 'I AGREE')]")
+BROKEN = ('css selector', '.Old__Button-sc-0')
+
+
+def make_registry(tmp_path):
+    return SelectorRegistry(stats_file=str(tmp_path / 'selector_stats.json'), autosave_every=1000)
+
+
+def test_present_fallback_locator_is_not_counted_as_miss(tmp_path):
+    registry = make_registry(tmp_path)
+    locators = [PRIMARY, FALLBACK, BROKEN]
+
+    for _ in range(SELECTOR_STATS_CONFIG['min_attempts']):
+        # PRIMARY가 우선순위로 선택되었지만 FALLBACK도 함께 있었음
+        registry.record('agree', locators, [PRIMARY, FALLBACK], 0.1)
+
+    stale = {key for _, key, _ in registry.stale_selectors()}
+    assert stale == {registry._key(BROKEN)}
+    assert registry.stats['agree'][registry._key(FALLBACK)]['hits'] == SELECTOR_STATS_CONFIG['min_attempts']
+
+
+def test_old_hit_does_not_keep_locator_in_front(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.record('agree', [PRIMARY], [PRIMARY], 0.1)
+    for _ in range(SELECTOR_STATS_CONFIG['min_attempts']):
+        registry.record('agree', [PRIMARY], [], 5.0)
+    entry = registry.stats['agree'][registry._key(PRIMARY)]
+    entry['last_hit'] = time.time() - (SELECTOR_STATS_CONFIG['stale_after_days'] + 1) * 86400
+
+    # 한참 전에 한 번 성공한 선택자보다 기록이 없는 새 선택자를 먼저 시도
+    assert registry.ordered('agree', [PRIMARY, FALLBACK]) == [FALLBACK, PRIMARY]
+
+
+def test_recent_hit_rate_ranks_locators(tmp_path):
+    registry = make_registry(tmp_path)
+    locators = [PRIMARY, FALLBACK]
+
+    registry.record('agree', locators, [PRIMARY, FALLBACK], 0.1)
+    # 사이트 개편 후 PRIMARY는 계속 실패하고 FALLBACK만 맞음
+    for _ in range(15):
+        registry.record('agree', locators, [FALLBACK], 0.1)
+
+    assert registry.ordered('agree', locators) == [FALLBACK, PRIMARY]
+    assert registry.stats['agree'][registry._key(PRIMARY)]['recent_hit_rate'] < SELECTOR_STATS_CONFIG['stale_hit_rate'] * 5
@@ -0,0 +1,35 @@
+import time
+
+from selenium.webdriver.common.by import By
+
+from waits import wait_for_any_element
+
+LOCATORS = [(By.CSS_SELECTOR, '.Agree__Button'), (By.XPATH, "//button[text()='I AGREE']")]
+
+
+class FakeDriver:
+    """find_elements만 흉내 내는 WebDriver 대역 (elements에 있는 locator만 요소를 돌려줌)"""
+
+    def __init__(self, elements=None):
+        self.elements = elements or {}
+        self.polls = 0
+
+    def find_elements(self, by, value):
+        self.polls += 1
+        return self.elements.get((by, value), [])
+
+
+def test_zero_timeout_checks_once_without_waiting():
+    driver = FakeDriver()
+    started = time.monotonic()
+
+    assert wait_for_any_element(driver, LOCATORS, timeout=0) == (None, None)
+    assert time.monotonic() - started < 0.5
+    assert driver.polls == len(LOCATORS)
+
+
+def test_zero_timeout_still_finds_present_element():
+    button = object()
+    driver = FakeDriver({LOCATORS[1]: [button]})
+
+    assert wait_for_any_element(driver, LOCATORS, timeout=0) == (LOCATORS[1], button)
@@ -0,0 +1,112 @@
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import WAIT_TIMES
+
+
+def wait_until(driver, condition, timeout):
+    """
+    condition이 참 값을 반환할 때까지 기다립니다. 시간 초과 시 None을 반환합니다.
+    고정 sleep 대신 조건이 충족되는 즉시 진행하기 위한 공통 대기 함수입니다.
+    """
+    try:
+        return WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=WAIT_TIMES['poll_frequency'],
+            ignored_exceptions=(StaleElementReferenceException,)
+        ).until(condition)
+    except TimeoutException:
+        return None
+
+
+def document_ready(driver):
+    try:
+        return driver.execute_script("return document.readyState") == "complete"
+    except WebDriverException:
+        return False
+
+
+def first_matching_element(locators, predicate=None):
+    """
+    모든 후보 locator를 매 폴링마다 한 번에 확인하는 조건을 만듭니다.
+    여러 후보가 동시에 있으면 목록 앞쪽(우선순위가 높은) locator가 선택됩니다.
+    """
+    def _condition(driver):
+        for locator in locators:
+            for element in driver.find_elements(*locator):
+                try:
+                    if predicate is None or predicate(element):
+                        return locator, element
+                except StaleElementReferenceException:
+                    continue
+        return False
+    return _condition
+
+
+def wait_for_page_ready(driver, timeout=None):
+    """
+    document.readyState가 complete가 될 때까지 기다립니다.
+    """
+    return bool(wait_until(driver, document_ready, timeout if timeout is not None else WAIT_TIMES['page_load']))
+
+
+def wait_for_any_element(driver, locators, timeout=None, predicate=None):
+    """
+    후보 locator 중 가장 먼저 나타나는 요소를 기다립니다.
+    반환값: (locator, element), 시간 초과 시 (None, None)
+    """
+    timeout = timeout if timeout is not None else WAIT_TIMES['element_wait']
+    result = wait_until(driver, first_matching_element(locators, predicate), timeout)
+    return result if result else (None, None)
+
+
+def wait_for_attribute(driver, locators, attribute, timeout=None):
+    """
+    후보 locator 중 attribute 값이 채워진 첫 요소를 기다립니다. (예: img srcset, video source src)
+    반환값: (locator, 속성값), 시간 초과 시 (None, None)
+    """
+    locator, element = wait_for_any_element(
+        driver, locators, timeout, predicate=lambda element: element.get_attribute(attribute)
+    )
+    if element is None:
+        return None, None
+    return locator, element.get_attribute(attribute)
+
+
+def matching_locators(driver, locators, predicate=None):
+    """
+    후보 locator 중 지금 (predicate를 만족하는) 요소가 있는 것을 모두 반환합니다. 기다리지 않고 한 번만 확인합니다.
+    """
+    return [locator for locator in locators if first_matching_element([locator], predicate)(driver)]
+
+
+def wait_for_navigation(driver, previous_url, ready_locators=(), timeout=None):
+    """
+    클릭 후 URL이 바뀌거나 ready_locators 중 하나가 나타날 때까지 기다립니다.
+    Next.js 클라이언트 라우팅은 load 이벤트 없이 URL만 바뀌므로 두 조건을 함께 확인합니다.
+    """
+    present = first_matching_element(ready_locators) if ready_locators else None
+
+    def _condition(driver):
+        if driver.current_url != previous_url:
+            return True
+        return bool(present and present(driver))
+
+    navigated = bool(wait_until(driver, _condition, timeout if timeout is not None else WAIT_TIMES['after_click']))
+    if navigated:
+        wait_for_page_ready(driver)
+    return navigated
+
+
+def wait_for_element_gone(driver, element, timeout=None):
+    """
+    요소가 DOM에서 제거되거나 보이지 않게 될 때까지 기다립니다. (예: 모달 닫힘)
+    """
+    def _condition(driver):
+        try:
+            return not element.is_displayed()
+        except StaleElementReferenceException:
+            return True
+
+    return bool(wait_until(driver, _condition, timeout if timeout is not None else WAIT_TIMES['after_click']))
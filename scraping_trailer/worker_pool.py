@@ -0,0 +1,246 @@
+import queue
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from config import WORKER_CONFIG
+from logger import logger
+from stats import ProcessStats
+
+try:
+    import psutil
+except ImportError:
+    # psutil이 없으면 메모리 기준 재시작 없이 페이지 수 기준으로만 재시작
+    psutil = None
+
+
+def is_session_alive(driver):
+    """브라우저 세션이 명령에 응답하는지 확인합니다. (크래시/연결 끊김 감지)"""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
+
+
+def browser_rss_mb(driver):
+    """
+    chromedriver와 그 하위 Chrome 프로세스(렌더러, GPU 등) 전체의 RSS(MB)를 반환합니다.
+    측정할 수 없으면(psutil 없음, 기존 세션에 연결) None
+    """
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            # 측정 중에 종료된 렌더러 프로세스
+            continue
+    return total / (1024 * 1024)
+
+
+class DomainLimiter:
+    """도메인별 동시 처리 수를 제한합니다."""
+
+    def __init__(self, per_domain_limit):
+        self.per_domain_limit = per_domain_limit
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, domain):
+        with self._lock:
+            if self._active.get(domain, 0) >= self.per_domain_limit:
+                return False
+            self._active[domain] = self._active.get(domain, 0) + 1
+            return True
+
+    def release(self, domain):
+        with self._lock:
+            self._active[domain] -= 1
+            if self._active[domain] <= 0:
+                del self._active[domain]
+
+
+class BrowserSession:
+    """
+    워커 하나가 사용하는 브라우저 세션. 처리한 페이지 수와 메모리 사용량으로 재시작 시점을 판단합니다.
+    """
+
+    def __init__(self, page_factory):
+        self.web_page, self._close = page_factory()
+        self.pages = 0
+
+    def is_healthy(self):
+        return is_session_alive(self.web_page.driver)
+
+    def recycle_reason(self):
+        """재시작이 필요하면 그 이유를, 아니면 None을 반환합니다."""
+        restart_after = WORKER_CONFIG['restart_after_pages']
+        if restart_after and self.pages >= restart_after:
+            return f"{self.pages}페이지 처리"
+
+        max_rss = WORKER_CONFIG['max_rss_mb']
+        if max_rss:
+            rss = browser_rss_mb(self.web_page.driver)
+            if rss is not None and rss > max_rss:
+                return f"메모리 {rss:.0f}MB 사용"
+        return None
+
+    def close(self):
+        self._close()
+
+
+class ScrapeWorkerPool:
+    """
+    여러 브라우저 인스턴스로 URL 목록을 동시에 처리하는 워커 풀.
+    워커마다 page_factory로 자신만의 WebPage를 만들고, 공유 큐에서 URL을 가져가 처리합니다.
+    (하나의 WebDriver는 스레드 안전하지 않으므로 탭 대신 인스턴스 단위로 병렬화합니다.)
+
+    긴 실행에서도 메모리가 늘지 않도록 일정 페이지 수나 RSS를 넘으면 브라우저를 새로 띄우고,
+    처리 중에 브라우저가 죽으면 그 URL을 큐에 되돌려 다른(또는 재시작한) 세션이 이어서 처리합니다.
+    """
+
+    def __init__(self, page_factory, workers=None, per_domain_limit=None):
+        """
+        page_factory: 인자 없이 호출하면 (web_page, close_fn)을 반환하는 함수
+        """
+        self.page_factory = page_factory
+        self.workers = workers or WORKER_CONFIG['workers']
+        self.limiter = DomainLimiter(per_domain_limit or WORKER_CONFIG['per_domain_limit'])
+        self.url_queue = queue.Queue()
+        # 브라우저 장애로 다시 큐에 넣은 횟수 (특정 URL이 매번 브라우저를 죽이는 경우 무한 반복 방지)
+        self._reassigned = {}
+        self._reassigned_lock = threading.Lock()
+
+    def _next_url(self):
+        """도메인 제한에 걸리지 않는 다음 URL을 가져옵니다. 큐가 비면 None을 반환합니다."""
+        while True:
+            try:
+                url = self.url_queue.get_nowait()
+            except queue.Empty:
+                return None, None
+
+            domain = urlparse(url).netloc
+            if self.limiter.try_acquire(domain):
+                return url, domain
+
+            # 같은 도메인을 처리 중인 워커가 많으면 뒤로 미루고 잠시 대기
+            self.url_queue.put(url)
+            time.sleep(0.2)
+
+    def _start_session(self, worker_id):
+        """
+        브라우저 세션을 시작합니다. 연속으로 실패하면 None을 반환하고 워커를 종료합니다.
+        """
+        max_failures = WORKER_CONFIG['max_restart_failures']
+        for attempt in range(1, max_failures + 1):
+            try:
+                return BrowserSession(self.page_factory)
+            except Exception as e:
+                logger.error(f"[worker-{worker_id}] 브라우저를 시작할 수 없습니다 ({attempt}/{max_failures}): {str(e)}")
+                time.sleep(attempt)
+        return None
+
+    def _close_session(self, worker_id, session):
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"[worker-{worker_id}] 브라우저 종료 중 오류 발생: {str(e)}")
+
+    def _reassign(self, url):
+        """
+        브라우저 장애로 끝내지 못한 URL을 큐에 되돌립니다. 재할당 한도를 넘으면 False를 반환합니다.
+        """
+        with self._reassigned_lock:
+            count = self._reassigned.get(url, 0)
+            if count >= WORKER_CONFIG['max_url_reassign']:
+                return False
+            self._reassigned[url] = count + 1
+        self.url_queue.put(url)
+        return True
+
+    def _worker(self, worker_id, stats):
+        session = self._start_session(worker_id)
+        if session is None:
+            return
+
+        try:
+            while True:
+                url, domain = self._next_url()
+                if url is None:
+                    break
+
+                try:
+                    logger.info(f"[worker-{worker_id}] {url} 사이트 방문을 시작합니다.")
+                    result = session.web_page.visit_url(url)
+                except Exception as e:
+                    logger.error(f"[worker-{worker_id}] {url} 처리 중 오류 발생: {str(e)}")
+                    result = False
+                finally:
+                    self.limiter.release(domain)
+                session.pages += 1
+
+                # 실패가 브라우저 크래시 때문이면 URL을 다른 세션에 맡기고 이 워커는 브라우저를 다시 띄움
+                if result is False and not session.is_healthy():
+                    if self._reassign(url):
+                        logger.warning(f"[worker-{worker_id}] 브라우저 세션이 응답하지 않습니다. {url}을 다시 큐에 넣습니다.")
+                    else:
+                        logger.error(f"[worker-{worker_id}] {url}이 브라우저 장애로 반복 실패해 에러로 기록합니다.")
+                        stats.record(url, result)
+                    reason = "세션 응답 없음"
+                else:
+                    stats.record(url, result)
+                    reason = session.recycle_reason()
+
+                if reason:
+                    logger.info(f"[worker-{worker_id}] 브라우저를 재시작합니다. ({reason})")
+                    self._close_session(worker_id, session)
+                    session = self._start_session(worker_id)
+                    if session is None:
+                        return
+        finally:
+            if session is not None:
+                self._close_session(worker_id, session)
+
+    def run(self, urls, stats=None):
+        """
+        모든 URL을 처리하고 워커 전체의 통계를 반환합니다.
+        stats를 넘기면 그 통계에 이어서 기록하고, 요약 출력은 호출한 쪽에 맡깁니다.
+        """
+        own_stats = stats is None
+        if own_stats:
+            stats = ProcessStats(total_sites=len(urls))
+        for url in urls:
+            self.url_queue.put(url)
+
+        worker_count = min(self.workers, len(urls)) or 1
+        logger.info(f"{worker_count}개의 워커로 {len(urls)}개의 사이트를 처리합니다.")
+
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, stats), name=f"worker-{worker_id}")
+            for worker_id in range(1, worker_count + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 모든 워커가 브라우저 시작에 실패한 경우 남은 URL(재할당된 URL 포함)은 에러로 집계
+        while True:
+            try:
+                stats.record(self.url_queue.get_nowait(), False)
+            except queue.Empty:
+                break
+
+        if own_stats:
+            stats.log_summary()
+        return stats
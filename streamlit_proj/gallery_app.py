@@ -1,11 +1,10 @@
 import streamlit as st
 import requests
-import asyncio
-import aiohttp
-from typing import List, Dict
-import time
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional
+from collections import deque, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-import json
+import threading
 from datetime import datetime
 
 # 페이지 설정
@@ -17,7 +16,8 @@ st.set_page_config(
 )
 
 # API 엔드포인트
-API_URL = "https://image-gallery-api-513122275637.asia-northeast3.run.app/random-images"
+API_BASE_URL = "https://image-gallery-api-513122275637.asia-northeast3.run.app"
+API_URL = f"{API_BASE_URL}/random-images"
 
 # CSS 스타일 정의
 st.markdown("""
@@ -43,7 +43,11 @@ st.markdown("""
        border-radius: 8px;
        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
        transition: transform 0.3s ease;
-       background: #f5f5f5;
+       /* 이미지가 도착하기 전까지 shimmer 배경 표시 */
+       min-height: 120px;
+       animation: shimmer 2s infinite linear;
+       background: linear-gradient(to right, #f0f0f0 4%, #e0e0e0 25%, #f0f0f0 36%);
+       background-size: 1000px 100%;
    }
 
    .image-container:hover {
@@ -51,28 +55,6 @@ st.markdown("""
        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
    }
 
-   /* 정보 아이콘 스타일 */
-   .info-button {
-       position: absolute;
-       bottom: 10px;
-       right: 10px;
-       background: rgba(255, 255, 255, 0.9);
-       border-radius: 50%;
-       width: 36px;
-       height: 36px;
-       display: flex;
-       align-items: center;
-       justify-content: center;
-       cursor: pointer;
-       box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-       transition: all 0.2s ease;
-   }
-
-   .info-button:hover {
-       background: rgba(255, 255, 255, 1);
-       transform: scale(1.1);
-   }
-
    /* 갤러리 그리드 */
    .gallery-grid {
        display: grid;
@@ -116,199 +98,411 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 세션 상태 초기화
-if 'images' not in st.session_state:
-   st.session_state.images = []
-if 'loading' not in st.session_state:
-   st.session_state.loading = False
+if 'image_refs' not in st.session_state:
+   # 이미지별 (id, url, title, 그리드 이미지 URL, LQIP)만 보관 - 전체 메타데이터는 공유 캐시에 두고 상세 보기에서 조회
+   st.session_state.image_refs = []
+if 'page' not in st.session_state:
+   st.session_state.page = 0
 if 'initial_load' not in st.session_state:
    st.session_state.initial_load = True
-if 'load_more_clicked' not in st.session_state:
-   st.session_state.load_more_clicked = False
 
+# 한 번에 불러오는 이미지 수, 한 페이지에 표시하는 이미지 수, 그리드 열 수
+BATCH_SIZE = 20
+PAGE_SIZE = 20
+COLS_PER_ROW = 4
+# 서버 프로세스 전체에서 보관하는 메타데이터 수 (넘으면 오래된 것부터 제거 후 필요 시 API로 다시 조회)
+METADATA_CACHE_SIZE = 5000
+
+
+# 미리 받아둘 페이지 수 (더보기 클릭은 이 버퍼에서 바로 처리)
+PREFETCH_PAGES = 2
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+   """모든 사용자 세션이 공유하는 커넥션 풀 (매 요청마다 TLS 연결을 새로 맺지 않음)"""
+   session = requests.Session()
+   adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+   session.mount("https://", adapter)
+   return session
+
+
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+   """백그라운드 미리 받기용 스레드 풀 (사용자 세션 간 공유)"""
+   return ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+
+
+def fetch_images(count: int = 20) -> Dict:
+   """이미지 목록을 API에서 가져오는 함수 (백그라운드 스레드에서 실행되므로 st 호출 없이 예외를 그대로 전달)"""
+   response = get_http_session().get(
+       API_URL,
+       params={"count": count},
+       timeout=30  # 콜드 스타트 고려하여 긴 타임아웃
+   )
+   response.raise_for_status()
+   return response.json()
+
+
+class ImagePrefetcher:
+   """
+   다음 PREFETCH_PAGES개 페이지의 API 응답을 백그라운드에서 동시에 받아두는 버퍼.
+   더보기 클릭은 이미 받아둔 응답으로 바로 처리되고, Cloud Run 콜드 스타트도 클릭 전에 미리 겪게 됩니다.
+   이미 표시한 이미지 id는 건너뛰고, 남는 이미지는 다음 묶음에 사용합니다.
+   """
+
+   def __init__(self, batch_size: int, pages: int = PREFETCH_PAGES):
+       self.batch_size = batch_size
+       self.pages = pages
+       self.pending = deque()
+       self.leftover = []
+       self.seen_ids = set()
+       self.lock = threading.Lock()
+       self.fill()
+
+   def fill(self):
+       """버퍼에 PREFETCH_PAGES개의 요청이 걸려 있도록 채움"""
+       executor = get_prefetch_executor()
+       with self.lock:
+           while len(self.pending) < self.pages:
+               self.pending.append(executor.submit(fetch_images, self.batch_size))
+
+   def _take_unique(self, images: List[Dict]) -> List[Dict]:
+       unique = []
+       for image in images:
+           if image['id'] not in self.seen_ids:
+               self.seen_ids.add(image['id'])
+               unique.append(image)
+       return unique
+
+   def next_batch(self) -> Dict:
+       """
+       중복을 제외한 다음 묶음을 반환합니다. (응답과 같은 구조의 dict)
+       받아둔 응답이 없으면 진행 중인 요청이 끝날 때까지 기다립니다.
+       """
+       images = self._take_unique(self.leftover)
+       self.leftover = []
+       data = {}
+       error = None
+
+       # 무작위 응답이 이미 본 이미지로만 채워져도 무한히 요청하지 않도록 시도 횟수 제한
+       for _ in range(self.pages + 1):
+           if len(images) >= self.batch_size:
+               break
+           self.fill()
+           with self.lock:
+               future = self.pending.popleft()
+           try:
+               data = future.result()
+           except requests.exceptions.RequestException as e:
+               error = e
+               continue
+           images.extend(self._take_unique(data.get('images', [])))
+
+       # 소비한 만큼 다시 백그라운드에서 채움
+       self.fill()
+
+       if not images:
+           if error:
+               st.error(f"이미지 로드 중 오류 발생: {str(error)}")
+           else:
+               st.info("새로 표시할 이미지가 없습니다.")
+           return None
+
+       self.leftover = images[self.batch_size:]
+       batch = images[:self.batch_size]
+       return {**data, 'images': batch, 'count': len(batch)}
+
+
+def get_prefetcher() -> ImagePrefetcher:
+   """현재 사용자 세션의 미리 받기 버퍼"""
+   if 'prefetcher' not in st.session_state:
+       st.session_state.prefetcher = ImagePrefetcher(BATCH_SIZE)
+   return st.session_state.prefetcher
+
+
+class MetadataCache:
+   """이미지 id별 전체 메타데이터를 보관하는 LRU 캐시 (모든 사용자 세션이 공유)"""
+
+   def __init__(self, maxsize: int):
+       self.maxsize = maxsize
+       self.items = OrderedDict()
+       self.lock = threading.Lock()
 
-def fetch_images_async(count: int = 20) -> Dict:
-   """이미지를 비동기로 가져오는 함수"""
+   def put_many(self, images: List[Dict]):
+       with self.lock:
+           for image in images:
+               self.items[image['id']] = image
+               self.items.move_to_end(image['id'])
+           while len(self.items) > self.maxsize:
+               self.items.popitem(last=False)
+
+   def get(self, image_id: str) -> Optional[Dict]:
+       with self.lock:
+           image = self.items.get(image_id)
+           if image is not None:
+               self.items.move_to_end(image_id)
+           return image
+
+
+@st.cache_resource
+def get_metadata_cache() -> MetadataCache:
+   return MetadataCache(METADATA_CACHE_SIZE)
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=1000)
+def fetch_image_detail(image_id: str) -> Dict:
+   """
+   캐시에서 밀려난 이미지의 상세 정보를 API에서 조회
+   실패하면 예외를 그대로 올려 보내 st.cache_data에 실패 결과가 저장되지 않게 합니다.
+   """
+   response = get_http_session().get(f"{API_BASE_URL}/images/{image_id}", timeout=10)
+   response.raise_for_status()
+   return response.json()
+
+
+def get_image_detail(image_id: str) -> Optional[Dict]:
+   cached = get_metadata_cache().get(image_id)
+   if cached:
+       return cached
    try:
-       response = requests.get(
-           API_URL,
-           params={"count": count},
-           timeout=30  # 콜드 스타트 고려하여 긴 타임아웃
-       )
-       response.raise_for_status()
-       return response.json()
-   except requests.exceptions.RequestException as e:
-       st.error(f"이미지 로드 중 오류 발생: {str(e)}")
+       return fetch_image_detail(image_id)
+   except (requests.exceptions.RequestException, ValueError):
+       # 일시적인 오류는 캐시하지 않으므로 다음에 다시 열면 새로 조회함
        return None
 
 
-def create_image_card(image_data: Dict, index: int):
+def grid_rendition(image: Dict) -> tuple:
+   """
+   그리드 타일에 사용할 (이미지 URL, LQIP)를 반환합니다.
+   업로드 시 만든 썸네일이 메타데이터에 있으면 사용하고, 없으면 전체 WebP와 shimmer 배경으로 대체합니다.
+   """
+   metadata = image.get('metadata') or {}
+   return metadata.get('thumbnail_url') or image['url'], metadata.get('lqip')
+
+
+@st.cache_data(show_spinner=False, max_entries=5000)
+def build_image_html(url: str, title: str, lqip: Optional[str] = None) -> str:
+   """이미지 카드 HTML 생성 (이미지별로 캐시되어 다시 그릴 때 문자열을 새로 만들지 않음)"""
+   # LQIP가 있으면 흐린 미리보기를 배경으로 깔고, 없으면 컨테이너의 shimmer 배경이 보임
+   placeholder_style = (
+       f' style="background-image: url(\'{lqip}\'); background-size: cover; animation: none;"' if lqip else ''
+   )
+   return f"""
+           <div class="image-container"{placeholder_style}>
+               <img src="{url}"
+                    alt="{title}"
+                    loading="lazy"
+                    decoding="async"
+                    style="width: 100%; height: auto; display: block; border-radius: 8px;">
+           </div>
+           """
+
+
+@st.dialog("상세 정보", width="large")
+def show_image_detail(image_id: str, url: str):
+   """상세 정보 보기 - 전체 크기 이미지와 메타데이터는 이때만 불러옴"""
+   image_data = get_image_detail(image_id)
+   st.image(image_data['url'] if image_data else url, use_container_width=True)
+
+   if not image_data:
+       st.warning("상세 정보를 불러올 수 없습니다.")
+       st.write(f"**ID:** {image_id}")
+       return
+
+   st.subheader(image_data['title'])
+
+   # 설명 표시
+   if image_data.get('description'):
+       st.caption(f"📝 {image_data['description']}")
+
+   st.write(f"**ID:** {image_data['id']}")
+   
+   # 태그 프리픽스 표시
+   if image_data.get('tag_prefix'):
+       st.write(f"**태그 프리픽스:** {image_data['tag_prefix']}")
+   
+   metadata = image_data.get('metadata') or {}
+   if metadata.get('width') and metadata.get('height'):
+       st.write(f"**크기:** {metadata['width']}x{metadata['height']} px")
+   if metadata.get('format'):
+       st.write(f"**포맷:** {metadata['format'].upper()}")
+   if metadata.get('size_kb'):
+       st.write(f"**파일 크기:** {metadata['size_kb']} KB")
+   
+   # WebP URL 표시
+   if metadata.get('webp_url'):
+       st.write(f"**WebP URL:** [링크]({metadata['webp_url']})")
+   
+   # 원본 이미지 정보
+   if metadata.get('has_original'):
+       if metadata.get('original_url'):
+           st.write(f"**원본 이미지:** [링크]({metadata['original_url']})")
+       else:
+           st.write("**원본 이미지:** 사용 가능")
+   else:
+       st.write("**원본 이미지:** 없음")
+   
+   # 생성 날짜 표시
+   if image_data.get('created_at'):
+       try:
+           # ISO 형식의 날짜를 파싱
+           created_date = datetime.fromisoformat(image_data['created_at'].replace('Z', '+00:00'))
+           formatted_date = created_date.strftime('%Y년 %m월 %d일 %H:%M')
+           st.write(f"**생성 날짜:** {formatted_date}")
+       except:
+           st.write(f"**생성 날짜:** {image_data['created_at']}")
+   
+   st.write(f"**태그:** {', '.join(image_data.get('tags', []))}")
+
+
+def create_image_card(image_ref: tuple, index: int):
    """개별 이미지 카드 생성"""
-   col_key = f"img_col_{index}_{image_data['id']}"
+   image_id, url, title, grid_url, lqip = image_ref
+   try:
+       # 그리드에는 썸네일만 표시 (전체 크기 이미지는 상세 정보에서만 불러옴)
+       st.markdown(build_image_html(grid_url, title, lqip), unsafe_allow_html=True)
 
-   # 이미지 컨테이너
-   container = st.container()
+       # 이미지 제목
+       st.caption(f"**{title}**")
 
-   with container:
-       # 이미지 표시 (placeholder와 함께)
-       placeholder = st.empty()
+       if st.button("상세 정보", key=f"detail_{index}_{image_id}", use_container_width=True):
+           show_image_detail(image_id, url)
 
-       # 초기 로딩 플레이스홀더 표시
-       placeholder.markdown(
-           f'<div class="loading-placeholder"></div>',
-           unsafe_allow_html=True
-       )
+   except Exception as e:
+       st.error(f"이미지 로드 실패: {str(e)}")
 
-       # 실제 이미지 로드 (비동기 효과)
-       try:
-           # 이미지와 정보 버튼을 포함한 HTML
-           image_html = f"""
-           <div class="image-container">
-               <img src="{image_data['url']}"
-                    alt="{image_data['title']}"
-                    style="width: 100%; height: auto; display: block; border-radius: 8px;"
-                    onload="this.style.opacity='0'; this.style.transition='opacity 0.5s'; setTimeout(() => this.style.opacity='1', 50);">
-               <div class="info-button" onclick="console.log('Tags: {json.dumps(image_data["tags"])}'); alert('태그: {", ".join(image_data["tags"])}');">
-                   ℹ️
-               </div>
-           </div>
-           """
 
-           # 약간의 지연을 주어 로딩 효과 표시
-           time.sleep(0.1)
-           placeholder.markdown(image_html, unsafe_allow_html=True)
-
-           # 이미지 제목
-           st.caption(f"**{image_data['title']}**")
-           
-           # 설명 표시 (새로 추가)
-           if image_data.get('description'):
-               st.caption(f"📝 {image_data['description']}")
-
-           # 메타데이터 표시 (접을 수 있는 형태)
-           with st.expander("상세 정보", expanded=False):
-               st.write(f"**ID:** {image_data['id']}")
-               
-               # 태그 프리픽스 표시 (새로 추가)
-               if image_data.get('tag_prefix'):
-                   st.write(f"**태그 프리픽스:** {image_data['tag_prefix']}")
-               
-               st.write(f"**크기:** {image_data['metadata']['width']}x{image_data['metadata']['height']} px")
-               st.write(f"**포맷:** {image_data['metadata']['format'].upper()}")
-               st.write(f"**파일 크기:** {image_data['metadata']['size_kb']} KB")
-               
-               # WebP URL 표시 (새로 추가)
-               if image_data['metadata'].get('webp_url'):
-                   st.write(f"**WebP URL:** [링크]({image_data['metadata']['webp_url']})")
-               
-               # 원본 이미지 정보 (새로 추가)
-               if image_data['metadata'].get('has_original'):
-                   if image_data['metadata'].get('original_url'):
-                       st.write(f"**원본 이미지:** [링크]({image_data['metadata']['original_url']})")
-                   else:
-                       st.write("**원본 이미지:** 사용 가능")
-               else:
-                   st.write("**원본 이미지:** 없음")
-               
-               # 생성 날짜 표시 (새로 추가)
-               if image_data.get('created_at'):
-                   try:
-                       # ISO 형식의 날짜를 파싱
-                       created_date = datetime.fromisoformat(image_data['created_at'].replace('Z', '+00:00'))
-                       formatted_date = created_date.strftime('%Y년 %m월 %d일 %H:%M')
-                       st.write(f"**생성 날짜:** {formatted_date}")
-                   except:
-                       st.write(f"**생성 날짜:** {image_data['created_at']}")
-               
-               st.write(f"**태그:** {', '.join(image_data['tags'])}")
-
-       except Exception as e:
-           st.error(f"이미지 로드 실패: {str(e)}")
-
-
-def load_more_images():
-   """더 많은 이미지 로드"""
-   st.session_state.load_more_clicked = True
-   st.session_state.loading = True
+def page_count() -> int:
+   return max(1, -(-len(st.session_state.image_refs) // PAGE_SIZE))
 
 
-# 메인 앱
-st.title("🖼️ 이미지 갤러리")
-st.markdown("---")
+def render_page(page: int):
+   """현재 페이지의 이미지만 그리드로 표시 (누적 이미지 수와 관계없이 최대 PAGE_SIZE개)"""
+   refs = st.session_state.image_refs
+   start = page * PAGE_SIZE
+   end = min(start + PAGE_SIZE, len(refs))
+   for row_start in range(start, end, COLS_PER_ROW):
+       cols = st.columns(COLS_PER_ROW)
+       for col_idx, image_index in enumerate(range(row_start, min(row_start + COLS_PER_ROW, end))):
+           with cols[col_idx]:
+               create_image_card(refs[image_index], image_index)
 
-# 초기 로드 또는 더보기 클릭시 이미지 가져오기
-if st.session_state.initial_load or st.session_state.load_more_clicked:
-   if st.session_state.initial_load:
-       st.markdown('<p class="loading-text">🔄 갤러리를 준비하는 중입니다... (첫 로드는 시간이 걸릴 수 있습니다)</p>', unsafe_allow_html=True)
 
-   with st.spinner("이미지를 불러오는 중..."):
-       data = fetch_images_async(20)
-
-       if data and 'images' in data:
-           st.session_state.images.extend(data['images'])
-           st.session_state.initial_load = False
-           st.session_state.load_more_clicked = False
-           st.session_state.loading = False
-           
-           # 새로운 응답 구조 정보 표시
-           success_message = f"✅ {len(data['images'])}개의 이미지를 불러왔습니다!"
-           if data.get('count'):
-               success_message += f" (서버에서 {data['count']}개 반환)"
-           if data.get('source'):
-               success_message += f" [출처: {data['source']}]"
-           
-           st.success(success_message)
-           
-           # 타임스탬프 정보 표시 (디버그 정보)
-           if data.get('timestamp'):
-               st.caption(f"🕒 서버 응답 시각: {data['timestamp']}")
-           
-           time.sleep(1)
-           st.rerun()
+def append_batch(data: Dict) -> bool:
+   """응답의 이미지를 세션(id, url, title, 그리드 렌디션)과 공유 메타데이터 캐시에 나누어 추가"""
+   if not data or not data.get('images'):
+       return False
 
-# 이미지 갤러리 표시
-if st.session_state.images:
-   # 갤러리 정보
-   st.info(f"📊 총 {len(st.session_state.images)}개의 이미지가 로드되었습니다.")
-
-   # 그리드 레이아웃으로 이미지 표시
-   cols_per_row = 4
-   rows = len(st.session_state.images) // cols_per_row + (1 if len(st.session_state.images) % cols_per_row else 0)
-
-   image_index = 0
-   for row in range(rows):
-       cols = st.columns(cols_per_row)
-       for col_idx in range(cols_per_row):
-           if image_index < len(st.session_state.images):
-               with cols[col_idx]:
-                   create_image_card(st.session_state.images[image_index], image_index)
-               image_index += 1
+   get_metadata_cache().put_many(data['images'])
+   st.session_state.image_refs.extend(
+       (image['id'], image['url'], image['title'], *grid_rendition(image)) for image in data['images']
+   )
+   return True
+
+
+def show_load_result(data: Dict):
+   """불러오기 결과 메시지 표시"""
+   # 새로운 응답 구조 정보 표시
+   success_message = f"✅ {len(data['images'])}개의 이미지를 불러왔습니다!"
+   if data.get('count'):
+       success_message += f" (서버에서 {data['count']}개 반환)"
+   if data.get('source'):
+       success_message += f" [출처: {data['source']}]"
+   
+   st.success(success_message)
+   
+   # 타임스탬프 정보 표시 (디버그 정보)
+   if data.get('timestamp'):
+       st.caption(f"🕒 서버 응답 시각: {data['timestamp']}")
+
+
+def move_page(offset: int):
+   st.session_state.page = min(max(0, st.session_state.page + offset), page_count() - 1)
+
+
+@st.fragment
+def gallery_view():
+   """
+   페이지 단위 갤러리. 페이지 이동과 더보기는 이 fragment만 다시 실행하며,
+   항상 현재 페이지의 카드만 그리므로 이미지가 수천 개 쌓여도 렌더링 비용이 일정합니다.
+   """
+   header = st.container()
+   grid = st.container()
 
    # 더보기 버튼
    st.markdown("---")
    col1, col2, col3 = st.columns([1, 2, 1])
    with col2:
-       if st.button("🔄 더 많은 이미지 보기", key="load_more", use_container_width=True, disabled=st.session_state.loading):
-           load_more_images()
-           st.rerun()
+       clicked = st.button("🔄 더 많은 이미지 보기", key="load_more", use_container_width=True)
+
+   if clicked:
+       with st.spinner("이미지를 불러오는 중..."):
+           data = get_prefetcher().next_batch()
+
+       if append_batch(data):
+           # 새로 불러온 이미지가 있는 마지막 페이지로 이동
+           st.session_state.page = page_count() - 1
+           show_load_result(data)
+
+   page = st.session_state.page
+   with header:
+       # 갤러리 정보 및 페이지 이동
+       st.info(f"📊 총 {len(st.session_state.image_refs)}개의 이미지가 로드되었습니다.")
+       prev_col, page_col, next_col = st.columns([1, 2, 1])
+       with prev_col:
+           st.button("◀ 이전", key="prev_page", on_click=move_page, args=(-1,), disabled=page == 0,
+                     use_container_width=True)
+       with page_col:
+           st.markdown(f"<p style='text-align: center;'>{page + 1} / {page_count()} 페이지</p>", unsafe_allow_html=True)
+       with next_col:
+           st.button("다음 ▶", key="next_page", on_click=move_page, args=(1,), disabled=page >= page_count() - 1,
+                     use_container_width=True)
+
+   with grid:
+       render_page(page)
+
+
+# 메인 앱
+st.title("🖼️ 이미지 갤러리")
+st.markdown("---")
+
+# 초기 로드시 이미지 가져오기
+if st.session_state.initial_load:
+   st.markdown('<p class="loading-text">🔄 갤러리를 준비하는 중입니다... (첫 로드는 시간이 걸릴 수 있습니다)</p>', unsafe_allow_html=True)
+
+   with st.spinner("이미지를 불러오는 중..."):
+       data = get_prefetcher().next_batch()
+
+   if append_batch(data):
+       st.session_state.initial_load = False
+       show_load_result(data)
+
+# 이미지 갤러리 표시
+if st.session_state.image_refs:
+   gallery_view()
 
 # 사이드바 - 갤러리 정보 및 설정
 with st.sidebar:
    st.header("📊 갤러리 정보")
-   st.write(f"**로드된 이미지:** {len(st.session_state.images)}개")
+   st.write(f"**로드된 이미지:** {len(st.session_state.image_refs)}개")
 
    if st.button("🔄 갤러리 초기화"):
-       st.session_state.images = []
+       st.session_state.image_refs = []
+       st.session_state.page = 0
        st.session_state.initial_load = True
+       # 이미 본 이미지 id 기록도 함께 초기화
+       st.session_state.pop('prefetcher', None)
        st.rerun()
 
    st.markdown("---")
-   st.caption("💡 각 이미지의 우측 하단 ℹ️ 버튼을 클릭하면 태그 정보를 볼 수 있습니다.")
+   st.caption("💡 각 이미지의 \"상세 정보\" 버튼을 클릭하면 메타데이터와 태그를 볼 수 있습니다.")
 
    # API 상태 체크
    st.markdown("---")
    if st.button("🏥 API 상태 확인"):
        try:
-           ping_response = requests.get("https://image-gallery-api-513122275637.asia-northeast3.run.app/ping", timeout=5)
+           ping_response = get_http_session().get(f"{API_BASE_URL}/ping", timeout=5)
            if ping_response.status_code == 200:
                st.success("✅ API 정상 작동 중")
                st.json(ping_response.json())